@@ -4,32 +4,41 @@
 Batch Research Example
 
 Demonstrates how to process multiple questions in batch mode.
+
+Questions run concurrently (bounded by `concurrency`), each result is appended to a
+JSONL file as soon as it finishes, and re-running the script resumes from that file.
+Equivalent CLI: webresearcher batch questions.jsonl -o results.jsonl --concurrency 4
 """
 import asyncio
 import json
 from pathlib import Path
 from dotenv import load_dotenv
-from loguru import logger
 import sys
 sys.path.append("..")
 
 load_dotenv()
 
-from webresearcher import WebResearcherAgent
+from webresearcher.batch import load_questions, run_batch
 
 
-async def batch_research(questions, output_dir="./results"):
+async def batch_research(questions, output_dir="./results", concurrency=4):
     """
     Process multiple research questions in batch.
-    
+
     Args:
-        questions: List of question strings or dicts with 'question' and 'ground_truth'
+        questions: List of question strings or dicts with 'question' and 'answer'
         output_dir: Directory to save results
+        concurrency: Maximum questions researched at the same time
     """
-    # Create output directory
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
-    
+
+    # Write questions as JSONL input
+    input_file = output_path / "questions.jsonl"
+    with open(input_file, 'w', encoding='utf-8') as f:
+        for item in questions:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
     # Configure agent
     llm_config = {
         "model": "gpt-4o",
@@ -38,81 +47,32 @@ async def batch_research(questions, output_dir="./results"):
             "top_p": 0.95,
         }
     }
-    
-    agent = WebResearcherAgent(
+
+    result_file = output_path / "results.jsonl"
+    summary = await run_batch(
+        load_questions(str(input_file)),
+        output_path=str(result_file),
+        mode="webresearcher",
         llm_config=llm_config,
-        function_list=["search", "google_scholar", "python"]
+        function_list=["search", "google_scholar", "python"],
+        concurrency=concurrency,
     )
-    
-    # Process each question
-    results = []
-    for i, item in enumerate(questions, 1):
-        # Parse item
-        if isinstance(item, str):
-            question = item
-            ground_truth = None
-        else:
-            question = item.get('question', item)
-            ground_truth = item.get('ground_truth') or item.get('answer')
-        
-        logger.info(f"\n{'='*80}")
-        logger.info(f"Processing {i}/{len(questions)}: {question[:100]}...")
-        logger.info(f"{'='*80}")
-        
-        try:
-            # Run research
-            result = await agent.run(question)
-            
-            # Add metadata
-            result['index'] = i
-            result['ground_truth'] = ground_truth
-            result['success'] = result.get('termination') == 'answer'
-            
-            results.append(result)
-            
-            # Save individual result
-            output_file = output_path / f"result_{i:03d}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
-            
-            # Print summary
-            print(f"\n✅ Question {i} completed")
-            print(f"   Answer: {result['prediction'][:100]}...")
-            if ground_truth:
-                print(f"   Ground Truth: {ground_truth}")
-            print(f"   Saved to: {output_file}")
-            
-        except Exception as e:
-            logger.error(f"❌ Question {i} failed: {e}")
-            results.append({
-                'index': i,
-                'question': question,
-                'error': str(e),
-                'success': False
-            })
-    
-    # Save summary
-    summary = {
-        'total': len(questions),
-        'successful': sum(1 for r in results if r.get('success')),
-        'failed': sum(1 for r in results if not r.get('success')),
-        'results': results
-    }
-    
-    summary_file = output_path / "summary.json"
-    with open(summary_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
-    
+
     # Print final summary
     print(f"\n{'='*80}")
     print("BATCH RESEARCH SUMMARY")
     print(f"{'='*80}")
-    print(f"Total Questions: {summary['total']}")
-    print(f"Successful: {summary['successful']}")
-    print(f"Failed: {summary['failed']}")
-    print(f"Success Rate: {summary['successful']/summary['total']*100:.1f}%")
-    print(f"\nResults saved to: {output_dir}/")
-    
+    print(f"Total Questions: {summary['total']} (already done: {summary['skipped']})")
+    print(f"Successful: {summary['success']}")
+    print(f"Failed: {summary['error']}")
+    with open(result_file, encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            print(f"\nQ: {record['question']}\nA: {str(record.get('prediction', record.get('error')))[:100]}")
+            if record.get('answer'):
+                print(f"Ground Truth: {record['answer']}")
+    print(f"\nResults saved to: {result_file}")
+
     return summary
 
 
@@ -130,13 +90,12 @@ async def main():
         },
         "Who invented the World Wide Web?",
     ]
-    
+
     # Run batch research
     summary = await batch_research(questions, output_dir="./batch_results")
-    
+
     return summary
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-
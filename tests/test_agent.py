@@ -66,3 +66,250 @@ def test_agent_parse_output_nested_answer():
 
     assert parsed["answer"] == "Final answer"
     assert parsed["plan"] == "Reasoning"
+
+
+def test_stream_parser_ignores_inline_action_tags():
+    """Like parse_output, the stream parser only accepts action tags at the start of a line"""
+    from webresearcher.stream_parser import ActionStreamParser
+
+    parser = ActionStreamParser()
+    inline = '<plan>I could call <tool_call>{"name": "python", "arguments": {}}</tool_call> here</plan>\n'
+    events = [tag for tag, _ in parser.feed(inline)]
+    assert events == ["plan"] and not parser.action_complete
+    events = [tag for tag, _ in parser.feed('  <tool_call>{"name": "search", "arguments": {"query": ["x"]}}')]
+    assert events == ["tool_call_ready"]
+    parser.feed("</tool_call>")
+    assert parser.action == "tool_call" and parser.tool_calls[0].startswith('{"name": "search"')
+
+
+def test_stream_parser_agrees_with_parse_output_on_empty_terminate():
+    """An empty <terminate></terminate> is not an action for either parser"""
+    from webresearcher.stream_parser import ActionStreamParser
+
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o"})
+    for text in ('<report>r</report>\n<terminate></terminate>\n<answer>42</answer>',
+                 '<report>r</report>\n<terminate>  </terminate>\n<terminate>done</terminate>'):
+        parser = ActionStreamParser()
+        for i in range(0, len(text), 7):
+            parser.feed(text[i:i + 7])
+        parsed = agent.parse_output(parser.content)
+        assert parsed == agent.parse_output(text)
+        assert parser.action == ("answer" if parsed["answer"] else "terminate")
+        assert parsed["answer"] or parsed["terminate_reason"] == "done"
+
+
+class _FakeStream:
+    """Async iterator of chat completion chunks, records how many were consumed"""
+
+    def __init__(self, pieces):
+        from types import SimpleNamespace
+        self.chunks = [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=p))]) for p in pieces]
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed >= len(self.chunks):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return self.chunks[self.consumed - 1]
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeClient:
+    def __init__(self, streams):
+        from types import SimpleNamespace
+        self.streams = streams
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        assert kwargs.get("stream") is True
+        assert kwargs.get("stream_options") == {"include_usage": True}
+        return self.streams.pop(0)
+
+
+def test_stream_completion_records_usage():
+    """The final usage chunk of a stream is charged to the rate limiter slot"""
+    import asyncio
+    from types import SimpleNamespace
+    from webresearcher.rate_limiter import RateSlot
+
+    stream = _FakeStream(["<answer>42", "</answer>"])
+    stream.chunks[-1].usage = None
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o", "stream": True})
+    slot = RateSlot(tokens=10)
+    asyncio.run(agent._stream_completion(_FakeClient([stream]), {}, slot=slot))
+    assert slot.used_tokens > 10  # cut short before usage arrived: input + estimated output
+
+    stream = _FakeStream(["the answer is 42"])
+    stream.chunks.append(SimpleNamespace(choices=[], usage=SimpleNamespace(total_tokens=123)))
+    slot = RateSlot(tokens=10)
+    asyncio.run(agent._stream_completion(_FakeClient([stream]), {}, slot=slot))
+    assert slot.used_tokens == 123
+
+
+def test_call_server_streaming_stops_after_action(monkeypatch):
+    """Streaming stops generation once </tool_call> is seen and drops trailing text"""
+    import asyncio
+    from webresearcher import web_researcher_agent
+
+    text = '<plan>p</plan>\n<report>r</report>\n<tool_call>\n{"name": "search", "arguments": {"query": ["x"]}}\n</tool_call>\nextra chatter that should not be generated'
+    stream = _FakeStream([text[i:i + 5] for i in range(0, len(text), 5)])
+    monkeypatch.setattr(web_researcher_agent, "get_async_client", lambda **kw: _FakeClient([stream]))
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o", "stream": True})
+    blocks = []
+    content = asyncio.run(agent.call_server([{"role": "user", "content": "q"}],
+                                            on_block=lambda tag, body: blocks.append(tag)))
+    assert content.endswith("</tool_call>")
+    assert blocks == ["plan", "report", "tool_call_ready", "tool_call"]
+    assert stream.consumed < len(stream.chunks) and stream.closed
+
+
+def test_run_starts_tool_when_tool_call_closes(monkeypatch):
+    """In streaming mode the tool is started from the stream and its result reused"""
+    import asyncio
+    from webresearcher import web_researcher_agent
+
+    round1 = '<plan>p</plan>\n<report>r1</report>\n<tool_call>\n{"name": "search", "arguments": {"query": ["x"]}}\n</tool_call>'
+    round2 = '<plan>p</plan>\n<report>r2</report>\n<answer>42</answer>'
+    streams = [_FakeStream([round1[:30], round1[30:]]), _FakeStream([round2])]
+    monkeypatch.setattr(web_researcher_agent, "get_async_client", lambda **kw: _FakeClient(streams))
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o", "stream": True})
+    calls = []
+
+    async def fake_tool(tool_call_str):
+        calls.append(tool_call_str)
+        return "observation"
+
+    monkeypatch.setattr(agent, "custom_call_tool", fake_tool)
+    result = asyncio.run(agent.run("question"))
+    assert result["prediction"] == "42"
+    assert len(calls) == 1
+
+
+def test_run_speculative_tool_prefetch(monkeypatch):
+    """Read-only tools start once the tool_call JSON is complete; disagreeing prefetches are cancelled"""
+    import asyncio
+    from webresearcher import web_researcher_agent
+
+    calls = []
+
+    class _PausingStream(_FakeStream):
+        async def __anext__(self):
+            # give started tasks a chance to run between chunks, like network latency
+            await asyncio.sleep(0.01)
+            self.calls_before_chunk = getattr(self, "calls_before_chunk", []) + [len(calls)]
+            return await super().__anext__()
+
+    json_part = '<plan>p</plan>\n<report>r1</report>\n<tool_call>\n{"name": "search", "arguments": {"query": ["x"]}}'
+    stream1 = _PausingStream([json_part, "\n", "</tool_call>"])
+    # JSON completes, but the block turns into an answer before </tool_call>: prefetch must be dropped
+    stream2 = _PausingStream(['<report>r2</report>\n<tool_call>{"name": "visit", "arguments": {"url": ["u"], "goal": "g"}}',
+                              "\n</tool_call-not>\n<answer>42</answer>"])
+    streams = [stream1, stream2]
+    monkeypatch.setattr(web_researcher_agent, "get_async_client", lambda **kw: _FakeClient(streams))
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o", "stream": True, "speculative_tools": True})
+    cancelled = []
+
+    async def fake_tool(tool_call_str):
+        calls.append(tool_call_str)
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            cancelled.append(tool_call_str)
+            raise
+        return "observation"
+
+    monkeypatch.setattr(agent, "custom_call_tool", fake_tool)
+    result = asyncio.run(agent.run("question"))
+    assert result["prediction"] == "42"
+    # the search started before </tool_call> was streamed
+    assert stream1.calls_before_chunk[-1] == 1
+    assert len(calls) == 2 and len(cancelled) == 1 and '"visit"' in cancelled[0]
+
+
+def test_rejected_speculative_call_is_stopped(monkeypatch):
+    """A prefetch the final parse rejects stops the tool itself, through the single-flight layer"""
+    import asyncio
+    from webresearcher import single_flight, web_researcher_agent
+
+    events = []
+
+    class _SlowVisit:
+        single_flight = True
+
+        async def call(self, params, **kwargs):
+            events.append("started")
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                events.append("cancelled")
+                raise
+            return "page"
+
+    class _PausingStream(_FakeStream):
+        async def __anext__(self):
+            await asyncio.sleep(0.01)
+            return await super().__anext__()
+
+    stream = _PausingStream(['<report>r</report>\n<tool_call>{"name": "visit", "arguments": {"url": ["u"], "goal": "g"}}',
+                             "\n</tool_call-not>\n<answer>42</answer>"])
+    monkeypatch.setattr(web_researcher_agent, "get_async_client", lambda **kw: _FakeClient([stream]))
+    monkeypatch.setattr(web_researcher_agent, "TOOL_MAP", {"visit": _SlowVisit()})
+    monkeypatch.setattr(single_flight, "_single_flight", single_flight.SingleFlight())
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o", "stream": True, "speculative_tools": True})
+
+    async def main():
+        result = await agent.run("question")
+        await asyncio.sleep(0.01)
+        # checked while the loop still runs: asyncio.run would cancel leftover tasks anyway
+        return result, list(events)
+
+    result, seen = asyncio.run(main())
+    assert result["prediction"] == "42"
+    assert seen == ["started", "cancelled"]
+
+
+def test_call_tools_parallel_with_timeouts(monkeypatch):
+    """Several tool calls of a round run concurrently; slow ones time out per tool"""
+    import asyncio
+    import time
+
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o", "tool_timeouts": {"visit": 0.1}})
+    text = (
+        '<plan>p</plan>\n<report>r</report>\n'
+        '<tool_call>\n{"name": "search", "arguments": {"query": ["a"]}}\n</tool_call>\n'
+        '<tool_call>\n{"name": "google_scholar", "arguments": {"query": ["b"]}}\n</tool_call>\n'
+        '<tool_call>\n{"name": "visit", "arguments": {"url": ["u"], "goal": "g"}}\n</tool_call>'
+    )
+    parsed = agent.parse_output(text)
+    assert len(parsed["tool_calls"]) == 3
+    assert '"visit"' in parsed["tool_call"]
+
+    from webresearcher import web_researcher_agent
+
+    class _FakeTool:
+        def __init__(self, name, delay):
+            self.name, self.delay = name, delay
+
+        async def call(self, params, **kwargs):
+            await asyncio.sleep(self.delay)
+            return f"result of {self.name}"
+
+    # the executor alone applies the per-tool timeout
+    monkeypatch.setattr(web_researcher_agent, "TOOL_MAP", {
+        "search": _FakeTool("search", 0.05),
+        "google_scholar": _FakeTool("google_scholar", 0.05),
+        "visit": _FakeTool("visit", 1),
+    })
+    start = time.time()
+    observation = asyncio.run(agent.call_tools(parsed["tool_calls"]))
+    assert time.time() - start < 0.5
+    sections = observation.split("\n\n")
+    assert sections[0] == "## Tool call 1: search\nresult of search"
+    assert sections[1] == "## Tool call 2: google_scholar\nresult of google_scholar"
+    assert "timed out" in sections[2]
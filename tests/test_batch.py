@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the batch research runner (fake agents, no network access)
+"""
+import asyncio
+import json
+import sys
+sys.path.append("..")
+from webresearcher.batch import load_questions, load_finished_ids, run_batch
+
+
+class FakeAgent:
+    active = 0
+    peak = 0
+
+    async def run(self, question):
+        FakeAgent.active += 1
+        FakeAgent.peak = max(FakeAgent.peak, FakeAgent.active)
+        await asyncio.sleep(0.05)
+        FakeAgent.active -= 1
+        if question == "boom":
+            raise RuntimeError("agent failed")
+        if question == "slow":
+            return {"question": question, "prediction": "", "termination": "timeout"}
+        return {"question": question, "prediction": f"answer to {question}", "termination": "answer found"}
+
+
+def _write_questions(path, questions):
+    with open(path, "w", encoding="utf-8") as f:
+        for q in questions:
+            f.write(json.dumps(q, ensure_ascii=False) + "\n")
+
+
+def _read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_load_questions(tmp_path):
+    """Objects and bare strings are accepted; ids are stable and deduplicated"""
+    path = tmp_path / "q.jsonl"
+    _write_questions(path, [{"id": "q1", "question": "a", "answer": "x"}, "b", "b"])
+    items = load_questions(str(path))
+    assert [item["question"] for item in items] == ["a", "b"]
+    assert items[0]["id"] == "q1" and items[0]["answer"] == "x"
+    assert load_questions(str(path))[1]["id"] == items[1]["id"]
+
+
+def test_run_batch_bounded_concurrency_and_resume(tmp_path):
+    """At most `concurrency` agents run at once; finished questions are skipped on resume"""
+    questions = [{"id": f"q{i}", "question": f"question {i}"} for i in range(10)] + [
+        {"id": "bad", "question": "boom"}, {"id": "late", "question": "slow"}]
+    input_path, output_path = tmp_path / "q.jsonl", tmp_path / "out" / "results.jsonl"
+    _write_questions(input_path, questions)
+    items = load_questions(str(input_path))
+
+    FakeAgent.peak = 0
+    summary = asyncio.run(run_batch(items, str(output_path), concurrency=3, agent_factory=lambda mode: FakeAgent()))
+    assert FakeAgent.peak == 3
+    assert summary["success"] == 10 and summary["error"] == 2
+    assert summary["elapsed_seconds"] < 0.05 * len(items)
+    records = {r["id"]: r for r in _read_records(output_path)}
+    assert records["q3"]["prediction"] == "answer to question 3"
+    assert records["bad"]["status"] == "error" and "agent failed" in records["bad"]["error"]
+    assert records["late"]["status"] == "error" and records["late"]["error"] == "timeout"
+
+    # Simulate a crash mid-write, then resume: only the failed question is re-run
+    with open(output_path, "a", encoding="utf-8") as f:
+        f.write('{"id": "q0", "stat')
+    assert not {"bad", "late"} & load_finished_ids(str(output_path))
+    summary = asyncio.run(run_batch(items, str(output_path), concurrency=3, agent_factory=lambda mode: FakeAgent()))
+    assert summary["skipped"] == 10 and summary["error"] == 2
+    assert len(_read_records_lenient(output_path)) == 14
+
+
+def _read_records_lenient(path):
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                pass
+    return records
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for cache module
+"""
+import time
+import sys
+sys.path.append("..")
+from webresearcher.cache import ResultCache, make_cache_key
+
+
+def test_make_cache_key_normalizes():
+    """Whitespace and case differences map to the same key"""
+    assert make_cache_key("What  is AI?", "us") == make_cache_key(" what is ai? ", "us")
+    assert make_cache_key("What is AI?", "us") != make_cache_key("What is AI?", "cn")
+
+
+def test_cache_ttl_and_stats(tmp_path):
+    """Expired entries are misses unless explicitly requested"""
+    cache = ResultCache("test", path=str(tmp_path / "c.sqlite3"), ttl=0.05)
+    cache.set("k", "v", meta={"etag": "x"})
+    assert cache.get("k") == "v"
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    entry = cache.get_entry("k", allow_expired=True)
+    assert entry.expired and entry.meta == {"etag": "x"}
+    cache.touch("k")
+    assert cache.get("k") == "v"
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["size"] == 1
+
+
+def test_cache_lru_eviction(tmp_path):
+    """Least recently accessed entries are evicted over the size cap"""
+    cache = ResultCache("test", path=str(tmp_path / "c.sqlite3"), max_entries=2, compress=True)
+    cache.set("a", "1")
+    time.sleep(0.01)
+    cache.set("b", "2")
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", "3")
+    assert cache.size() == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_cache_errors_are_misses(tmp_path):
+    """SQLite failures at runtime degrade to misses and skipped writes"""
+    cache = ResultCache("test", path=str(tmp_path / "c.sqlite3"))
+    cache.set("k", "v")
+    cache._conn.close()
+    assert cache.get("k") is None
+    cache.set("k", "v2")
+    cache.touch("k")
+    cache.delete("k")
+    assert cache.misses == 1
+
+
+def test_page_cache_hot_tier_and_revalidation(tmp_path):
+    """Pages are served from memory and keep validators for revalidation"""
+    from webresearcher.cache import PageCache
+
+    cache = PageCache(path=str(tmp_path / "c.sqlite3"), ttl=0.05, hot_size=1)
+    cache.put("https://example.com/A#frag", "content A", {"etag": "v1"})
+    entry = cache.get("https://example.com/A")
+    assert entry.value == "content A" and not entry.expired
+    assert cache.get("https://example.com/a") is None  # URL paths are case-sensitive
+    time.sleep(0.1)
+    entry = cache.get("https://example.com/A")
+    assert entry.expired and entry.meta["etag"] == "v1"
+    cache.touch("https://example.com/A")
+    assert not cache.get("https://example.com/A").expired
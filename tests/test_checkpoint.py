@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for resumable research checkpoints
+"""
+import asyncio
+import sys
+sys.path.append("..")
+from webresearcher.checkpoint import CheckpointStore, make_run_id
+from webresearcher.web_researcher_agent import WebResearcherAgent
+
+
+def test_checkpoint_store_appends_deltas(tmp_path):
+    """Each save stores only new messages; load rebuilds the full trajectory"""
+    store = CheckpointStore(str(tmp_path / "ckpt.sqlite3"))
+    store.save("run", {"round_num": 1, "x": 1}, [{"role": "user", "content": "a"}])
+    store.save("run", {"round_num": 2, "x": 2}, [{"role": "assistant", "content": "b"}])
+    checkpoint = store.load("run")
+    assert checkpoint["round_num"] == 2 and checkpoint["state"]["x"] == 2
+    assert [m["content"] for m in checkpoint["trajectory"]] == ["a", "b"]
+    assert store.list_runs()[0]["run_id"] == "run"
+    store.delete("run")
+    assert store.load("run") is None
+
+
+def test_make_run_id():
+    assert make_run_id("What  is X?", "m") == make_run_id("What is X?", "m")
+    assert make_run_id("q", "m", {"temperature": 0.6}) != make_run_id("q", "m", {"temperature": 0.8})
+
+
+class _FakeClient:
+    """OpenAI client stand-in: plays back responses, raising the exceptions among them"""
+
+    def __init__(self, responses, seen):
+        from types import SimpleNamespace
+        self.responses = responses
+        self.seen = seen
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        from types import SimpleNamespace
+        self.seen.append(kwargs["messages"][-1]["content"])
+        response = self.responses.pop(0) if self.responses else RuntimeError("connection lost")
+        if isinstance(response, Exception):
+            raise response
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=response))], usage=None)
+
+
+def _make_agent(monkeypatch, store, responses, seen):
+    from webresearcher import web_researcher_agent
+
+    async def fake_tool(tool_call_str):
+        return "observation-1"
+
+    client = _FakeClient(responses, seen)
+    monkeypatch.setattr(web_researcher_agent, "get_async_client", lambda **kw: client)
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o", "stream": False}, checkpoint_store=store)
+    monkeypatch.setattr(agent, "custom_call_tool", fake_tool)
+    return agent
+
+
+def test_run_resumes_from_last_round(tmp_path, monkeypatch):
+    """A run interrupted by an LLM failure continues from its last completed round"""
+    store = CheckpointStore(str(tmp_path / "ckpt.sqlite3"))
+    tool_call = '<plan>p</plan>\n<report>r1</report>\n<tool_call>{"name": "search", "arguments": {"query": ["x"]}}</tool_call>'
+    seen = []
+
+    result = asyncio.run(_make_agent(monkeypatch, store, [tool_call], seen).run("question"))
+    assert result["termination"] == "unknown error"
+    checkpoint = store.load(result["run_id"])
+    assert checkpoint["status"] == "interrupted" and checkpoint["round_num"] == 1
+
+    seen.clear()
+    result = asyncio.run(_make_agent(monkeypatch, store, ['<report>r2</report>\n<answer>42</answer>'], seen)
+                         .run("question"))
+    assert result["prediction"] == "42"
+    # the resumed round sees the report and observation of round 1
+    assert len(seen) == 1 and "r1" in seen[0] and "observation-1" in seen[0]
+    roles = [m["role"] for m in result["trajectory"]]
+    assert roles == ["system", "user", "assistant", "user", "assistant"]
+    assert store.load(result["run_id"])["status"] == "finished"
+
+    # a finished run starts over
+    seen.clear()
+    result = asyncio.run(_make_agent(monkeypatch, store, ['<report>r</report>\n<answer>43</answer>'], seen)
+                         .run("question"))
+    assert result["prediction"] == "43" and "r1" not in seen[0]
+
+
+def test_llm_outage_is_interrupted(tmp_path, monkeypatch):
+    """A client that always fails leaves a resumable checkpoint, not a finished one"""
+    store = CheckpointStore(str(tmp_path / "ckpt.sqlite3"))
+    result = asyncio.run(_make_agent(monkeypatch, store, [], []).run("question"))
+    assert result["termination"] == "unknown error"
+    checkpoint = store.load(result["run_id"])
+    assert checkpoint["status"] == "interrupted" and checkpoint["round_num"] == 0
+
+
+def test_resume_keeps_the_time_budget(tmp_path, monkeypatch):
+    """Time spent before an interruption counts towards agent_timeout after resuming"""
+    store = CheckpointStore(str(tmp_path / "ckpt.sqlite3"))
+    result = asyncio.run(_make_agent(monkeypatch, store, [], []).run("question"))
+    checkpoint = store.load(result["run_id"])
+    assert checkpoint["state"]["elapsed_seconds"] >= 0
+    # pretend the interrupted attempt already used the whole budget
+    store.save(result["run_id"], dict(checkpoint["state"], elapsed_seconds=601), [], "interrupted")
+
+    seen = []
+    result = asyncio.run(_make_agent(monkeypatch, store, ['<answer>42</answer>'], seen).run("question"))
+    assert result["termination"] == "timeout" and seen == []
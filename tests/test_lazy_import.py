@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for lazy package / tool imports
+"""
+import json
+import os
+import subprocess
+import sys
+sys.path.append("..")
+from webresearcher.tool_registry import LazyToolMap, lazy_tool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["tiktoken", "pandas", "openai", "sandbox_fusion"]
+
+
+def test_import_does_not_load_heavy_dependencies():
+    """Importing the package, the CLI and constructing agents stays light"""
+    code = (
+        "import json, sys, time\n"
+        "start = time.time()\n"
+        "import webresearcher, webresearcher.cli\n"
+        "from webresearcher import WebResearcherAgent, WebWeaverAgent\n"
+        "WebResearcherAgent()\n"
+        "WebWeaverAgent(llm_config={})\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': time.time() - start, 'heavy': heavy}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["heavy"] == []
+    # about 0.15s when lazy; generous for slow CI machines
+    assert result["seconds"] < 3
+
+
+def test_lazy_tool_map():
+    """Tools are built on first access; names are listed without building"""
+    built = []
+
+    def make_tool(name):
+        built.append(name)
+        return name
+
+    tools = LazyToolMap({"a": lambda: make_tool("a"), "b": lambda: make_tool("b")})
+    assert list(tools) == ["a", "b"] and "a" in tools and len(tools) == 2
+    assert built == []
+    assert tools["b"] == "b" and tools["b"] == "b"
+    assert built == ["b"] and tools.is_loaded("b") and not tools.is_loaded("a")
+
+    tools["echo"] = "echo tool"
+    assert tools["echo"] == "echo tool"
+    assert list(tools) == ["a", "b", "echo"]
+
+    search = LazyToolMap({"search": lazy_tool("webresearcher.tool_search:Search")})["search"]
+    assert search.name == "search"
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for llm_client module
+"""
+import asyncio
+import sys
+sys.path.append("..")
+from webresearcher.llm_client import get_async_client, get_sync_client, aclose_clients
+
+
+def test_sync_client_is_shared():
+    """Same (base_url, api_key, timeout) returns the same client"""
+    c1 = get_sync_client(api_key="test-key", base_url="http://test", timeout=10)
+    c2 = get_sync_client(api_key="test-key", base_url="http://test", timeout=10)
+    c3 = get_sync_client(api_key="test-key", base_url="http://test", timeout=20)
+    assert c1 is c2
+    assert c1 is not c3
+
+
+def test_async_client_is_shared_per_loop():
+    """Async clients are shared within a loop and rebuilt for a new loop"""
+    async def _get():
+        a = get_async_client(api_key="test-key", base_url="http://test", timeout=10)
+        b = get_async_client(api_key="test-key", base_url="http://test", timeout=10)
+        assert a is b
+        await aclose_clients()
+        return a
+
+    first = asyncio.run(_get())
+    second = asyncio.run(_get())
+    assert first is not second
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared rate limiter
+"""
+import asyncio
+import threading
+import time
+import sys
+sys.path.append("..")
+from webresearcher.rate_limiter import RateLimiter, TokenBucket, is_overload
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_token_bucket_paces_requests():
+    """Requests beyond the burst wait for refill"""
+    bucket = TokenBucket(rate_per_minute=600, burst_seconds=0.1)  # 10/s, burst of 1
+    now = time.monotonic()
+    assert bucket.reserve(1, now) == 0
+    assert abs(bucket.reserve(1, now) - 0.1) < 1e-6
+    assert abs(bucket.reserve(1, now) - 0.2) < 1e-6
+
+
+def test_is_overload():
+    assert is_overload(429) and is_overload(503)
+    assert not is_overload(200) and not is_overload(404)
+    assert is_overload(error=FakeHTTPError(429))
+    assert not is_overload(error=TimeoutError())
+    assert not is_overload(error=ValueError())
+
+
+def test_concurrency_limit_across_threads():
+    """No more than max_concurrency requests are in flight"""
+    limiter = RateLimiter("test", max_concurrency=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with limiter.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+    assert limiter.stats()["successes"] == 6 and limiter.in_flight == 0
+
+
+def test_aimd_decrease_and_increase():
+    """429 halves the limit and pauses callers; successes grow it back"""
+    limiter = RateLimiter("test", max_concurrency=8)
+    try:
+        with limiter.slot():
+            raise FakeHTTPError(429)
+    except FakeHTTPError:
+        pass
+    assert limiter.limit == 4
+    assert limiter.paused_until > time.monotonic()
+
+    limiter.paused_until = 0
+    with limiter.slot() as slot:
+        slot.report(503, retry_after="0.1")
+    assert limiter.limit == 4  # within the decrease cooldown
+    start = time.time()
+    with limiter.slot():
+        pass
+    assert time.time() - start >= 0.09
+
+    for _ in range(100):
+        with limiter.slot():
+            pass
+    assert limiter.limit == 8
+    assert limiter.stats()["overloads"] == 2
+
+
+def test_async_slot():
+    """Async slots respect the limit without blocking the event loop"""
+    limiter = RateLimiter("test", max_concurrency=3)
+    active, peak = [0], [0]
+
+    async def work():
+        async with limiter.aslot(tokens=10):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.02)
+            active[0] -= 1
+
+    async def main():
+        await asyncio.gather(*[work() for _ in range(9)])
+
+    asyncio.run(main())
+    assert peak[0] == 3 and limiter.in_flight == 0
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for token_counter module
+"""
+import sys
+sys.path.append("..")
+from webresearcher import token_counter
+from webresearcher.token_counter import (
+    count_message_tokens,
+    count_tokens,
+    estimate_tokens,
+    get_encoding,
+    split_into_token_chunks,
+    truncate_with_count,
+)
+
+
+def test_encoder_is_cached():
+    """One encoder instance per model"""
+    assert get_encoding("gpt-4o") is get_encoding("gpt-4o")
+
+
+def test_estimate_tokens():
+    """Estimate counts CJK characters individually"""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("北京") == 2
+
+
+def test_count_message_tokens_caches_messages(monkeypatch):
+    """Unchanged messages are not re-encoded"""
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": "Hello"},
+    ]
+    first = count_message_tokens(messages)
+    assert first > 0
+
+    encoded = []
+    original = token_counter.count_tokens
+
+    def spy(text, model="gpt-4o", estimate=False):
+        encoded.append(text)
+        return original(text, model, estimate=estimate)
+
+    monkeypatch.setattr(token_counter, "count_tokens", spy)
+    messages[1]["content"] = "Hello again"
+    count_message_tokens(messages)
+    assert encoded == ["user: Hello again"]
+
+
+def test_truncate_and_split():
+    """Truncation and chunking respect the token limit"""
+    text = "word " * 2000
+    short, n = truncate_with_count("short text", 100)
+    assert short == "short text"
+    truncated, n = truncate_with_count(text, 100)
+    assert n == 100
+    assert count_tokens(truncated) <= 101
+    chunks, kept = split_into_token_chunks(text, 300, max_chunks=3)
+    assert len(chunks) == 3
+    assert kept == 900
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the shared tool executor
+"""
+import asyncio
+import sys
+import time
+sys.path.append("..")
+from webresearcher.base import BaseTool
+from webresearcher.tool_executor import ToolExecutor, parse_limits, parse_tool_call
+
+
+class SleepTool(BaseTool):
+    def __init__(self, name, lane="network", seconds=0.05, max_concurrency=0):
+        self.name = name
+        self.executor_lane = lane
+        self.seconds = seconds
+        self.max_concurrency = max_concurrency
+        self.active = self.peak = 0
+
+    def call(self, params, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        time.sleep(self.seconds)
+        self.active -= 1
+        return f"{self.name}: {params}"
+
+
+def test_parse_tool_call():
+    assert parse_tool_call('{"name": "search", "arguments": {"query": "x"}}') == ("search", {"query": ["x"]})
+    assert parse_tool_call('python\n<code>print(1)</code>') == ("python", "print(1)")
+    assert parse_limits("python=2, parse_file=1,bad") == {"python": 2, "parse_file": 1}
+
+
+def test_slow_code_lane_does_not_block_network_lane():
+    executor = ToolExecutor(workers={"network": 2, "cpu": 1, "code": 1})
+    tools = {"python": SleepTool("python", lane="code", seconds=0.5), "search": SleepTool("search", seconds=0.02)}
+
+    async def main():
+        slow = [asyncio.ensure_future(executor.execute('<code>x</code>', tools)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        start = time.time()
+        result = await executor.execute('{"name": "search", "arguments": {"query": ["q"]}}', tools)
+        elapsed = time.time() - start
+        await asyncio.gather(*slow)
+        return result, elapsed
+
+    result, elapsed = asyncio.run(main())
+    assert result == "search: {'query': ['q']}" and elapsed < 0.3
+    executor.shutdown()
+
+
+def test_tool_caps_timeouts_and_cancellation():
+    capped = SleepTool("visit", seconds=0.05, max_concurrency=2)
+    slow = SleepTool("slow", lane="cpu", seconds=0.3)
+    executor = ToolExecutor(workers={"network": 8, "cpu": 1}, tool_timeouts={"slow": 0.05})
+    tools = {"visit": capped, "slow": slow}
+
+    async def main():
+        calls = [executor.execute('{"name": "visit", "arguments": {"url": ["%d"]}}' % i, tools) for i in range(6)]
+        await asyncio.gather(*calls)
+        timed_out = await executor.execute('{"name": "slow", "arguments": {}}', tools)
+        # queued behind the still-running slow call in the single cpu thread, then cancelled
+        task = asyncio.ensure_future(executor.run(slow, "slow", {"n": 2}, timeout=5))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return timed_out, await executor.execute('{"name": "nope", "arguments": {}}', tools)
+
+    timed_out, missing = asyncio.run(main())
+    assert capped.peak == 2
+    assert "timed out" in timed_out and "not found" in missing
+    stats = executor.stats()
+    assert stats["slow"]["timeouts"] == 1 and stats["slow"]["cancelled"] == 1
+    executor.shutdown()
+
+
+def test_shutdown_cancels_queued_calls():
+    executor = ToolExecutor(workers={"cpu": 1})
+
+    async def main():
+        calls = [asyncio.ensure_future(executor.run_in_lane("cpu", time.sleep, 0.1)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        executor.shutdown()
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    running, queued = asyncio.run(main())
+    assert running is None and isinstance(queued, asyncio.CancelledError)
+    assert not executor._futures
+
+
+def test_parse_file_with_non_dict_arguments():
+    executor = ToolExecutor()
+    tools = {"parse_file": SleepTool("parse_file", lane="cpu", seconds=0)}
+    result = asyncio.run(executor.execute('{"name": "parse_file", "arguments": "a.pdf"}', tools, file_root_path="/tmp"))
+    assert result.startswith("Error:") and tools["parse_file"].peak == 0
+    result = asyncio.run(executor.execute('{"name": "parse_file", "arguments": {"files": "a.pdf"}}', tools,
+                                          file_root_path="/tmp"))
+    assert result == "parse_file: {'files': ['a.pdf']}"
+    executor.shutdown()
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for web tools (no network access)
+"""
+import time
+import sys
+sys.path.append("..")
+from webresearcher.tool_search import Search
+
+
+def test_search_batch_keeps_order(monkeypatch):
+    """Concurrent batch search returns results in query order"""
+    tool = Search()
+
+    def fake_search(query):
+        time.sleep(0.05 if query == "a" else 0.01)
+        return f"result:{query}"
+
+    monkeypatch.setattr(tool, "search_with_serp", fake_search)
+    response = tool.call({"query": ["a", "b", "c"]})
+    assert response.split("\n=======\n") == ["result:a", "result:b", "result:c"]
+
+
+def test_search_batch_deadline(monkeypatch):
+    """Queries past the batch deadline return a timeout message"""
+    tool = Search()
+
+    def fake_search(query):
+        if query == "slow":
+            time.sleep(1)
+        return f"result:{query}"
+
+    monkeypatch.setattr(tool, "search_with_serp", fake_search)
+    start = time.time()
+    responses = tool.batch_search(["fast", "slow"], timeout=0.2)
+    assert time.time() - start < 0.9
+    assert responses[0] == "result:fast"
+    assert "timed out" in responses[1]
+
+
+def test_search_uses_result_cache(monkeypatch, tmp_path):
+    """Repeated queries are served from the persistent cache"""
+    from webresearcher import tool_search
+    from webresearcher.cache import ResultCache
+
+    cache = ResultCache("search", path=str(tmp_path / "cache.sqlite3"))
+    monkeypatch.setattr(tool_search, "get_search_cache", lambda namespace: cache)
+    calls = []
+
+    def fake_request(query, locale):
+        calls.append((query, locale["gl"]))
+        return f"A Google search for '{query}' found 1 results:"
+
+    tool = Search()
+    monkeypatch.setattr(tool, "_google_search_with_serp", fake_request)
+    first = tool.google_search_with_serp("What is AI?")
+    second = tool.google_search_with_serp("  what is   AI? ")
+    assert first == second
+    assert calls == [("What is AI?", "us")]
+    assert cache.stats()["hits"] == 1
+
+
+def test_visit_urls_partial_results(monkeypatch):
+    """Slow pages past the per-URL deadline don't block finished ones"""
+    from webresearcher.tool_visit import Visit
+
+    tool = Visit()
+
+    def fake_readpage(url, goal):
+        if url == "http://slow":
+            time.sleep(1)
+        return f"page:{url}"
+
+    monkeypatch.setattr(tool, "readpage_jina", fake_readpage)
+    start = time.time()
+    results = tool.visit_urls(["http://a", "http://slow", "http://b"], "goal", url_timeout=0.2)
+    assert time.time() - start < 0.9
+    assert results[0] == "page:http://a"
+    assert results[2] == "page:http://b"
+    assert "could not be accessed" in results[1]
+
+
+def test_visit_page_cache(monkeypatch, tmp_path):
+    """Repeat visits skip the network; expired pages are revalidated"""
+    from webresearcher import tool_visit
+    from webresearcher.cache import PageCache
+
+    cache = PageCache(path=str(tmp_path / "c.sqlite3"), ttl=0.05)
+    monkeypatch.setattr(tool_visit, "get_page_cache", lambda: cache)
+    calls = []
+
+    def fake_fetch(url, validators=None):
+        calls.append(validators)
+        if validators:
+            return tool_visit.NOT_MODIFIED, validators
+        return "page content", {"etag": "v1"}
+
+    tool = tool_visit.Visit()
+    monkeypatch.setattr(tool, "_jina_fetch", fake_fetch)
+    assert tool.html_readpage_jina("https://example.com") == "page content"
+    assert tool.html_readpage_jina("https://example.com") == "page content"
+    assert calls == [None]
+    time.sleep(0.1)
+    assert tool.html_readpage_jina("https://example.com") == "page content"
+    assert calls == [None, {"etag": "v1"}]
+
+
+def test_visit_summary_memo(monkeypatch, tmp_path):
+    """Identical (page, goal) extractions call the summary model once"""
+    import json
+    from webresearcher import tool_visit
+    from webresearcher.cache import SummaryMemo
+
+    memo = SummaryMemo(path=str(tmp_path / "c.sqlite3"))
+    monkeypatch.setattr(tool_visit, "get_summary_memo", lambda: memo)
+    tool = tool_visit.Visit()
+    monkeypatch.setattr(tool, "html_readpage_jina", lambda url: "some page content")
+    calls = []
+
+    def fake_call_server(msgs, max_retries=1):
+        calls.append(msgs)
+        return json.dumps({"rational": "r", "evidence": "the evidence", "summary": "the summary"})
+
+    monkeypatch.setattr(tool, "call_server", fake_call_server)
+    first = tool.readpage_jina("https://example.com", "Find facts")
+    second = tool.readpage_jina("https://example.com/other", "  find   FACTS ")
+    assert "the evidence" in first and "the summary" in second
+    assert "https://example.com/other" in second
+    assert len(calls) == 1
+    stats = memo.stats()
+    assert stats["hits"] == 1
+    assert stats["tokens_saved"] > 0
+
+    # a summary that only came back after truncating the page is not memoized for the full page
+    replies = ["", json.dumps({"rational": "r", "evidence": "partial", "summary": "partial"})]
+    monkeypatch.setattr(tool, "html_readpage_jina", lambda url: "another page " * 20)
+    monkeypatch.setattr(tool, "call_server", lambda msgs, max_retries=1: replies.pop(0) if replies else "")
+    assert "partial" in tool.readpage_jina("https://example.com/long", "Find facts")
+    assert memo.stats()["size"] == 1
+
+
+def test_visit_map_reduce_extract(monkeypatch):
+    """Long pages are extracted per chunk and merged in one reduce call"""
+    import json
+    from webresearcher import tool_visit
+
+    tool = tool_visit.Visit()
+    calls = []
+
+    def fake_call_server(msgs, max_retries=1):
+        prompt = msgs[0]["content"]
+        calls.append(prompt)
+        if "Partial Extractions" in prompt:
+            return json.dumps({"rational": "r", "evidence": "merged evidence", "summary": "merged summary"})
+        return json.dumps({"rational": "r", "evidence": f"evidence {len(calls)}", "summary": "s"})
+
+    monkeypatch.setattr(tool, "call_server", fake_call_server)
+    raw = tool.map_reduce_extract("https://example.com", "goal", ["chunk one", "chunk two", "chunk three"])
+    assert raw == {"evidence": "merged evidence", "summary": "merged summary"}
+    assert len(calls) == 4
+
+    # Merge failure falls back to concatenating partial extractions in page order
+    monkeypatch.setattr(tool, "call_server", lambda msgs, max_retries=1: (
+        "not json" if "Partial Extractions" in msgs[0]["content"]
+        else json.dumps({"evidence": msgs[0]["content"].split("chunk ")[1].split("\n")[0], "summary": "s"})
+    ))
+    raw = tool.map_reduce_extract("https://example.com", "goal", ["chunk one", "chunk two"])
+    assert raw["evidence"] == "one\n\ntwo"
+
+
+def test_visit_map_reduce_only_above_single_shot_limit(monkeypatch):
+    """Pages within the single-shot limit take one call; dropped chunks are marked"""
+    import json
+    from webresearcher import tool_visit
+
+    monkeypatch.setattr(tool_visit, "get_summary_memo", lambda: None)
+    monkeypatch.setattr(tool_visit, "VISIT_SINGLE_SHOT_TOKENS", 200)
+    monkeypatch.setattr(tool_visit, "VISIT_CHUNK_TOKENS", 100)
+    monkeypatch.setattr(tool_visit, "VISIT_MAX_CHUNKS", 2)
+    tool = tool_visit.Visit()
+    calls = []
+
+    def fake_call_server(msgs, max_retries=1):
+        calls.append(msgs)
+        return json.dumps({"rational": "r", "evidence": "e", "summary": "s"})
+
+    monkeypatch.setattr(tool, "call_server", fake_call_server)
+    monkeypatch.setattr(tool, "html_readpage_jina", lambda url: "word " * 120)
+    tool.readpage_jina("https://example.com", "goal")
+    assert len(calls) == 1
+    calls.clear()
+    monkeypatch.setattr(tool, "html_readpage_jina", lambda url: "word " * 600)
+    result = tool.readpage_jina("https://example.com", "goal")
+    assert len(calls) == 3  # two chunks + merge
+    assert "only the first 2 of" in result
+
+
+def test_single_flight_coalesces_concurrent_tool_calls(monkeypatch):
+    """Identical concurrent calls of an opted-in tool run once through all three dispatch paths."""
+    import asyncio
+    from webresearcher.react_agent import ReactAgent
+    from webresearcher.single_flight import SingleFlight, make_call_key
+    from webresearcher import single_flight
+    from webresearcher.web_researcher_agent import TOOL_MAP, WebResearcherAgent
+
+    calls = []
+
+    def fake_call(self, params, **kwargs):
+        calls.append(params)
+        time.sleep(0.05)
+        return f"results for {params['query']}"
+
+    monkeypatch.setattr(Search, "call", fake_call)
+    monkeypatch.setattr(single_flight, "_single_flight", SingleFlight())
+    agent = WebResearcherAgent(llm_config={"model": "gpt-4o"})
+    react = ReactAgent(llm_config={"model": "gpt-4o"})
+    body = '{"name": "search", "arguments": {"query": ["x"]}}'
+    spaced = '{"name": "search", "arguments": {"query": [" x "]}}'
+
+    async def main():
+        return await asyncio.gather(agent.custom_call_tool(body), agent.custom_call_tool(spaced),
+                                    react._call_tool(body))
+
+    results = asyncio.run(main())
+    assert len(set(results)) == 1 and len(calls) == 1
+    assert single_flight.single_flight_stats()["search"] == {"calls": 3, "executed": 1, "coalesced": 2}
+    # finished calls are not cached by the single-flight layer
+    asyncio.run(agent.custom_call_tool(body))
+    assert len(calls) == 2
+    assert make_call_key("search", {"query": ["a  b"]}) == make_call_key("search", {"query": ["a b"]})
+    assert not getattr(TOOL_MAP["python"], "single_flight", False)
+
+
+def test_single_flight_cancels_call_without_waiters():
+    """The shared call keeps running while anyone waits and is cancelled with its last waiter."""
+    import asyncio
+    from webresearcher.single_flight import SingleFlight
+    from webresearcher.tool_executor import ToolExecutor
+
+    flight = SingleFlight()
+    cancelled = []
+
+    async def factory():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        waiters = [asyncio.ensure_future(flight.do("k", factory)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled and "k" in flight._inflight[asyncio.get_running_loop()]
+        waiters[1].cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        assert cancelled and not flight._inflight[asyncio.get_running_loop()]
+
+    asyncio.run(main())
+
+    class SlowTool:
+        single_flight = True
+        max_concurrency = 1
+
+        async def call(self, params, **kwargs):
+            await asyncio.sleep(0.5 if params == "slow" else 0)
+            return params
+
+    async def capped():
+        # a timed-out single-flight call gives its concurrency slot back at once
+        executor = ToolExecutor()
+        try:
+            await executor.run(SlowTool(), "slow_tool", "slow", timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+        return await asyncio.wait_for(executor.run(SlowTool(), "slow_tool", "fast"), timeout=0.2)
+
+    assert asyncio.run(capped()) == "fast"
+
+
+def test_file_parser_process_pool(tmp_path):
+    """Tabular files are parsed in worker processes; PDFs are split into page ranges."""
+    from webresearcher.file_tools.file_parser import SingleFileParser, page_ranges
+
+    assert page_ranges(45, 20) == [(0, 20), (20, 40), (40, 45)]
+    assert page_ranges(0, 20) == []
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("city,population\nParis,2100000\nLyon,520000\n")
+    parser = SingleFileParser({"path": str(tmp_path / "store")})
+    result = parser.call({"url": str(csv_path)})
+    assert "Paris" in result and "| city" in result
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for Test-Time Scaling coordination
+"""
+import asyncio
+import sys
+import time
+sys.path.append("..")
+from webresearcher import tts_agent
+from webresearcher.tts_agent import SharedToolCache, normalize_answer
+from webresearcher.web_researcher_agent import WebResearcherAgent
+
+
+def test_normalize_answer():
+    assert normalize_answer("The Eiffel Tower.") == normalize_answer("eiffel  tower")
+    assert normalize_answer("\\boxed{42}") == "42"
+    assert normalize_answer("２３岁。") == "23岁"
+
+
+def test_shared_tool_cache_coalesces_inflight_calls():
+    calls = []
+
+    async def tool():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def failing():
+        return "Error: boom"
+
+    async def main():
+        cache = SharedToolCache()
+        results = await asyncio.gather(*[cache.get_or_run("k", tool) for _ in range(3)])
+        assert results == ["result"] * 3 and len(calls) == 1
+        assert await cache.get_or_run("k", tool) == "result"
+        await cache.get_or_run("bad", failing)
+        assert len(cache) == 1  # failed results are not kept
+        return cache.stats
+
+    stats = asyncio.run(main())
+    assert stats == {"calls": 5, "executed": 2, "hits": 1, "inflight_hits": 2}
+
+
+def test_tts_consensus_cancels_stragglers(tmp_path, monkeypatch):
+    """Identical searches run once across agents; a majority answer stops the slow agent."""
+    from webresearcher.checkpoint import CheckpointStore
+
+    store = CheckpointStore(str(tmp_path / "ckpt.sqlite3"))
+    executed, rounds = [], {}
+    tool_call = '<plan>p</plan>\n<report>r</report>\n<tool_call>{"name": "search", "arguments": {"query": ["x"]}}</tool_call>'
+
+    async def fake_server(self, msgs, **kwargs):
+        rounds[id(self)] = rounds.get(id(self), 0) + 1
+        if rounds[id(self)] == 1:
+            return tool_call
+        if self.llm_generate_cfg["temperature"] > 0.9:
+            await asyncio.sleep(5)  # the straggler
+        return "<report>r</report>\n<answer>Paris.</answer>" if rounds[id(self)] == 2 else "unused"
+
+    async def fake_tool(self, tool_call_str):
+        executed.append(tool_call_str)
+        await asyncio.sleep(0.02)
+        return "observation"
+
+    monkeypatch.setattr(WebResearcherAgent, "call_server", fake_server)
+    monkeypatch.setattr(WebResearcherAgent, "_execute_tool_call", fake_tool)
+    monkeypatch.setattr(tts_agent, "WebResearcherAgent",
+                        lambda **kw: WebResearcherAgent(checkpoint_store=store, **kw))
+    agent = tts_agent.TestTimeScalingAgent(
+        {"model": "gpt-4o", "generate_cfg": {"temperature": 0.6}, "tts_consensus": True}, ["search"])
+    start = time.time()
+    result = asyncio.run(agent.run("capital of France?", num_parallel_agents=3))
+    assert time.time() - start < 2
+    assert result["consensus"] and result["final_synthesized_answer"] == "Paris."
+    assert len(result["parallel_runs"]) == 2
+    assert len(executed) == 1 and result["tool_cache"]["calls"] == 3
+    # the cancelled straggler leaves no "running" checkpoint behind
+    assert [run["status"] for run in store.list_runs()] == ["finished", "finished"]
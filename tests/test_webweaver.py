@@ -67,6 +67,98 @@ def test_retrieve_tool():
     assert "Content 2" in result
 
 
+def test_memory_bank_query_retrieval():
+    """Evidence can be retrieved by query (BM25, CJK aware) as well as by ID."""
+    memory = MemoryBank()
+    memory.add_evidence("Paris is the capital and largest city of France.", "France capital")
+    memory.add_evidence("Python is a programming language created by Guido van Rossum.", "Python language")
+    memory.add_evidence("刘翔在2006年洛桑田径超级大奖赛上打破110米栏世界纪录。", "刘翔 世界纪录")
+
+    assert memory.search("capital of France", top_k=1)[0][0] == "id_1"
+    assert memory.search("刘翔 破纪录", top_k=1)[0][0] == "id_3"
+    assert memory.search("capital of France", exclude_ids=["id_1"], top_k=1) == []
+
+    # only the summary and a bounded content prefix are indexed
+    memory.add_evidence("filler " * 2000 + "zebra", "long page")
+    assert memory.search("zebra") == [] and memory.search("long page", top_k=1)[0][0] == "id_4"
+    assert memory.index.doc_len["id_4"] < 1000
+
+    tool = RetrieveTool(memory)
+    result = tool.call({"citation_ids": ["id_2"], "query": "Python programming", "top_k": 2})
+    assert result.count("id='id_2'") == 1  # listed IDs are not returned twice
+    assert "Error" in tool.call({})
+
+
+def test_memory_bank_embedding_fusion():
+    """With an embedding function, BM25 and vector rankings are fused."""
+    vocab = ["cat", "dog", "car"]
+
+    def embed(texts):
+        return [[float(word in text.lower()) for word in vocab] for text in texts]
+
+    memory = MemoryBank(embed_fn=embed)
+    memory.add_evidence("A cat sleeps.", "cat")
+    memory.add_evidence("A dog barks.", "dog")
+    hits = memory.search("cat", top_k=2)
+    assert hits[0][0] == "id_1"
+
+
+def test_memory_bank_dedup():
+    """Same URL or near-identical content collapses to the first citation ID."""
+    memory = MemoryBank()
+    article = ("The Eiffel Tower is a wrought-iron lattice tower on the Champ de Mars in Paris, France. "
+               "It is named after the engineer Gustave Eiffel, whose company designed and built the tower "
+               "from 1887 to 1889 as the centerpiece of the 1889 World's Fair.")
+    memory.add_evidence(article, "Eiffel Tower", url="https://www.example.com/eiffel/?utm_source=x#history")
+    result = memory.add_evidence("other snippet", "Eiffel", url="http://example.com/eiffel")
+    assert "id_1" in result
+    result = memory.add_evidence(article.replace("Paris, France", "Paris France") + " ", "Eiffel again")
+    assert "id_1" in result
+    memory.add_evidence("Python is a programming language created by Guido van Rossum in 1991.", "Python")
+    # empty contents have no fingerprint and are never collapsed onto each other
+    assert "id_3" in memory.add_evidence("", "Python code executed with no output")
+    assert "id_4" in memory.add_evidence("  \n", "Python code executed with no output")
+
+    assert memory.get_all_ids() == ["id_1", "id_2", "id_3", "id_4"]
+    stats = memory.dedup_stats()
+    assert stats["added"] == 4 and stats["duplicates"] == 2
+    assert stats["url_hits"] == 1 and stats["content_hits"] == 1
+
+    plain = MemoryBank(dedup=False)
+    plain.add_evidence(article, "a")
+    plain.add_evidence(article, "a")
+    assert plain.size() == 2
+
+
+def test_memory_bank_disk_storage(tmp_path):
+    """Disk-backed evidence is read back through mmap and survives reopening."""
+    storage_dir = str(tmp_path / "bank")
+    memory = MemoryBank(storage_dir=storage_dir)
+    memory.add_evidence("Paris is the capital of France. 巴黎是法国首都。", "France capital",
+                        url="https://example.com/paris")
+    memory.add_evidence("Python is a programming language.", "Python")
+    assert "巴黎是法国首都" in memory.retrieve(["id_1"])
+    memory.add_evidence("Rust is a systems programming language.", "Rust")  # segment grows after mmap
+    assert "Rust" in memory.retrieve(["id_3"])
+    memory.close()
+
+    reopened = MemoryBank(storage_dir=storage_dir)
+    assert reopened.get_all_ids() == ["id_1", "id_2", "id_3"]
+    assert reopened.search("capital of France", top_k=1)[0][0] == "id_1"
+    # dedup state and the id counter are restored as well
+    assert "id_1" in reopened.add_evidence("another snippet", "Paris", url="https://example.com/paris")
+    assert "id_4" in reopened.add_evidence("Go is a programming language by Google.", "Go")
+    del reopened.evidence["id_2"]
+    reopened.close()
+
+    # a store with deletions can still be reopened
+    reopened = MemoryBank(storage_dir=storage_dir)
+    assert reopened.get_all_ids() == ["id_1", "id_3", "id_4"]
+    reopened.clear()
+    assert reopened.size() == 0
+    reopened.close()
+
+
 def test_planner_parse_output():
     """Test Planner's output parsing."""
     llm_config = {
@@ -174,6 +266,150 @@ def test_webweaver_agent_initialization():
         assert agent.memory_bank == agent.writer.memory_bank
 
 
+def test_parse_outline_sections():
+    """Top-level outline entries become sections with their citation IDs."""
+    from webresearcher.outline import parse_outline_sections
+    outline = """# Report on X
+1. Introduction <citation>id_1</citation>
+ 1.1 Background <citation>id_2, id_3</citation>
+2. Methods <citation>id_4</citation>
+3. Results"""
+    preamble, sections = parse_outline_sections(outline)
+    assert preamble == "# Report on X"
+    assert [s.title for s in sections] == ["1. Introduction", "2. Methods", "3. Results"]
+    assert sections[0].citation_ids == ["id_1", "id_2", "id_3"]
+    assert "1.1 Background" in sections[0].text
+
+    _, sections = parse_outline_sections("## 背景 id_1\n### 历史 id_2\n## 分析 id_3")
+    assert [s.citation_ids for s in sections] == [["id_1", "id_2"], ["id_3"]]
+    assert parse_outline_sections("no headings id_1")[1] == []
+
+
+def test_writer_parallel_sections(monkeypatch):
+    """Sections are written concurrently from their own evidence and stitched in outline order."""
+    memory = MemoryBank()
+    memory.add_evidence("Evidence about the introduction.", "intro")
+    memory.add_evidence("Evidence about the methods.", "methods")
+    writer = WebWeaverWriter({"model": "gpt-4o", "parallel_sections": True, "section_concurrency": 2}, memory)
+    active, peak, prompts = [0], [0], []
+
+    async def fake_server(msgs, **kwargs):
+        prompts.append(msgs[-1]["content"])
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.05 if "Introduction" in msgs[-1]["content"].split("[Section To Write]")[1] else 0.01)
+        active[0] -= 1
+        section = msgs[-1]["content"].split("[Section To Write]\n")[1].split("\n")[0]
+        return f"<plan>p</plan>\n<write>\n## {section}\ntext\n</write>"
+
+    monkeypatch.setattr(writer, "call_server", fake_server)
+    outline = "1. Introduction <citation>id_1</citation>\n2. Methods <citation>id_2</citation>\n3. Summary"
+    report = asyncio.run(writer.run("question", outline))
+    assert report.index("Introduction") < report.index("Methods") < report.index("Summary")
+    assert len(prompts) == 3 and peak[0] == 2
+    intro_prompt = next(p for p in prompts if "[Section To Write]\n1. Introduction" in p)
+    assert "Evidence about the introduction." in intro_prompt
+    assert "Next section: 2. Methods" in intro_prompt
+
+
+def test_rolling_report_digest():
+    """Earlier sections are condensed, the last one is kept in full, the digest stays bounded."""
+    from webresearcher.report_digest import RollingReport, digest_section
+    section = "## 1. Introduction\n\nX was founded in 1990 [cite:id_1]. It grew fast [cite:id_2]. More details follow."
+    entry = digest_section(section, max_tokens=8)
+    assert entry.startswith("- 1. Introduction: X was founded in 1990.")
+    assert "More details" not in entry and entry.endswith("(cites: id_1, id_2)")
+    assert digest_section(section, 0) == "- 1. Introduction (cites: id_1, id_2)"
+
+    report = RollingReport(digest_tokens=30, digest_budget=100)
+    for n in range(1, 21):
+        report.add(f"## {n}. Part {n}\n\n" + f"Sentence about part {n} [cite:id_{n}]. " * 30)
+    context = report.context()
+    assert "- 1. Part 1 (cites: id_1)" in context
+    assert context.count("Sentence about part 20") == 30
+    assert len(context) < 2 * len(report.last_section) + 1000
+    assert report.full_text().count("## ") == 20
+
+
+def test_writer_sequential_context_is_bounded(monkeypatch):
+    """Per-step prompt size of the sequential Writer does not grow with the report."""
+    writer = WebWeaverWriter({"model": "gpt-4o", "parallel_sections": False, "rolling_digest": True,
+                              "writer_digest_budget": 300},
+                             MemoryBank())
+    prompt_sizes = []
+
+    async def fake_server(msgs, **kwargs):
+        prompt_sizes.append(len(msgs[-1]["content"]))
+        n = len(prompt_sizes)
+        if n > 15:
+            return "<plan>done</plan>\n<terminate>"
+        return f"<plan>p</plan>\n<write>\n## {n}. Part\n\n" + f"Long prose for part {n}. " * 100 + "\n</write>"
+
+    monkeypatch.setattr(writer, "call_server", fake_server)
+    report = asyncio.run(writer.run("question", "a free-form outline"))
+    assert report.count("Long prose for part 7.") == 100
+    assert report.index("## 1. Part") < report.index("## 15. Part")
+    assert max(prompt_sizes[5:]) < prompt_sizes[5] * 1.2
+
+
+def test_pipeline_drafts_stable_sections(monkeypatch):
+    """Sections unchanged across planner steps are drafted during planning; edited ones are redone."""
+    agent = WebWeaverAgent({"model": "gpt-4o", "parallel_sections": True, "pipeline": True, "pipeline_stable_steps": 1})
+    outline = "1. Introduction id_1\n2. Methods id_2\n3. Results id_3"
+    edited = outline.replace("Results id_3", "Results id_3\n 3.1 Discussion id_4")
+    planner_steps = [outline, outline, edited, edited]
+    written = []
+
+    async def fake_planner(msgs, **kwargs):
+        await asyncio.sleep(0.02)
+        if not planner_steps:
+            return "<plan>done</plan>\n<terminate>"
+        return f"<plan>p</plan>\n<write_outline>\n{planner_steps.pop(0)}\n</write_outline>"
+
+    async def fake_writer(msgs, **kwargs):
+        section = msgs[-1]["content"].split("[Section To Write]\n")[1].split("\n")[0]
+        written.append(section)
+        return f"<plan>p</plan>\n<write>\n## {section}\ntext\n</write>"
+
+    monkeypatch.setattr(agent.planner, "call_server", fake_planner)
+    monkeypatch.setattr(agent.writer, "call_server", fake_writer)
+    result = asyncio.run(agent.run("question"))
+    report = result["final_report"]
+    assert report.index("Introduction") < report.index("Methods") < report.index("Results")
+    stats = result["pipeline"]
+    assert stats["reused"] == 3 and stats["written_after_planning"] == 0
+    assert stats["invalidated"] == 1 and sum(s.startswith("1. Introduction") for s in written) == 1
+
+
+
+def test_pipeline_failed_draft_and_repeated_titles(monkeypatch):
+    """A failed draft is queued again; sections with the same title keep separate drafts."""
+    from webresearcher.web_weaver_agent import SectionPipeline
+    writer = WebWeaverWriter({"model": "gpt-4o", "parallel_sections": True}, MemoryBank())
+    outline = "1. Intro id_1\n2. Notes id_2\n3. Notes id_3"
+    calls = []
+
+    async def fake_write_section(question, outline, sections, index):
+        calls.append(index)
+        if calls.count(0) == 1 and index == 0:
+            raise RuntimeError("LLM failed")
+        return f"## {sections[index].title}\ndraft of {sections[index].citation_ids[0]}"
+
+    monkeypatch.setattr(writer, "write_section", fake_write_section)
+
+    async def main():
+        pipeline = SectionPipeline(writer, "question", stable_steps=1)
+        pipeline.start()
+        for step in range(1, 5):
+            pipeline.observe(step, outline)
+            await asyncio.sleep(0.01)
+        return pipeline, await pipeline.finish(outline)
+
+    pipeline, report = asyncio.run(main())
+    assert calls.count(0) == 2 and pipeline.stats["invalidated"] == 0
+    assert "draft of id_2" in report and "draft of id_3" in report
+    assert pipeline.stats["reused"] == 3 and pipeline.stats["written_after_planning"] == 0
+
 if __name__ == "__main__":
     test_memory_bank_basic()
 
@@ -184,3 +420,26 @@ if __name__ == "__main__":
     test_writer_parse_output()
 
     test_webweaver_agent_initialization()
+
+
+def test_agent_closes_memory_bank(tmp_path, monkeypatch):
+    """A finished run closes the memory bank; only an explicit memory_bank_dir is kept on disk."""
+    from webresearcher import web_weaver_agent
+
+    async def failing_planner(question, on_step=None):
+        raise RuntimeError("planner down")
+
+    monkeypatch.setattr(web_weaver_agent, "MEMORY_BANK_DIR", str(tmp_path / "banks"))
+    agent = WebWeaverAgent({"model": "gpt-4o"})
+    agent.memory_bank.add_evidence("Evidence.", "summary")
+    assert len(os.listdir(tmp_path / "banks")) == 1
+    monkeypatch.setattr(agent.planner, "run", failing_planner)
+    assert "planner down" in asyncio.run(agent.run("question"))["error"]
+    assert os.listdir(tmp_path / "banks") == []
+
+    kept = str(tmp_path / "kept")
+    agent = WebWeaverAgent({"model": "gpt-4o", "memory_bank_dir": kept})
+    agent.memory_bank.add_evidence("Evidence.", "summary")
+    monkeypatch.setattr(agent.planner, "run", failing_planner)
+    asyncio.run(agent.run("question"))
+    assert MemoryBank(storage_dir=kept).size() == 1
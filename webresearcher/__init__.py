@@ -24,36 +24,6 @@ from webresearcher.base import (
 
 from webresearcher.prompt import TOOL_DESCRIPTIONS
 
-from webresearcher.web_researcher_agent import (
-    WebResearcherAgent,
-    ResearchRound,
-)
-
-from webresearcher.web_weaver_agent import (
-    WebWeaverAgent,
-    WebWeaverPlanner,
-    WebWeaverWriter,
-)
-
-from webresearcher.tts_agent import (
-    TestTimeScalingAgent,
-)
-
-from webresearcher.react_agent import (
-    ReactAgent,
-)
-
-from webresearcher.tool_memory import (
-    MemoryBank,
-    RetrieveTool,
-)
-
-from webresearcher.tool_planner_search import PlannerSearchTool
-from webresearcher.tool_planner_scholar import PlannerScholarTool
-from webresearcher.tool_planner_visit import PlannerVisitTool
-from webresearcher.tool_planner_python import PlannerPythonTool
-from webresearcher.tool_planner_file import PlannerFileTool
-
 # Logger
 from webresearcher.log import (
     logger,
@@ -61,12 +31,49 @@ from webresearcher.log import (
     add_file_logger,
 )
 
-# Tools
-from webresearcher.tool_search import Search
-from webresearcher.tool_visit import Visit
-from webresearcher.tool_scholar import Scholar
-from webresearcher.tool_python import PythonInterpreter
-from webresearcher.tool_file import FileParser
+# Agents and tools are imported on first attribute access (PEP 562), so
+# `import webresearcher` does not pull in openai, pandas, tiktoken or sandbox_fusion.
+_LAZY_IMPORTS = {
+    # Agents
+    "WebResearcherAgent": "webresearcher.web_researcher_agent",
+    "ResearchRound": "webresearcher.web_researcher_agent",
+    "TOOL_MAP": "webresearcher.web_researcher_agent",
+    "WebWeaverAgent": "webresearcher.web_weaver_agent",
+    "WebWeaverPlanner": "webresearcher.web_weaver_agent",
+    "WebWeaverWriter": "webresearcher.web_weaver_agent",
+    "TestTimeScalingAgent": "webresearcher.tts_agent",
+    "ReactAgent": "webresearcher.react_agent",
+    # Memory
+    "MemoryBank": "webresearcher.tool_memory",
+    "RetrieveTool": "webresearcher.tool_memory",
+    # Planner tools
+    "PlannerSearchTool": "webresearcher.tool_planner_search",
+    "PlannerScholarTool": "webresearcher.tool_planner_scholar",
+    "PlannerVisitTool": "webresearcher.tool_planner_visit",
+    "PlannerPythonTool": "webresearcher.tool_planner_python",
+    "PlannerFileTool": "webresearcher.tool_planner_file",
+    # Tools
+    "Search": "webresearcher.tool_search",
+    "Visit": "webresearcher.tool_visit",
+    "Scholar": "webresearcher.tool_scholar",
+    "PythonInterpreter": "webresearcher.tool_python",
+    "FileParser": "webresearcher.tool_file",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     # Version
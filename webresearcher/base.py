@@ -101,6 +101,13 @@ class BaseTool(ABC):
     name: str = ""
     description: str = ""
     parameters: Any = None  # JSON Schema format
+    # Identical concurrent calls may share one execution (read-only tools only, see single_flight.py)
+    single_flight: bool = False
+    # ToolExecutor lane ("network", "cpu" or "code"), max concurrent calls (0: lane bound only)
+    # and timeout in seconds (None: TOOL_CALL_TIMEOUT), see tool_executor.py
+    executor_lane: str = "network"
+    max_concurrency: int = 0
+    timeout: Optional[float] = None
     
     @abstractmethod
     def call(self, params: Dict, **kwargs) -> str:
@@ -194,20 +201,14 @@ def count_tokens(text: str, model: str = "gpt-4o") -> int:
     Returns:
         Number of tokens
     """
-    import tiktoken
-    
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        # Fallback to cl100k_base for unknown models
-        encoding = tiktoken.get_encoding("cl100k_base")
-    
-    return len(encoding.encode(str(text)))
+    from webresearcher.token_counter import count_tokens as _count_tokens
+
+    return _count_tokens(text, model)
 
 
 def get_tokenizer(model: str = "gpt-4o"):
     """
-    Get tiktoken tokenizer for a model.
+    Get tiktoken tokenizer for a model (cached per model).
     
     Args:
         model: Model name
@@ -215,16 +216,16 @@ def get_tokenizer(model: str = "gpt-4o"):
     Returns:
         Tiktoken encoding
     """
-    import tiktoken
-    
-    try:
-        return tiktoken.encoding_for_model(model)
-    except KeyError:
-        return tiktoken.get_encoding("cl100k_base")
+    from webresearcher.token_counter import get_encoding
+
+    return get_encoding(model)
 
 
-# For backward compatibility
-tokenizer = get_tokenizer()
+def __getattr__(name: str):
+    # For backward compatibility: `base.tokenizer` is loaded on first access, not at import
+    if name == "tokenizer":
+        return get_tokenizer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def build_text_completion_prompt(messages: List[Union[Message, Dict]], 
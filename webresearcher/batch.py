@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Batch research runner.
+
+Runs many questions through any agent with bounded concurrency:
+- Input: JSONL, one {"question": ..., ...} object (or a bare JSON string) per line
+- Up to `concurrency` questions in flight under one global semaphore, a fresh agent per question
+- Each result is appended to the output JSONL as soon as it finishes
+- Re-running with the same output file skips questions that already finished (resume)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from webresearcher.log import logger
+from webresearcher.rate_limiter import rate_limiter_stats
+from webresearcher.single_flight import single_flight_stats
+from webresearcher.tool_executor import get_tool_executor
+
+AGENT_MODES = ("webresearcher", "webweaver", "tts", "react")
+
+
+def make_question_id(question: str) -> str:
+    """Stable id for an input line without an explicit "id"."""
+    return hashlib.sha256(question.strip().encode("utf-8")).hexdigest()[:16]
+
+
+def load_questions(path: str) -> List[Dict[str, Any]]:
+    """
+    Load questions from a JSONL file.
+
+    Each line is a JSON object with a "question" field (other fields such as "id" or
+    "answer" are kept and copied to the output), or a bare JSON string.
+
+    Args:
+        path: Input JSONL path
+
+    Returns:
+        Question items, each with "id" and "question"
+    """
+    items = []
+    seen_ids = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no}: invalid JSON: {e}") from e
+            if isinstance(item, str):
+                item = {"question": item}
+            if not isinstance(item, dict) or not item.get("question"):
+                raise ValueError(f"{path}:{line_no}: missing 'question' field")
+            item["id"] = str(item.get("id") or make_question_id(item["question"]))
+            if item["id"] in seen_ids:
+                logger.warning(f"{path}:{line_no}: duplicate question id {item['id']}, skipped")
+                continue
+            seen_ids.add(item["id"])
+            items.append(item)
+    return items
+
+
+def load_finished_ids(output_path: str, retry_failed: bool = True) -> Set[str]:
+    """
+    Ids already recorded in an output JSONL file.
+
+    A partially written last line (e.g. after a crash) is ignored.
+
+    Args:
+        output_path: Output JSONL path
+        retry_failed: Don't count records with status "error" as finished
+
+    Returns:
+        Set of finished question ids
+    """
+    finished = set()
+    if not os.path.exists(output_path):
+        return finished
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(record, dict) or "id" not in record:
+                continue
+            if retry_failed and record.get("status") == "error":
+                continue
+            finished.add(str(record["id"]))
+    return finished
+
+
+def create_agent(mode: str, llm_config: Dict, function_list: Optional[List[str]] = None, instruction: str = ""):
+    """
+    Create an agent for one question.
+
+    Args:
+        mode: One of AGENT_MODES
+        llm_config: LLM configuration
+        function_list: Tools to enable (None: agent default)
+        instruction: Extra task instruction for the system prompt
+
+    Returns:
+        Agent instance
+    """
+    if mode == "webresearcher":
+        from webresearcher.web_researcher_agent import WebResearcherAgent
+        return WebResearcherAgent(llm_config=llm_config, function_list=function_list, instruction=instruction)
+    if mode == "webweaver":
+        from webresearcher.web_weaver_agent import WebWeaverAgent
+        return WebWeaverAgent(llm_config=llm_config, function_list=function_list, instruction=instruction)
+    if mode == "tts":
+        from webresearcher.tts_agent import TestTimeScalingAgent
+        return TestTimeScalingAgent(llm_config=llm_config, function_list=function_list)
+    if mode == "react":
+        from webresearcher.react_agent import ReactAgent
+        return ReactAgent(llm_config=llm_config, function_list=function_list, instruction=instruction)
+    raise ValueError(f"Unknown agent mode: {mode}, expected one of {AGENT_MODES}")
+
+
+async def run_agent(agent, mode: str, question: str, num_agents: int = 3) -> Tuple[str, Optional[str], Dict]:
+    """
+    Run an agent on one question.
+
+    Runs that end without an answer (termination outside ANSWER_TERMINATIONS, e.g.
+    "timeout" or "format error") are reported as errors so a resumed batch retries them.
+
+    Returns:
+        (prediction, error message or None on success, full result)
+    """
+    from webresearcher.tts_agent import ANSWER_TERMINATIONS
+
+    if mode == "tts":
+        result = await agent.run(question=question, num_parallel_agents=num_agents)
+        answered = any(isinstance(run, dict) and run.get("termination") in ANSWER_TERMINATIONS
+                       for run in result.get("parallel_runs", []))
+        error = None if answered else "no parallel run found an answer"
+        return result.get("final_synthesized_answer", ""), error, result
+    result = await agent.run(question)
+    if mode == "webweaver":
+        return result.get("final_report", ""), result.get("error"), result
+    termination = result.get("termination")
+    error = None if termination in ANSWER_TERMINATIONS else (termination or "no termination")
+    return result.get("prediction", ""), error, result
+
+
+async def run_batch(
+        items: Iterable[Dict[str, Any]],
+        output_path: str,
+        mode: str = "webresearcher",
+        llm_config: Optional[Dict] = None,
+        function_list: Optional[List[str]] = None,
+        instruction: str = "",
+        concurrency: int = 4,
+        num_agents: int = 3,
+        save_details: bool = False,
+        retry_failed: bool = True,
+        tool_workers: Optional[int] = None,
+        agent_factory=None,
+) -> Dict[str, Any]:
+    """
+    Run questions with bounded concurrency, streaming results to a JSONL file.
+
+    Args:
+        items: Question items from load_questions
+        output_path: Output JSONL path; finished ids in it are skipped (resume)
+        mode: Agent mode, one of AGENT_MODES
+        llm_config: LLM configuration
+        function_list: Tools to enable
+        instruction: Extra task instruction
+        concurrency: Maximum questions in flight
+        num_agents: Parallel agents per question in tts mode
+        save_details: Also store the full agent result (trajectory etc.) per record
+        retry_failed: Re-run questions whose previous record has status "error"
+        tool_workers: Size of the ToolExecutor network lane used for sync tool calls
+            (None: TOOL_NETWORK_WORKERS)
+        agent_factory: Optional callable(mode) -> agent, overrides create_agent
+
+    Returns:
+        Summary dict with total / skipped / success / error counts and elapsed seconds
+    """
+    if mode not in AGENT_MODES:
+        raise ValueError(f"Unknown agent mode: {mode}, expected one of {AGENT_MODES}")
+    items = list(items)
+    finished = load_finished_ids(output_path, retry_failed=retry_failed)
+    pending = [item for item in items if item["id"] not in finished]
+    summary = {"total": len(items), "skipped": len(items) - len(pending), "success": 0, "error": 0}
+    logger.info(f"Batch: {len(pending)} questions to run, {summary['skipped']} already finished, "
+                f"mode={mode}, concurrency={concurrency}")
+    if not pending:
+        summary["elapsed_seconds"] = 0.0
+        return summary
+
+    if tool_workers:
+        # Network-bound sync tools run in the ToolExecutor's network lane; size it for concurrent agents
+        get_tool_executor().set_lane_workers("network", tool_workers)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    # A crash may leave a partial last line; start on a fresh line
+    needs_newline = False
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    out = open(output_path, "a", encoding="utf-8")
+    if needs_newline:
+        out.write("\n")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    start_time = time.time()
+    done = 0
+
+    def _write(record: Dict):
+        out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        out.flush()
+
+    async def _run_one(item: Dict[str, Any]):
+        nonlocal done
+        async with semaphore:
+            question_start = time.time()
+            record = dict(item)
+            record["mode"] = mode
+            try:
+                agent = agent_factory(mode) if agent_factory else create_agent(
+                    mode, llm_config, function_list, instruction)
+                prediction, error, result = await run_agent(agent, mode, item["question"], num_agents)
+                record["prediction"] = prediction
+                if result.get("termination"):
+                    record["termination"] = result["termination"]
+                record["status"] = "error" if error else "success"
+                if error:
+                    record["error"] = error
+                if save_details:
+                    record["result"] = result
+            except Exception as e:
+                logger.error(f"Question {item['id']} failed: {e}")
+                record["status"] = "error"
+                record["error"] = f"{type(e).__name__}: {e}"
+            record["elapsed_seconds"] = round(time.time() - question_start, 3)
+            _write(record)
+            summary[record["status"]] += 1
+            done += 1
+            logger.info(f"[{done}/{len(pending)}] {item['id']} {record['status']} "
+                        f"in {record['elapsed_seconds']:.1f}s")
+
+    try:
+        await asyncio.gather(*[_run_one(item) for item in pending])
+    finally:
+        out.close()
+    summary["elapsed_seconds"] = round(time.time() - start_time, 3)
+    logger.info(f"Batch finished: {summary}")
+    logger.debug(f"Rate limiters: {rate_limiter_stats()}")
+    logger.debug(f"Single-flight tool calls: {single_flight_stats()}")
+    logger.debug(f"Tool executor: {get_tool_executor().stats()}")
+    return summary
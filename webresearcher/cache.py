@@ -0,0 +1,525 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Persistent SQLite result cache with TTL and LRU eviction.
+
+One SQLite file holds several namespaces (e.g. "search", "scholar"), so parallel
+TTS agents, batch workers and separate processes share the same results.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urldefrag
+
+from webresearcher.config import (
+    CACHE_DIR,
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_MAX_ENTRIES,
+    PAGE_CACHE_ENABLED,
+    PAGE_CACHE_TTL,
+    PAGE_CACHE_MAX_ENTRIES,
+    PAGE_CACHE_HOT_SIZE,
+    SUMMARY_CACHE_ENABLED,
+    SUMMARY_CACHE_TTL,
+    SUMMARY_CACHE_MAX_ENTRIES,
+)
+from webresearcher.log import logger
+
+DEFAULT_CACHE_FILE = "cache.sqlite3"
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its metadata."""
+    value: str
+    meta: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = 0.0
+    expired: bool = False
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a content-addressed key from normalized parts.
+
+    Args:
+        *parts: Key components; strings are whitespace-collapsed and lowercased
+
+    Returns:
+        Hex sha256 digest
+    """
+    normalized = []
+    for part in parts:
+        if isinstance(part, str):
+            normalized.append(" ".join(part.split()).lower())
+        else:
+            normalized.append(json.dumps(part, sort_keys=True, ensure_ascii=False))
+    return hashlib.sha256("\x1f".join(normalized).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    A namespaced key-value cache stored in a local SQLite file.
+
+    Entries older than `ttl` seconds are treated as misses (but kept until evicted,
+    so callers can revalidate them). When a namespace grows past `max_entries`,
+    the least recently accessed entries are evicted.
+    """
+
+    def __init__(
+            self,
+            namespace: str,
+            path: Optional[str] = None,
+            ttl: float = 86400,
+            max_entries: int = 50000,
+            compress: bool = False,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            namespace: Logical cache name, entries of different namespaces never collide
+            path: SQLite file path (default: CACHE_DIR/cache.sqlite3)
+            ttl: Time-to-live in seconds, <= 0 means never expire
+            max_entries: Maximum number of entries kept in this namespace
+            compress: Whether to zlib-compress stored values
+        """
+        self.namespace = namespace
+        self.path = path or os.path.join(CACHE_DIR, DEFAULT_CACHE_FILE)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, meta TEXT, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache (namespace, accessed_at)"
+            )
+            self._conn.commit()
+
+    def _encode(self, value: str) -> bytes:
+        data = value.encode("utf-8")
+        return zlib.compress(data) if self.compress else data
+
+    def _decode(self, data: bytes) -> str:
+        if self.compress:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+
+    def get_entry(self, key: str, allow_expired: bool = False) -> Optional[CacheEntry]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+            allow_expired: Return expired entries (flagged `expired`) instead of a miss
+
+        Returns:
+            CacheEntry or None on miss
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, meta, created_at FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+            except sqlite3.Error as e:
+                # A locked or corrupt cache file must not break the calling tool
+                logger.warning(f"[ResultCache:{self.namespace}] read failed, treating as miss: {e}")
+                row = None
+            expired = row is not None and self.ttl > 0 and now - row[2] > self.ttl
+            if row is None or (expired and not allow_expired):
+                self.misses += 1
+                return None
+            try:
+                self._conn.execute(
+                    "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.debug(f"[ResultCache:{self.namespace}] access time not updated: {e}")
+            if not expired:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return CacheEntry(
+            value=self._decode(row[0]),
+            meta=json.loads(row[1]) if row[1] else {},
+            created_at=row[2],
+            expired=expired,
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a fresh value, or None on miss/expiry."""
+        entry = self.get_entry(key)
+        return entry.value if entry else None
+
+    def set(self, key: str, value: str, meta: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Store a value and evict least recently used entries over the size cap.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            meta: Optional JSON-serializable metadata
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (namespace, key, value, meta, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.namespace, key, self._encode(value),
+                     json.dumps(meta, ensure_ascii=False) if meta else None, now, now),
+                )
+                self._evict_locked()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                # e.g. database locked or disk full: skip the write, the result is still returned
+                logger.warning(f"[ResultCache:{self.namespace}] write skipped: {e}")
+                self._rollback_locked()
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as fresh again (e.g. after a successful revalidation)."""
+        now = time.time()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "UPDATE cache SET created_at = ?, accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, now, self.namespace, key),
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[ResultCache:{self.namespace}] touch skipped: {e}")
+                self._rollback_locked()
+
+    def delete(self, key: str) -> None:
+        """Delete an entry."""
+        with self._lock:
+            try:
+                self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[ResultCache:{self.namespace}] delete skipped: {e}")
+                self._rollback_locked()
+
+    def record_hit(self) -> None:
+        """Count a hit served from a front tier (e.g. PageCache's in-memory LRU)."""
+        with self._lock:
+            self.hits += 1
+
+    def _rollback_locked(self) -> None:
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+
+    def _evict_locked(self) -> None:
+        if self.max_entries <= 0:
+            return
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache WHERE namespace = ? ORDER BY accessed_at ASC LIMIT ?)",
+                (self.namespace, self.namespace, overflow),
+            )
+            logger.debug(f"[ResultCache:{self.namespace}] evicted {overflow} LRU entries")
+
+    def size(self) -> int:
+        """Number of entries in this namespace."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": self.size(),
+        }
+
+    def clear(self) -> None:
+        """Delete all entries in this namespace and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+
+_caches: Dict[Tuple[str, str], ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace: str, path: Optional[str] = None, **kwargs) -> ResultCache:
+    """
+    Get the process-wide ResultCache for a namespace (created on first use).
+
+    Args:
+        namespace: Cache namespace
+        path: SQLite file path (default: CACHE_DIR/cache.sqlite3)
+        **kwargs: ResultCache options used on first creation (ttl, max_entries, compress)
+
+    Returns:
+        Shared ResultCache
+    """
+    path = path or os.path.join(CACHE_DIR, DEFAULT_CACHE_FILE)
+    with _caches_lock:
+        cache = _caches.get((namespace, path))
+        if cache is None:
+            cache = ResultCache(namespace, path=path, **kwargs)
+            _caches[(namespace, path)] = cache
+        return cache
+
+
+def get_search_cache(namespace: str) -> Optional[ResultCache]:
+    """
+    Get the shared cache used by the serper-backed tools (search / scholar).
+
+    Args:
+        namespace: Cache namespace, e.g. "search" or "scholar"
+
+    Returns:
+        ResultCache, or None if caching is disabled or the cache file cannot be opened
+    """
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    try:
+        return get_cache(namespace, ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES)
+    except Exception as e:
+        logger.warning(f"[ResultCache] disabled for '{namespace}': {e}")
+        return None
+
+
+class PageCache:
+    """
+    Two-tier cache of fetched page content keyed by URL.
+
+    A small in-memory LRU (hot tier) sits in front of a compressed ResultCache on disk.
+    Entries keep their HTTP validators (ETag / Last-Modified) in `meta` so that an
+    expired page can be revalidated with a conditional request instead of refetched.
+    """
+
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            ttl: float = PAGE_CACHE_TTL,
+            max_entries: int = PAGE_CACHE_MAX_ENTRIES,
+            hot_size: int = PAGE_CACHE_HOT_SIZE,
+    ):
+        """
+        Initialize page cache.
+
+        Args:
+            path: SQLite file path (default: CACHE_DIR/cache.sqlite3)
+            ttl: Time-to-live in seconds before a page must be revalidated
+            max_entries: Maximum number of pages kept on disk
+            hot_size: Maximum number of pages kept in memory
+        """
+        self.store = ResultCache("page", path=path, ttl=ttl, max_entries=max_entries, compress=True)
+        self.ttl = ttl
+        self.hot_size = hot_size
+        self._hot: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url: str) -> str:
+        """Cache key for a URL (fragment dropped, case preserved)."""
+        return hashlib.sha256(urldefrag(url.strip())[0].encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._hot[key] = entry
+            self._hot.move_to_end(key)
+            while len(self._hot) > self.hot_size:
+                self._hot.popitem(last=False)
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Look up a page, including expired ones (flagged `expired`) for revalidation.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            CacheEntry or None if the page was never cached
+        """
+        key = self.make_key(url)
+        with self._lock:
+            entry = self._hot.get(key)
+            if entry is not None:
+                self._hot.move_to_end(key)
+        if entry is not None:
+            entry.expired = self.ttl > 0 and time.time() - entry.created_at > self.ttl
+            if not entry.expired:
+                self.store.record_hit()
+                return entry
+        entry = self.store.get_entry(key, allow_expired=True)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, url: str, content: str, validators: Optional[Dict[str, str]] = None) -> None:
+        """Store a freshly fetched page with its HTTP validators."""
+        key = self.make_key(url)
+        self.store.set(key, content, meta=validators)
+        self._remember(key, CacheEntry(value=content, meta=validators or {}, created_at=time.time()))
+
+    def touch(self, url: str) -> None:
+        """Mark a page as fresh after a 304 Not Modified revalidation."""
+        key = self.make_key(url)
+        self.store.touch(key)
+        with self._lock:
+            entry = self._hot.get(key)
+            if entry is not None:
+                entry.created_at = time.time()
+                entry.expired = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        stats = self.store.stats()
+        stats["hot_size"] = len(self._hot)
+        return stats
+
+
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """
+    Get the process-wide page cache used by Visit.
+
+    Returns:
+        PageCache, or None if caching is disabled or the cache file cannot be opened
+    """
+    global _page_cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        if _page_cache is None:
+            try:
+                _page_cache = PageCache()
+            except Exception as e:
+                logger.warning(f"[PageCache] disabled: {e}")
+                return None
+        return _page_cache
+
+
+class SummaryMemo:
+    """
+    Memo of goal-directed page extractions keyed by (content hash, normalized goal, model).
+
+    Stores the parsed evidence/summary JSON so retries, TTS fan-out and batch runs
+    don't resend the same page to the summary model. `tokens_saved` counts the
+    summary prompt tokens avoided by hits.
+    """
+
+    def __init__(
+            self,
+            path: Optional[str] = None,
+            ttl: float = SUMMARY_CACHE_TTL,
+            max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initialize summary memo.
+
+        Args:
+            path: SQLite file path (default: CACHE_DIR/cache.sqlite3)
+            ttl: Time-to-live in seconds
+            max_entries: Maximum number of memoized extractions
+        """
+        self.store = ResultCache("summary", path=path, ttl=ttl, max_entries=max_entries, compress=True)
+        self.tokens_saved = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(content: str, goal: str, model: str) -> str:
+        """Memo key for a page content, goal and summary model."""
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return make_cache_key(content_hash, goal, model)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a memoized extraction.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            Parsed extraction dict (evidence / summary), or None on miss
+        """
+        entry = self.store.get_entry(key)
+        if entry is None:
+            return None
+        with self._lock:
+            self.tokens_saved += int(entry.meta.get("prompt_tokens", 0))
+        return json.loads(entry.value)
+
+    def put(self, key: str, result: Dict[str, Any], prompt_tokens: int = 0) -> None:
+        """
+        Memoize a parsed extraction.
+
+        Args:
+            key: Key from make_key
+            result: Parsed extraction dict
+            prompt_tokens: Summary prompt size, credited to `tokens_saved` on later hits
+        """
+        self.store.set(key, json.dumps(result, ensure_ascii=False), meta={"prompt_tokens": prompt_tokens})
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and summary tokens saved."""
+        stats = self.store.stats()
+        stats["tokens_saved"] = self.tokens_saved
+        return stats
+
+
+_summary_memo: Optional[SummaryMemo] = None
+
+
+def get_summary_memo() -> Optional[SummaryMemo]:
+    """
+    Get the process-wide summary memo used by Visit.
+
+    Returns:
+        SummaryMemo, or None if memoization is disabled or the cache file cannot be opened
+    """
+    global _summary_memo
+    if not SUMMARY_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        if _summary_memo is None:
+            try:
+                _summary_memo = SummaryMemo()
+            except Exception as e:
+                logger.warning(f"[SummaryMemo] disabled: {e}")
+                return None
+        return _summary_memo
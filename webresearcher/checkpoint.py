@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Resumable research state checkpoints.
+
+WebResearcherAgent stores its IterResearch state (question, report, last observation,
+round number, remaining LLM budget, trajectory) after every round, so a run interrupted by
+a crash, timeout or LLM error continues from its last completed round instead of round 1.
+
+Checkpoints are append-only rows in a local SQLite file. Each row holds only the
+trajectory messages added since the previous row, so saving a round costs O(round size)
+rather than O(trajectory size).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+
+from webresearcher.config import CHECKPOINT_PATH
+from webresearcher.log import logger
+
+# Run status stored with each checkpoint
+STATUS_RUNNING = "running"
+STATUS_INTERRUPTED = "interrupted"
+STATUS_FINISHED = "finished"
+RESUMABLE_STATUSES = (STATUS_RUNNING, STATUS_INTERRUPTED)
+
+
+def make_run_id(question: str, model: str = "", generate_cfg: Optional[Dict] = None) -> str:
+    """
+    Stable run id when the caller does not provide one.
+
+    The model and sampling config are part of the id, so e.g. the parallel agents of
+    TestTimeScalingAgent (different temperatures) never share checkpoints.
+    """
+    text = "\x1f".join([" ".join(question.split()), model or "",
+                        json.dumps(generate_cfg or {}, sort_keys=True, default=str)])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """
+    Append-only checkpoint log in a SQLite file, keyed by run id and round.
+
+    Usage:
+        store = CheckpointStore()
+        store.save(run_id, state, new_messages)
+        checkpoint = store.load(run_id)  # state + full trajectory, or None
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            path: SQLite file path (default: CHECKPOINT_PATH)
+        """
+        self.path = path or CHECKPOINT_PATH
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints ("
+                "run_id TEXT NOT NULL, seq INTEGER NOT NULL, round_num INTEGER NOT NULL, "
+                "status TEXT NOT NULL, state TEXT NOT NULL, messages BLOB NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (run_id, seq))"
+            )
+            self._conn.commit()
+
+    def save(self, run_id: str, state: Dict[str, Any], new_messages: Optional[List[Dict]] = None,
+             status: str = STATUS_RUNNING) -> int:
+        """
+        Append a checkpoint.
+
+        Args:
+            run_id: Run identifier
+            state: JSON-serializable research state; must contain "round_num"
+            new_messages: Trajectory messages added since the previous checkpoint
+            status: STATUS_RUNNING, STATUS_INTERRUPTED or STATUS_FINISHED
+
+        Returns:
+            Sequence number of the new row
+        """
+        state_text = json.dumps(state, ensure_ascii=False, default=str)
+        messages = zlib.compress(json.dumps(new_messages or [], ensure_ascii=False, default=str).encode("utf-8"))
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(seq) FROM checkpoints WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            seq = (row[0] or 0) + 1
+            self._conn.execute(
+                "INSERT INTO checkpoints (run_id, seq, round_num, status, state, messages, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, seq, int(state.get("round_num", 0)), status, state_text, messages, time.time()),
+            )
+            self._conn.commit()
+        return seq
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the latest checkpoint of a run.
+
+        Args:
+            run_id: Run identifier
+
+        Returns:
+            Dict with "state", "status", "round_num" and the full "trajectory", or None
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT round_num, status, state, messages FROM checkpoints WHERE run_id = ? ORDER BY seq",
+                (run_id,),
+            ).fetchall()
+        if not rows:
+            return None
+        trajectory = []
+        for _, _, _, messages in rows:
+            trajectory.extend(json.loads(zlib.decompress(messages).decode("utf-8")))
+        round_num, status, state, _ = rows[-1]
+        return {"state": json.loads(state), "status": status, "round_num": round_num, "trajectory": trajectory}
+
+    def delete(self, run_id: str):
+        """Drop all checkpoints of a run."""
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+            self._conn.commit()
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """Latest round, status and update time of every stored run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.run_id, c.round_num, c.status, c.created_at FROM checkpoints c "
+                "JOIN (SELECT run_id, MAX(seq) AS seq FROM checkpoints GROUP BY run_id) m "
+                "ON c.run_id = m.run_id AND c.seq = m.seq ORDER BY c.created_at"
+            ).fetchall()
+        return [{"run_id": r[0], "round_num": r[1], "status": r[2], "updated_at": r[3]} for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[CheckpointStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> Optional[CheckpointStore]:
+    """Process-wide checkpoint store at CHECKPOINT_PATH, or None if the file can't be opened."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            try:
+                _default_store = CheckpointStore()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Checkpoint store unavailable, checkpoints disabled: {e}")
+                return None
+        return _default_store
@@ -12,29 +12,18 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from webresearcher.log import logger
-from webresearcher.web_researcher_agent import WebResearcherAgent
-from webresearcher.web_weaver_agent import WebWeaverAgent
-from webresearcher.tts_agent import TestTimeScalingAgent
 
 
-def setup_logger(verbose: bool = False):
-    """Configure logging"""
-    logger.remove()
-    if verbose:
-        logger.add(sys.stderr, level="DEBUG")
-    else:
-        logger.add(sys.stderr, level="INFO")
-
-
-async def run_research(args):
-    """Run research agent"""
-    # Load environment variables
-    env_file = Path(args.env_file) if args.env_file else Path('.env')
+def load_env(env_file_arg=None):
+    """Load environment variables from a .env file"""
+    env_file = Path(env_file_arg) if env_file_arg else Path('.env')
     if env_file.exists():
         load_dotenv(env_file, override=True)
         logger.info(f"Loaded environment from: {env_file}")
-    
-    # Build LLM config
+
+
+def build_llm_config(args):
+    """Build LLM config from command-line arguments"""
     llm_config = {
         "model": args.model,
         "generate_cfg": {
@@ -44,10 +33,34 @@ async def run_research(args):
             "presence_penalty": args.presence_penalty,
         }
     }
-    
+
     # Only add model_thinking_type if explicitly set by user (not default)
     if hasattr(args, 'thinking_type') and args.thinking_type != 'disabled':
         llm_config["generate_cfg"]["model_thinking_type"] = args.thinking_type
+    return llm_config
+
+
+def setup_logger(verbose: bool = False):
+    """Configure logging"""
+    logger.remove()
+    if verbose:
+        logger.add(sys.stderr, level="DEBUG")
+    else:
+        logger.add(sys.stderr, level="INFO")
+
+
+async def run_research(args):
+    """Run research agent"""
+    # Load environment variables
+    load_env(args.env_file)
+
+    # Agents (and their heavy dependencies) are imported on demand to keep `--help` fast
+    from webresearcher.web_researcher_agent import WebResearcherAgent
+    from webresearcher.web_weaver_agent import WebWeaverAgent
+    from webresearcher.tts_agent import TestTimeScalingAgent
+    
+    # Build LLM config
+    llm_config = build_llm_config(args)
     
     # Parse function list
     function_list = args.tools.split(',') if args.tools else [
@@ -97,42 +110,19 @@ async def run_research(args):
     return result
 
 
-def create_parser():
-    """Create argument parser"""
-    parser = argparse.ArgumentParser(
-        prog='webresearcher',
-        description='WebResearcher: An Iterative Deep-Research Agent',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Basic research question (WebResearcher - single-agent)
-  webresearcher "What is the capital of France?"
-  
-  # Use WebWeaver for comprehensive reports with citations
-  webresearcher "What are the causes of climate change?" --use-webweaver
-  
-  # With custom model and tools
-  webresearcher "刘翔破纪录时候是多少岁?" --model gpt-4o --tools search,google_scholar
-  
-  # Using Test-Time Scaling for higher accuracy
-  webresearcher "Complex question" --use-tts --num-agents 3
-  
-  # Save detailed results
-  webresearcher "Question" --output results.json --use-webweaver
-  
-  # Verbose logging
-  webresearcher "Question" --verbose
+async def run_and_close_clients(coro):
+    """Await a CLI coroutine, then close the shared LLM clients before its event loop ends"""
+    from webresearcher.llm_client import aclose_clients, close_clients
 
-For more information: https://github.com/shibing624/WebResearcher
-        """
-    )
-    
-    parser.add_argument(
-        'question',
-        type=str,
-        help='Research question to answer'
-    )
-    
+    try:
+        return await coro
+    finally:
+        await aclose_clients()
+        close_clients()
+
+
+def add_model_arguments(parser):
+    """Add LLM and tool arguments shared by the research and batch commands"""
     parser.add_argument(
         '--model', '-m',
         type=str,
@@ -182,6 +172,48 @@ For more information: https://github.com/shibing624/WebResearcher
         default='search,google_scholar,python',
         help='Comma-separated list of tools to enable (default: search,google_scholar,python)'
     )
+
+
+def create_parser():
+    """Create argument parser"""
+    parser = argparse.ArgumentParser(
+        prog='webresearcher',
+        description='WebResearcher: An Iterative Deep-Research Agent',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Basic research question (WebResearcher - single-agent)
+  webresearcher "What is the capital of France?"
+  
+  # Use WebWeaver for comprehensive reports with citations
+  webresearcher "What are the causes of climate change?" --use-webweaver
+  
+  # With custom model and tools
+  webresearcher "刘翔破纪录时候是多少岁?" --model gpt-4o --tools search,google_scholar
+  
+  # Using Test-Time Scaling for higher accuracy
+  webresearcher "Complex question" --use-tts --num-agents 3
+  
+  # Save detailed results
+  webresearcher "Question" --output results.json --use-webweaver
+  
+  # Verbose logging
+  webresearcher "Question" --verbose
+
+  # Batch mode: JSONL in, JSONL out, 8 questions at a time (see `webresearcher batch --help`)
+  webresearcher batch questions.jsonl -o results.jsonl --concurrency 8
+
+For more information: https://github.com/shibing624/WebResearcher
+        """
+    )
+    
+    parser.add_argument(
+        'question',
+        type=str,
+        help='Research question to answer'
+    )
+    
+    add_model_arguments(parser)
     
     parser.add_argument(
         '--use-webweaver',
@@ -223,8 +255,151 @@ For more information: https://github.com/shibing624/WebResearcher
     return parser
 
 
+def create_batch_parser():
+    """Create argument parser for `webresearcher batch`"""
+    parser = argparse.ArgumentParser(
+        prog='webresearcher batch',
+        description='Run many research questions concurrently, streaming results to JSONL',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Input JSONL: one {"question": "...", "id": "...", "answer": "..."} object per line
+("id" and other fields are optional and copied to the output).
+
+Examples:
+  # 8 questions in flight, results appended to results.jsonl as they finish
+  webresearcher batch questions.jsonl -o results.jsonl --concurrency 8
+
+  # Re-run the same command after a crash: finished questions are skipped
+  webresearcher batch questions.jsonl -o results.jsonl --concurrency 8 --mode webweaver
+        """
+    )
+
+    parser.add_argument(
+        'input',
+        type=str,
+        help='Input JSONL file with questions'
+    )
+
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        required=True,
+        help='Output JSONL file; existing results in it are skipped (resume)'
+    )
+
+    parser.add_argument(
+        '--mode',
+        type=str,
+        choices=['webresearcher', 'webweaver', 'tts', 'react'],
+        default='webresearcher',
+        help='Agent to run for each question (default: webresearcher)'
+    )
+
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=4,
+        help='Maximum questions researched at the same time (default: 4)'
+    )
+
+    add_model_arguments(parser)
+
+    parser.add_argument(
+        '--num-agents',
+        type=int,
+        default=3,
+        help='Number of parallel agents per question in tts mode (default: 3)'
+    )
+
+    parser.add_argument(
+        '--tool-workers',
+        type=int,
+        default=0,
+        help='Thread pool size for network tool calls (default: 4 x concurrency)'
+    )
+
+    parser.add_argument(
+        '--save-details',
+        action='store_true',
+        help='Also store the full agent result (trajectory, report) in each output record'
+    )
+
+    parser.add_argument(
+        '--no-retry-failed',
+        action='store_true',
+        help='On resume, skip questions whose previous run failed instead of retrying them'
+    )
+
+    parser.add_argument(
+        '--env-file',
+        type=str,
+        help='Path to .env file (default: .env)'
+    )
+
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Enable verbose logging'
+    )
+
+    return parser
+
+
+async def run_batch_research(args):
+    """Run `webresearcher batch`"""
+    load_env(args.env_file)
+
+    from webresearcher.batch import load_questions, run_batch
+
+    items = load_questions(args.input)
+    function_list = args.tools.split(',') if args.tools else None
+    summary = await run_batch(
+        items,
+        output_path=args.output,
+        mode=args.mode,
+        llm_config=build_llm_config(args),
+        function_list=function_list,
+        concurrency=args.concurrency,
+        num_agents=args.num_agents,
+        save_details=args.save_details,
+        retry_failed=not args.no_retry_failed,
+        tool_workers=args.tool_workers or 4 * max(1, args.concurrency),
+    )
+
+    print("\n" + "="*80)
+    print("BATCH RESULTS")
+    print("="*80)
+    print(f"Total: {summary['total']} | Skipped (already done): {summary['skipped']} | "
+          f"Success: {summary['success']} | Error: {summary['error']}")
+    print(f"Elapsed: {summary['elapsed_seconds']:.1f}s | Results: {args.output}")
+    return summary
+
+
+def batch_main(argv):
+    """Entry point for `webresearcher batch`"""
+    args = create_batch_parser().parse_args(argv)
+    setup_logger(args.verbose)
+    logger.info(f"Model: {args.model} | Mode: {args.mode} | Concurrency: {args.concurrency}")
+
+    try:
+        summary = asyncio.run(run_and_close_clients(run_batch_research(args)))
+        return 0 if summary['error'] == 0 else 1
+    except KeyboardInterrupt:
+        logger.warning(f"\nBatch interrupted by user, re-run the same command to resume from {args.output}")
+        return 130
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
 def main():
     """Main entry point"""
+    if sys.argv[1:2] == ['batch']:
+        return batch_main(sys.argv[2:])
+
     parser = create_parser()
     args = parser.parse_args()
     
@@ -236,7 +411,7 @@ def main():
     
     try:
         # Run research
-        result = asyncio.run(run_research(args))
+        result = asyncio.run(run_and_close_clients(run_research(args)))
         return 0
     except KeyboardInterrupt:
         logger.warning("\nResearch interrupted by user")
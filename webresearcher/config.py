@@ -7,6 +7,14 @@
 import os
 
 
+def env_flag(name: str, default: bool = False) -> bool:
+    """Boolean environment setting; "0", "false" and "no" (any case) mean off."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ('0', 'false', 'no')
+
+
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
 
@@ -16,3 +24,67 @@ OBS_END = '\n</tool_response>'
 MAX_LLM_CALL_PER_RUN = int(os.getenv('MAX_LLM_CALL_PER_RUN', 100))
 AGENT_TIMEOUT = int(os.getenv('AGENT_TIMEOUT', 600))
 FILE_DIR = os.getenv('FILE_DIR', './files')
+# Independent <tool_call> blocks allowed per IterResearch round (run in parallel) and the per-call timeout
+MAX_TOOL_CALLS_PER_ROUND = int(os.getenv('MAX_TOOL_CALLS_PER_ROUND', 1))
+TOOL_CALL_TIMEOUT = int(os.getenv('TOOL_CALL_TIMEOUT', 600))
+# Tool executor: thread pool size per lane, per-tool caps / timeouts as "python=2,parse_file=1"
+TOOL_NETWORK_WORKERS = int(os.getenv('TOOL_NETWORK_WORKERS', 32))
+TOOL_CPU_WORKERS = int(os.getenv('TOOL_CPU_WORKERS', min(4, os.cpu_count() or 1)))
+TOOL_CODE_WORKERS = int(os.getenv('TOOL_CODE_WORKERS', 4))
+TOOL_CONCURRENCY = os.getenv('TOOL_CONCURRENCY', '')
+TOOL_TIMEOUTS = os.getenv('TOOL_TIMEOUTS', '')
+# Worker processes for CPU-heavy document parsing (0: parse in the calling thread); large PDFs are split into page ranges
+FILE_PARSE_WORKERS = int(os.getenv('FILE_PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+PDF_PAGES_PER_WORKER = int(os.getenv('PDF_PAGES_PER_WORKER', 20))
+# Stream LLM responses and stop generation once an action block (<tool_call>/<answer>) is complete
+LLM_STREAM = env_flag('LLM_STREAM', False)
+# While streaming, start read-only tools (search/scholar/visit/parse_file) as soon as the tool_call JSON is complete
+SPECULATIVE_TOOL_CALLS = env_flag('SPECULATIVE_TOOL_CALLS', False)
+
+# Persistent result cache (search / scholar)
+CACHE_DIR = os.getenv('WEBRESEARCHER_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'webresearcher'))
+SEARCH_CACHE_ENABLED = env_flag('SEARCH_CACHE_ENABLED', True)
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 86400))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 50000))
+
+# Fetched-page cache (visit)
+PAGE_CACHE_ENABLED = env_flag('PAGE_CACHE_ENABLED', True)
+PAGE_CACHE_TTL = int(os.getenv('PAGE_CACHE_TTL', 21600))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv('PAGE_CACHE_MAX_ENTRIES', 5000))
+PAGE_CACHE_HOT_SIZE = int(os.getenv('PAGE_CACHE_HOT_SIZE', 128))
+
+# Goal-aware page summary memo (visit)
+SUMMARY_CACHE_ENABLED = env_flag('SUMMARY_CACHE_ENABLED', True)
+SUMMARY_CACHE_TTL = int(os.getenv('SUMMARY_CACHE_TTL', 604800))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv('SUMMARY_CACHE_MAX_ENTRIES', 20000))
+
+# Resumable WebResearcherAgent runs: research state is checkpointed after every round
+CHECKPOINT_ENABLED = env_flag('CHECKPOINT_ENABLED', False)
+CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH', os.path.join(CACHE_DIR, 'checkpoints.sqlite3'))
+
+# WebWeaver MemoryBank on disk (append-only segment file + mmap) instead of RAM; empty = in memory
+MEMORY_BANK_DIR = os.getenv('MEMORY_BANK_DIR', '')
+# WebWeaver Writer: write outline sections concurrently, one LLM call each
+WRITER_PARALLEL_SECTIONS = env_flag('WRITER_PARALLEL_SECTIONS', False)
+WRITER_SECTION_CONCURRENCY = int(os.getenv('WRITER_SECTION_CONCURRENCY', 4))
+# WebWeaver sequential Writer: show earlier sections as a bounded digest instead of the full report
+WRITER_ROLLING_DIGEST = env_flag('WRITER_ROLLING_DIGEST', False)
+# Draft frozen outline sections while the Planner is still running
+WEBWEAVER_PIPELINE = env_flag('WEBWEAVER_PIPELINE', False)
+PIPELINE_STABLE_STEPS = int(os.getenv('PIPELINE_STABLE_STEPS', 3))
+# TTS: share tool results across the parallel agents, stop once a quorum agrees on the answer
+TTS_SHARED_TOOL_CACHE = env_flag('TTS_SHARED_TOOL_CACHE', True)
+TTS_CONSENSUS = env_flag('TTS_CONSENSUS', False)
+# Identical concurrent calls of opted-in tools share one execution
+SINGLE_FLIGHT_ENABLED = env_flag('SINGLE_FLIGHT_ENABLED', True)
+
+# Shared rate limiting per endpoint (requests/min and tokens/min, 0 = unlimited) with an
+# adaptive (AIMD) concurrency limit that halves on 429/5xx and grows back on success
+RATE_LIMIT_ENABLED = env_flag('RATE_LIMIT_ENABLED', True)
+LLM_RPM = int(os.getenv('LLM_RPM', 0))
+LLM_TPM = int(os.getenv('LLM_TPM', 0))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 64))
+SERPER_RPM = int(os.getenv('SERPER_RPM', 0))
+SERPER_MAX_CONCURRENCY = int(os.getenv('SERPER_MAX_CONCURRENCY', 32))
+JINA_RPM = int(os.getenv('JINA_RPM', 0))
+JINA_MAX_CONCURRENCY = int(os.getenv('JINA_MAX_CONCURRENCY', 32))
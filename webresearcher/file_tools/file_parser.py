@@ -1,10 +1,15 @@
+import functools
 import json
+import multiprocessing
 import os
 import re
+import threading
 import zipfile
 import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from collections import Counter
 import xml.etree.ElementTree as ET
 from pandas import Timestamp
@@ -14,6 +19,7 @@ from pandas.api.types import is_datetime64_any_dtype
 import pandas as pd
 
 from webresearcher.log import logger
+from webresearcher.config import FILE_PARSE_WORKERS, PDF_PAGES_PER_WORKER
 from webresearcher.base import (
     DEFAULT_WORKSPACE, 
     DEFAULT_MAX_INPUT_TOKENS,
@@ -21,8 +27,8 @@ from webresearcher.base import (
     KeyNotExistsError,
     Storage,
     count_tokens,
-    tokenizer
 )
+from webresearcher.token_counter import truncate_to_tokens
 from webresearcher.file_tools.utils import (
     get_file_type,
     hash_sha256,
@@ -137,16 +143,20 @@ def parse_ppt(path: str, extract_image: bool = False):
     return doc
 
 
-def parse_pdf(pdf_path: str, extract_image: bool = False) -> List[dict]:
+def parse_pdf(pdf_path: str, extract_image: bool = False, page_range: Optional[Tuple[int, int]] = None) -> List[dict]:
+    """Parse a PDF, or only pages [start, end) (0-based) of it when page_range is given."""
     # Todo: header and footer
     from pdfminer.high_level import extract_pages
     from pdfminer.layout import LTImage, LTRect, LTTextContainer
     import pdfplumber
 
     doc = []
+    first_page = page_range[0] if page_range else 0
+    page_numbers = range(*page_range) if page_range else None
     pdf = pdfplumber.open(pdf_path)
-    for i, page_layout in enumerate(extract_pages(pdf_path)):
-        page = {'page_num': page_layout.pageid, 'content': []}
+    for offset, page_layout in enumerate(extract_pages(pdf_path, page_numbers=page_numbers)):
+        i = first_page + offset
+        page = {'page_num': i + 1, 'content': []}
 
         elements = []
         for element in page_layout:
@@ -186,9 +196,22 @@ def parse_pdf(pdf_path: str, extract_image: bool = False) -> List[dict]:
         page['content'] = postprocess_page_content(page['content'])
         doc.append(page)
 
+    pdf.close()
     return doc
 
 
+def pdf_page_count(pdf_path: str) -> int:
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def page_ranges(num_pages: int, pages_per_worker: int) -> List[Tuple[int, int]]:
+    """Split [0, num_pages) into consecutive ranges of at most pages_per_worker pages."""
+    step = max(1, pages_per_worker)
+    return [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+
+
 def parse_txt(path: str):
     with open(path, 'r', encoding='utf-8') as f:
         text = f.read()
@@ -415,13 +438,63 @@ def parse_xml(file_path: str) -> List[dict]:
     return [{'page_num': 1, 'content': content}]
 
 
+# CPU-heavy parsers run in worker processes; top-level callables so they can be pickled.
+# Workers return the parsed pages as plain lists/dicts (layout objects are dropped).
+PROCESS_PARSERS = {
+    'pdf': parse_pdf,
+    'docx': parse_word,
+    'doc': parse_word,
+    'pptx': parse_ppt,
+    'csv': functools.partial(parse_tabular_file, sep=','),
+    'tsv': functools.partial(parse_tabular_file, sep='\t'),
+    'xlsx': parse_tabular_file,
+    'xls': parse_tabular_file,
+}
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Process-wide parsing pool with FILE_PARSE_WORKERS workers, or None if disabled."""
+    global _parse_pool
+    if FILE_PARSE_WORKERS <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # spawn: forking a process that runs event loops and thread pools is not safe
+            _parse_pool = ProcessPoolExecutor(max_workers=FILE_PARSE_WORKERS,
+                                              mp_context=multiprocessing.get_context('spawn'))
+        return _parse_pool
+
+
+def _reset_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        # A broken pool has already failed its pending futures; cancel_futures would need Python 3.9
+        pool.shutdown(wait=False)
+
+
+def parse_pdf_parallel(pdf_path: str, pool: ProcessPoolExecutor,
+                       pages_per_worker: int = PDF_PAGES_PER_WORKER) -> List[dict]:
+    """Parse a PDF in the process pool, one task per page range, pages kept in order."""
+    ranges = page_ranges(pdf_page_count(pdf_path), pages_per_worker)
+    if len(ranges) <= 1:
+        return pool.submit(parse_pdf, pdf_path).result()
+    futures = [pool.submit(parse_pdf, pdf_path, False, page_range) for page_range in ranges]
+    doc = []
+    for future in futures:
+        doc.extend(future.result())
+    return doc
+
+
 def compress(results: list) -> list[str]:
     compress_results = []
     max_token = math.floor(DEFAULT_MAX_INPUT_TOKENS / len(results))
     for result in results:
-        token_list = tokenizer.tokenize(result)
-        token_list = token_list[:min(len(token_list), max_token)]
-        compress_results.append(tokenizer.convert_tokens_to_string(token_list))
+        compress_results.append(truncate_to_tokens(result, max_token))
     return compress_results
 
 
@@ -436,7 +509,7 @@ class SingleFileParser(BaseTool):
     }]
 
     def __init__(self, cfg: Optional[Dict] = None):
-        super().__init__(cfg)
+        self.cfg = cfg or {}
         self.data_root = self.cfg.get('path', os.path.join(DEFAULT_WORKSPACE, 'tools', self.name))
         self.db = Storage({'storage_root_path': self.data_root})
         self.structured_doc = self.cfg.get('structured_doc', True)
@@ -461,7 +534,8 @@ class SingleFileParser(BaseTool):
         }
 
     def call(self, params: Union[str, dict], **kwargs) -> Union[str, list]:
-        params = self._verify_json_format_args(params)
+        if isinstance(params, str):
+            params = json.loads(params)
         file_path = self._prepare_file(params['url'])
         try:
             cached = self.db.get(f'{hash_sha256(file_path)}_ori')
@@ -487,7 +561,7 @@ class SingleFileParser(BaseTool):
             file_type = get_basename_from_url(file_path).split('.')[-1].lower()
 
         try:
-            results = self.parsers[file_type](file_path)
+            results = self._parse(file_type, file_path)
             tokens = 0
             for page in results:
                 for para in page['content']:
@@ -507,6 +581,20 @@ class SingleFileParser(BaseTool):
             logger.error(f"Parsing failed: {str(e)}")
             raise FileParserError("Document parsing failed", exception=e)
 
+    def _parse(self, file_type: str, file_path: str) -> List[dict]:
+        """Run a parser, in the process pool for CPU-heavy types (page ranges for PDFs)."""
+        pool = get_parse_pool() if file_type in PROCESS_PARSERS else None
+        if pool is None:
+            return self.parsers[file_type](file_path)
+        try:
+            if file_type == 'pdf':
+                return parse_pdf_parallel(file_path, pool)
+            return pool.submit(PROCESS_PARSERS[file_type], file_path).result()
+        except BrokenProcessPool as e:
+            logger.warning(f"Parse worker died ({e}), parsing {file_path} in-process")
+            _reset_parse_pool()
+            return self.parsers[file_type](file_path)
+
     def _cache_result(self, file_path: str, result: list):
         cache_key = f'{hash_sha256(file_path)}_ori'
         self.db.put(cache_key, json.dumps(result, ensure_ascii=False))
@@ -526,7 +614,7 @@ class SingleFileParser(BaseTool):
         for extracted_file in parse_zip(file_path, extract_dir):
             if (ft := get_file_type(extracted_file)) in self.parsers:
                 try:
-                    results.extend(self.parsers[ft](extracted_file))
+                    results.extend(self._parse(ft, extracted_file))
                 except Exception as e:
                     logger.warning(f"Skip files {extracted_file}: {str(e)}")
 
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Process-wide shared OpenAI client registry.
+
+Every agent used to build a fresh OpenAI client per LLM round, paying a new
+connection pool and TLS handshake each time. Clients are now cached by
+(base_url, api_key, timeout) so all agents and tools in one process reuse the
+same pooled keep-alive connections.
+"""
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+ClientKey = Tuple[Optional[str], Optional[str], Optional[float]]
+
+_lock = threading.Lock()
+_sync_clients: Dict[ClientKey, "OpenAI"] = {}
+# httpx async connection pools are bound to the event loop that first used them,
+# so async clients are kept per running loop (e.g. one per asyncio.run call).
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ClientKey, 'AsyncOpenAI']]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _make_key(base_url: Optional[str], api_key: Optional[str], timeout: Optional[float]) -> ClientKey:
+    return (base_url or None, api_key or None, float(timeout) if timeout is not None else None)
+
+
+def get_async_client(
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+) -> "AsyncOpenAI":
+    """
+    Get the shared AsyncOpenAI client for (base_url, api_key, timeout).
+
+    Must be called from inside a running event loop.
+
+    Args:
+        api_key: API key, falls back to the OPENAI_API_KEY environment variable
+        base_url: API base URL, falls back to the OPENAI_BASE_URL environment variable
+        timeout: Request timeout in seconds
+
+    Returns:
+        Pooled AsyncOpenAI client
+    """
+    loop = asyncio.get_running_loop()
+    key = _make_key(base_url, api_key, timeout)
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+            clients[key] = client
+        return client
+
+
+def get_sync_client(
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+) -> "OpenAI":
+    """
+    Get the shared (thread-safe) OpenAI client for (base_url, api_key, timeout).
+
+    Used by sync tools such as Visit that run in worker threads.
+
+    Args:
+        api_key: API key, falls back to the OPENAI_API_KEY environment variable
+        base_url: API base URL, falls back to the OPENAI_BASE_URL environment variable
+        timeout: Request timeout in seconds
+
+    Returns:
+        Pooled OpenAI client
+    """
+    key = _make_key(base_url, api_key, timeout)
+    with _lock:
+        client = _sync_clients.get(key)
+        if client is None:
+            from openai import OpenAI
+            client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+            _sync_clients[key] = client
+        return client
+
+
+async def aclose_clients():
+    """Close all async clients bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.pop(loop, {})
+    for client in clients.values():
+        await client.close()
+
+
+def close_clients():
+    """Close all shared sync clients."""
+    with _lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in clients:
+        client.close()
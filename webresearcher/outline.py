@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Split a WebWeaver outline into sections with their citation IDs.
+
+The Planner writes free-form, citation-grounded outlines such as:
+
+    # Report title
+    1. Introduction <citation>id_1</citation>
+     1.1 Background <citation>id_2, id_3</citation>
+    2. Methods <citation>id_4</citation>
+
+Sections are the top-level entries (numbered items, markdown headings or Chinese
+"一、" items); each keeps its sub-items and the citation IDs mentioned inside it.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+CITATION_ID_RE = re.compile(r"\bid_\d+\b")
+_MARKDOWN_HEADING_RE = re.compile(r"^\s*(#{1,6})\s+\S")
+# "1." / "1)" / "1、" / "1.2" / "1.2.3." optionally after markdown, bullet or bold markers
+_NUMBERED_RE = re.compile(
+    r"^\s*(?:#{1,6}\s*)?(?:[-*]\s*)?(?:\*\*)?(?:(\d+(?:\.\d+)+)[.)、]?|(\d+)[.)、])\s*\S")
+_CHINESE_NUMBERED_RE = re.compile(r"^\s*(?:\*\*)?[一二三四五六七八九十]+[、.．]\s*\S")
+_CITATION_TAG_RE = re.compile(r"</?citation>")
+
+
+@dataclass
+class OutlineSection:
+    """One top-level outline entry."""
+    index: int
+    title: str
+    text: str
+    citation_ids: List[str] = field(default_factory=list)
+
+
+def _heading_level(line: str) -> Optional[int]:
+    """
+    Nesting level of an outline heading line, or None for body lines.
+
+    Section numbers win over markdown markers ("## 1.2 X" is level 2, like "1.2 X").
+    """
+    match = _NUMBERED_RE.match(line)
+    if match:
+        return (match.group(1) or match.group(2)).count(".") + 1
+    if _CHINESE_NUMBERED_RE.match(line):
+        return 1
+    match = _MARKDOWN_HEADING_RE.match(line)
+    if match:
+        return len(match.group(1))
+    return None
+
+
+def clean_title(line: str) -> str:
+    """Heading text without markdown markers and citation tags/IDs."""
+    title = _CITATION_TAG_RE.sub("", line)
+    title = CITATION_ID_RE.sub("", title)
+    title = re.sub(r"^\s*#+\s*", "", title)
+    title = re.sub(r"[\s,，;；]*$", "", title)
+    return title.replace("**", "").strip()
+
+
+def unique_citation_ids(text: str) -> List[str]:
+    """Citation IDs in order of first mention."""
+    return list(dict.fromkeys(CITATION_ID_RE.findall(text)))
+
+
+def parse_outline_sections(outline: str) -> Tuple[str, List[OutlineSection]]:
+    """
+    Split an outline into top-level sections.
+
+    If a single heading wraps everything (e.g. a "# Title" line above numbered
+    sections), the next level down is used instead.
+
+    Args:
+        outline: Outline text from the Planner
+
+    Returns:
+        (preamble before the first section, sections in outline order)
+    """
+    lines = outline.strip().splitlines()
+    levels = [_heading_level(line) for line in lines]
+    # An unnumbered markdown heading opening the outline, with no sibling, is the report title
+    first = next((i for i, lv in enumerate(levels) if lv is not None), None)
+    if first is not None and not _NUMBERED_RE.match(lines[first]):
+        marker = _MARKDOWN_HEADING_RE.match(lines[first])
+        if marker and not any(
+                _MARKDOWN_HEADING_RE.match(line) and _MARKDOWN_HEADING_RE.match(line).group(1) == marker.group(1)
+                for line in lines[first + 1:]):
+            levels[first] = None
+    candidates = sorted({level for level in levels if level is not None})
+    for level in candidates:
+        starts = [i for i, lv in enumerate(levels) if lv == level]
+        if len(starts) < 2 and level != candidates[-1]:
+            continue
+        preamble = "\n".join(lines[:starts[0]]).strip()
+        sections = []
+        for n, start in enumerate(starts):
+            end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+            text = "\n".join(lines[start:end]).strip()
+            sections.append(OutlineSection(
+                index=n,
+                title=clean_title(lines[start]),
+                text=text,
+                citation_ids=unique_citation_ids(text),
+            ))
+        return preamble, sections
+    return outline.strip(), []
+
+
+_LEADING_NUMBER_RE = re.compile(r"^\s*(?:#{1,6}\s*)?(?:[-*]\s*)?(?:\*\*)?(?:\d+(?:\.\d+)*[.)、]?|[一二三四五六七八九十]+[、.．])\s*")
+
+
+def section_key(section: OutlineSection) -> str:
+    """Identity of a section across outline revisions: its title without numbering, lowercased."""
+    return _LEADING_NUMBER_RE.sub("", section.title).strip().lower()
+
+
+def section_keys(sections: List[OutlineSection]) -> List[str]:
+    """
+    section_key of each section, made unique: repeated titles get their occurrence
+    number ("methods", "methods#2"), so same-titled sections never share a draft.
+    """
+    counts: Dict[str, int] = {}
+    keys = []
+    for section in sections:
+        key = section_key(section)
+        counts[key] = counts.get(key, 0) + 1
+        keys.append(key if counts[key] == 1 else f"{key}#{counts[key]}")
+    return keys
+
+
+def section_signature(section: OutlineSection) -> str:
+    """
+    Content of a section that a draft depends on: its lines without numbering (so
+    renumbering after an insertion elsewhere does not count as an edit) and its citations.
+    """
+    lines = [_LEADING_NUMBER_RE.sub("", line).strip() for line in section.text.splitlines()]
+    return "\n".join(line for line in lines if line) + "\n" + ",".join(sorted(section.citation_ids))
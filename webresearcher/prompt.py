@@ -104,16 +104,29 @@ def get_system_prompt(today: str, tools: list, instruction: str = "") -> str:
 
     return prompt
 
-def get_iterresearch_system_prompt(today: str, function_list: list, instruction: str = "") -> str:
+def get_iterresearch_system_prompt(today: str, function_list: list, instruction: str = "",
+                                   max_tool_calls: int = 1) -> str:
     """
     Generate system prompt for IterResearch paradigm.
     
     Requires LLM to generate <plan>, <report>, and <tool_call>/<answer> in a single call. 
+    With max_tool_calls > 1, up to that many independent <tool_call> blocks may be issued
+    per round; they are executed in parallel.
     """
     tools_text = "\n".join(_format_tool_desc(tool) for tool in function_list)
     instruction_text = ""
     if instruction:
         instruction_text = f"\n\nAdditional persona instructions:\n{instruction}\n"
+    if max_tool_calls > 1:
+        tool_call_rule = (
+            "     - Output one `<tool_call>` block with the JSON for each tool call. If several lookups are independent "
+            f"(e.g. a web search, a scholar search and a calculation), output up to {max_tool_calls} `<tool_call>` "
+            "blocks one after another in this round; they run in parallel and their observations are returned together."
+        )
+        tools_usage = f"Use up to {max_tool_calls} independent tool calls per round."
+    else:
+        tool_call_rule = "     - Output a *single* `<tool_call>` block with the JSON for that tool."
+        tools_usage = "Use them one at a time."
     
     ITERRESEARCH_PROMPT = f"""You are WebResearcher, an advanced AI research agent. 
 Today is {today}. Your goal is to answer the user's question with high accuracy and depth by iteratively searching the web and synthesizing information.
@@ -142,7 +155,7 @@ Your task in a single turn is to generate a structured response containing three
    - Based on your `<plan>` and your *newly updated* `<report>`, decide the next step.
    - **If more research is needed:**
      - Choose one of the available tools.
-     - Output a *single* `<tool_call>` block with the JSON for that tool.
+{tool_call_rule}
    - **If you have a complete and final answer and want to present it explicitly:**
      - Do NOT use a tool.
      - Provide the final, comprehensive answer inside an `<answer>` block.
@@ -189,7 +202,7 @@ Optional: brief note explaining the stop condition.
 </terminate>
 
 **Available Tools:**
-You have access to the following tools. Use them one at a time.
+You have access to the following tools. {tools_usage}
 <tools>
 {tools_text}
 </tools>
@@ -213,6 +226,22 @@ EXTRACTOR_PROMPT = """Please process the following webpage content and user goal
 **Final Output Format using JSON format has "rational", "evidence", "summary" feilds**
 """
 
+EXTRACTOR_MERGE_PROMPT = """The following partial extractions were produced from consecutive chunks of the same webpage for one user goal. Merge them into a single extraction:
+
+## **Partial Extractions**
+{partial_extractions}
+
+## **User Goal**
+{goal}
+
+## **Task Guidelines**
+1. **Rational**: Point out which parts of the page are directly related to the user's goal
+2. **Evidence**: Combine the evidence of all chunks in page order, remove duplicates but never drop important information, keep the **full original context** as far as possible
+3. **Summary**: Write one concise paragraph with logical flow covering all chunks, and judge the contribution of the information to the goal
+
+**Final Output Format using JSON format has "rational", "evidence", "summary" feilds**
+"""
+
 
 def get_webweaver_planner_prompt(today: str, tool_list: List[str], instruction: str = "") -> str:
     """
@@ -292,7 +321,7 @@ The outline is complete with all necessary evidence.
 """
 
 
-def get_webweaver_writer_prompt(today: str, instruction: str = "") -> str:
+def get_webweaver_writer_prompt(today: str, instruction: str = "", rolling_digest: bool = False) -> str:
     """
     Generate system prompt for WebWeaver Writer Agent.
     
@@ -301,6 +330,8 @@ def get_webweaver_writer_prompt(today: str, instruction: str = "") -> str:
     
     Args:
         today: Current date string
+        instruction: Extra persona instructions
+        rolling_digest: [Report Written So Far] is a digest plus the last section, not the full report
         
     Returns:
         System prompt string for Writer
@@ -308,12 +339,16 @@ def get_webweaver_writer_prompt(today: str, instruction: str = "") -> str:
     instruction_text = ""
     if instruction:
         instruction_text = f"\n\nAdditional persona instructions:\n{instruction}\n"
+    report_text = "the [Report Written So Far]"
+    if rolling_digest:
+        report_text += (": a digest of the earlier sections (heading, key points, citation IDs) "
+                        "and the full text of the last written section")
     return f"""You are the Writer Agent for WebWeaver. Today is {today}. 
 Your job is to write a high-quality, comprehensive report based *only* on the [Final Outline] and the [Retrieved Evidence].
 {instruction_text}
 
 You operate in a ReAct (Plan-Action-Observation) loop.
-You will be given the [Final Outline] and the [Report Written So Far].
+You will be given the [Final Outline] and {report_text}.
 
 Your goal is to write the report section by section, following the outline.
 
@@ -326,6 +361,8 @@ Your goal is to write the report section by section, following the outline.
     - Based on your thought, identify the citation IDs (e.g., "id_1", "id_2") needed for the *next* section.
     - Use the `retrieve` tool to fetch this evidence from the Memory Bank.
     - Format: <tool_call>{{"name": "retrieve", "arguments": {{"citation_ids": ["id_1", "id_2"]}}}}</tool_call>
+    - Add a `query` (the section title and key points) to also get the most relevant evidence the outline did not cite, in the same call:
+      <tool_call>{{"name": "retrieve", "arguments": {{"citation_ids": ["id_1", "id_2"], "query": "1.1 Background: history of X", "top_k": 5}}}}</tool_call>
 
 3.  `<tool_response>` (Observation):
     - The environment will return the evidence you requested.
@@ -378,3 +415,44 @@ The background shows... [cite:id_1]. Furthermore... [cite:id_2].
 (MUST use the same language as the question and outline)
 </write>
 """
+
+
+def get_webweaver_section_writer_prompt(today: str, instruction: str = "") -> str:
+    """
+    Generate system prompt for writing one section of a WebWeaver report.
+
+    Used by the Writer's parallel mode: each section is written in a single call from
+    its outline entry and the evidence retrieved for it, while other sections are being
+    written concurrently.
+
+    Args:
+        today: Current date string
+        instruction: Extra persona instructions
+
+    Returns:
+        System prompt string for the section writer
+    """
+    instruction_text = ""
+    if instruction:
+        instruction_text = f"\n\nAdditional persona instructions:\n{instruction}\n"
+    return f"""You are a Writer Agent for WebWeaver. Today is {today}.
+You write ONE section of a research report, based *only* on the [Final Outline] and the [Retrieved Evidence] for that section.
+{instruction_text}
+Other sections of the report are written by other writers at the same time. [Neighbouring Sections] lists the sections before and after yours, so you can avoid repeating their content and keep the flow.
+
+Rules:
+- Write the full text of [Section To Write] only, including its sub-sections from the outline. Start with the section heading.
+- Use only the [Retrieved Evidence]. Do not invent facts.
+- CRITICAL: Cite evidence inline with its original citation ID using this format: [cite:id_1]
+- **The section MUST be written in the SAME LANGUAGE as the [Question] and [Final Outline]. Do NOT translate or switch languages.**
+
+**STRICT Response Format:**
+<plan>
+Which evidence supports which part of the section, and how you will structure it.
+</plan>
+<write>
+## 1. Section Title
+
+Text content here [cite:id_1]. More content [cite:id_2].
+</write>
+"""
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Shared rate limiting for LLM and tool endpoints.
+
+One RateLimiter per endpoint (e.g. "llm" per base_url, "serper", "jina"), shared by all
+agents and tool threads in the process:
+- Token buckets for requests/min and tokens/min
+- An AIMD adaptive concurrency limit: halved on 429 / 5xx (not on client timeouts), +1 per window of
+  successes, so parallel agents settle near the provider ceiling instead of retry storms
+- A shared pause honoring Retry-After after an overload signal
+
+Works from both threads (`with limiter.slot():`) and asyncio (`async with limiter.aslot():`).
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from webresearcher.config import (
+    RATE_LIMIT_ENABLED,
+    LLM_RPM,
+    LLM_TPM,
+    LLM_MAX_CONCURRENCY,
+    SERPER_RPM,
+    SERPER_MAX_CONCURRENCY,
+    JINA_RPM,
+    JINA_MAX_CONCURRENCY,
+)
+from webresearcher.log import logger
+
+# Poll interval while waiting for a concurrency slot
+POLL_INTERVAL = 0.05
+# Minimum seconds between two multiplicative decreases (one burst of 429s halves once)
+DECREASE_COOLDOWN = 1.0
+# Pause after an overload without Retry-After
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`.
+
+    Reservations may go into debt: a request larger than the available tokens is
+    granted a delay instead of being refused, so big prompts are never starved.
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 10.0):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(self.rate * burst_seconds, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """Take `amount` tokens and return the seconds to wait before using them."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, delta: float):
+        """Correct a reservation once the real amount is known (e.g. usage.total_tokens)."""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+def is_overload(status: Optional[int] = None, error: Optional[BaseException] = None) -> bool:
+    """Whether a response status or exception means the endpoint is overloaded."""
+    if status is None and error is not None:
+        status = getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+    # Client-side timeouts and connection errors carry no status: a slow generation is not
+    # the provider rejecting requests, so they don't shrink the concurrency limit
+    return status is not None and (status == 429 or status >= 500)
+
+
+def get_retry_after(error: Optional[BaseException] = None, headers: Optional[Any] = None) -> Optional[float]:
+    """Read a Retry-After header (seconds) from an exception's response or a headers mapping."""
+    if headers is None and error is not None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+        return min(float(value), MAX_BACKOFF) if value else None
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class RateSlot:
+    """A granted request slot; report the outcome of responses that don't raise."""
+
+    def __init__(self, tokens: float = 0):
+        self.tokens = tokens
+        self.used_tokens: Optional[float] = None
+        self.status: Optional[int] = None
+        self.retry_after: Optional[float] = None
+
+    def record_usage(self, response: Any):
+        """Record the real token usage of a chat completion response, if reported."""
+        total = getattr(getattr(response, "usage", None), "total_tokens", None)
+        if isinstance(total, int):
+            self.used_tokens = total
+
+    def record_tokens(self, total: float):
+        """Record an estimated token usage when the response reports none."""
+        if self.used_tokens is None:
+            self.used_tokens = total
+
+    def report(self, status: Optional[int] = None, retry_after: Any = None):
+        """
+        Record an HTTP status for this request.
+
+        Args:
+            status: HTTP status code
+            retry_after: Retry-After header value in seconds, if any
+        """
+        self.status = status
+        if retry_after is not None:
+            self.retry_after = get_retry_after(headers={"retry-after": retry_after})
+
+
+class RateLimiter:
+    """Token buckets + AIMD concurrency limit for one endpoint."""
+
+    def __init__(
+            self,
+            name: str,
+            requests_per_minute: float = 0,
+            tokens_per_minute: float = 0,
+            max_concurrency: int = 0,
+            min_concurrency: int = 1,
+            enabled: bool = True,
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            name: Endpoint name for logs and stats
+            requests_per_minute: Request rate limit (0: unlimited)
+            tokens_per_minute: Token rate limit (0: unlimited)
+            max_concurrency: Upper bound of the adaptive concurrency limit (0: unlimited, no AIMD)
+            min_concurrency: Lower bound of the adaptive concurrency limit
+            enabled: If False, slots are granted immediately and nothing is tracked
+        """
+        self.name = name
+        self.enabled = enabled
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = max(1, min_concurrency)
+        self.limit = float(max_concurrency) if max_concurrency > 0 else 0.0
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "successes": 0, "overloads": 0, "errors": 0, "wait_seconds": 0.0}
+
+    def _try_enter(self, tokens: float) -> Tuple[bool, float]:
+        """Take a concurrency slot and reserve bucket tokens; returns (entered, seconds to wait)."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return False, self.paused_until - now
+            if self.limit and self.in_flight >= max(int(self.limit), self.min_concurrency):
+                return False, POLL_INTERVAL
+            self.in_flight += 1
+            self._stats["requests"] += 1
+            delay = 0.0
+            if self.request_bucket is not None:
+                delay = max(delay, self.request_bucket.reserve(1, now))
+            if self.token_bucket is not None and tokens:
+                delay = max(delay, self.token_bucket.reserve(tokens, now))
+            return True, delay
+
+    def acquire(self, tokens: float = 0) -> float:
+        """Block until a slot is granted. Returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        waited = 0.0
+        while True:
+            entered, delay = self._try_enter(tokens)
+            if delay > 0:
+                try:
+                    time.sleep(delay)
+                except BaseException:
+                    if entered:
+                        self._abandon()
+                    raise
+                waited += delay
+            if entered:
+                break
+        self._add_wait(waited)
+        return waited
+
+    async def acquire_async(self, tokens: float = 0) -> float:
+        """Wait (without blocking the event loop) until a slot is granted. Returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        waited = 0.0
+        while True:
+            entered, delay = self._try_enter(tokens)
+            if delay > 0:
+                try:
+                    await asyncio.sleep(delay)
+                except BaseException:
+                    # e.g. cancelled by an agent timeout while waiting for bucket tokens
+                    if entered:
+                        self._abandon()
+                    raise
+                waited += delay
+            if entered:
+                break
+        self._add_wait(waited)
+        return waited
+
+    def _abandon(self):
+        """Give a slot back without feeding the AIMD controller (cancelled request)."""
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+
+    def _add_wait(self, waited: float):
+        if waited:
+            with self._lock:
+                self._stats["wait_seconds"] += waited
+
+    def release(self, slot: Optional[RateSlot] = None, error: Optional[BaseException] = None):
+        """
+        Release a slot and feed its outcome to the AIMD controller.
+
+        Args:
+            slot: The granted slot (status / used tokens)
+            error: Exception raised by the request, if any
+        """
+        if not self.enabled:
+            return
+        if isinstance(error, (asyncio.CancelledError, KeyboardInterrupt)):
+            self._abandon()
+            return
+        slot = slot or RateSlot()
+        status = slot.status
+        overloaded = is_overload(status, error)
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+            if self.token_bucket is not None and slot.used_tokens is not None:
+                self.token_bucket.adjust(slot.used_tokens - slot.tokens)
+            if overloaded:
+                self._stats["overloads"] += 1
+                now = time.monotonic()
+                retry_after = slot.retry_after or get_retry_after(error) or DEFAULT_BACKOFF
+                self.paused_until = max(self.paused_until, now + retry_after)
+                if self.limit and now - self._last_decrease >= DECREASE_COOLDOWN:
+                    self.limit = max(self.limit / 2, float(self.min_concurrency))
+                    self._last_decrease = now
+                    logger.warning(f"[rate_limiter] {self.name} overloaded (status={status}, error={error}), "
+                                   f"concurrency limit -> {int(self.limit)}, pause {retry_after:.1f}s")
+            elif error is not None or (status is not None and status >= 400):
+                self._stats["errors"] += 1
+            else:
+                self._stats["successes"] += 1
+                if self.limit:
+                    # additive increase: about +1 per window of `limit` successes
+                    self.limit = min(self.limit + 1.0 / self.limit, float(self.max_concurrency))
+
+    @contextmanager
+    def slot(self, tokens: float = 0):
+        """Context manager for a sync request: `with limiter.slot() as slot: ...`"""
+        slot = RateSlot(tokens)
+        self.acquire(tokens)
+        try:
+            yield slot
+        except BaseException as e:
+            self.release(slot, e)
+            raise
+        self.release(slot)
+
+    @asynccontextmanager
+    async def aslot(self, tokens: float = 0):
+        """Async context manager for a request: `async with limiter.aslot() as slot: ...`"""
+        slot = RateSlot(tokens)
+        await self.acquire_async(tokens)
+        try:
+            yield slot
+        except BaseException as e:
+            self.release(slot, e)
+            raise
+        self.release(slot)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus the current concurrency limit and in-flight requests."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(name=self.name, limit=int(self.limit), in_flight=self.in_flight)
+            return stats
+
+
+# Per-kind defaults: (requests/min, tokens/min, max concurrency)
+_DEFAULT_LIMITS = {
+    "llm": (LLM_RPM, LLM_TPM, LLM_MAX_CONCURRENCY),
+    "serper": (SERPER_RPM, 0, SERPER_MAX_CONCURRENCY),
+    "jina": (JINA_RPM, 0, JINA_MAX_CONCURRENCY),
+}
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(kind: str, endpoint: str = "") -> RateLimiter:
+    """
+    Get the process-wide rate limiter for an endpoint.
+
+    Args:
+        kind: "llm", "serper" or "jina" (selects the configured limits); other kinds are unlimited
+        endpoint: Distinguishes endpoints of the same kind, e.g. the LLM base_url
+
+    Returns:
+        Shared RateLimiter
+    """
+    key = (kind, endpoint or "")
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rpm, tpm, max_concurrency = _DEFAULT_LIMITS.get(kind, (0, 0, 0))
+            name = f"{kind}:{endpoint}" if endpoint else kind
+            limiter = RateLimiter(name, rpm, tpm, max_concurrency, enabled=RATE_LIMIT_ENABLED)
+            _limiters[key] = limiter
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of all rate limiters created so far."""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
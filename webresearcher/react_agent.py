@@ -6,21 +6,18 @@
 from typing import Dict, List, Optional
 import asyncio
 import datetime
-import json5
 import random
 import time
 import re
 
-from openai import OpenAI, APIError, APIConnectionError, APITimeoutError
 
-from webresearcher.base import Message, build_text_completion_prompt, count_tokens as count_tokens_base
+from webresearcher.token_counter import count_message_tokens
+from webresearcher.llm_client import get_async_client
+from webresearcher.rate_limiter import get_rate_limiter
+from webresearcher.tool_executor import get_tool_executor
 from webresearcher.log import logger
 from webresearcher.prompt import get_system_prompt
-from webresearcher.tool_file import FileParser
-from webresearcher.tool_scholar import Scholar
-from webresearcher.tool_python import PythonInterpreter
-from webresearcher.tool_search import Search
-from webresearcher.tool_visit import Visit
+from webresearcher.tool_registry import DEFAULT_TOOL_SPECS, LazyToolMap
 from webresearcher.config import (
     OPENAI_API_KEY,
     OPENAI_BASE_URL,
@@ -31,14 +28,8 @@ from webresearcher.config import (
 )
 
 
-TOOL_CLASS = [
-    FileParser(),
-    Scholar(),
-    Visit(),
-    Search(),
-    PythonInterpreter(),
-]
-TOOL_MAP = {tool.name: tool for tool in TOOL_CLASS}
+# Tools are imported and constructed on first use
+TOOL_MAP = LazyToolMap(DEFAULT_TOOL_SPECS)
 
 
 def today_date():
@@ -72,28 +63,24 @@ class ReactAgent:
         self.function_list = function_list or list(TOOL_MAP.keys())
         self.instruction = instruction
 
-    def count_tokens(self, messages: List[Dict]) -> int:
+    def count_tokens(self, messages: List[Dict], estimate: bool = False) -> int:
         try:
-            full_message: List[Message] = []
-            for x in messages:
-                if isinstance(x, dict):
-                    full_message.append(Message(**x))
-                else:
-                    full_message.append(x)
-            full_prompt = build_text_completion_prompt(full_message, allow_special=True)
-            return count_tokens_base(full_prompt, self.model)
+            return count_message_tokens(messages, self.model, estimate=estimate)
         except Exception as e:
             logger.warning(f"Failed to count tokens: {e}. Using simple split.")
             return sum(len(str(x).split()) for x in messages)
 
     async def call_server(self, msgs: List[Dict], stop_sequences: Optional[List[str]] = None, max_tries: int = 5) -> str:
-        client = OpenAI(
+        from openai import APIError, APIConnectionError, APITimeoutError
+
+        client = get_async_client(
             api_key=self.openai_api_key or "EMPTY",
             base_url=self.openai_base_url,
             timeout=self.llm_timeout,
         )
+        # Shared per-endpoint rate limit + adaptive concurrency across all agents
+        limiter = get_rate_limiter("llm", self.openai_base_url or "")
         base_sleep_time = 1
-        loop = asyncio.get_event_loop()
         stop_sequences = stop_sequences or [OBS_START]
 
         for attempt in range(max_tries):
@@ -105,10 +92,9 @@ class ReactAgent:
                     "temperature": self.generate_cfg.get("temperature", 0.6),
                     "top_p": self.generate_cfg.get("top_p", 0.95),
                 }
-                chat_response = await loop.run_in_executor(
-                    None,
-                    lambda: client.chat.completions.create(**request_params),
-                )
+                async with limiter.aslot(tokens=count_message_tokens(msgs, self.model, estimate=True)) as slot:
+                    chat_response = await client.chat.completions.create(**request_params)
+                    slot.record_usage(chat_response)
                 content = chat_response.choices[0].message.content
                 reasoning_content = None
                 if hasattr(chat_response.choices[0].message, 'reasoning_content') and chat_response.choices[0].message.reasoning_content:
@@ -136,39 +122,8 @@ class ReactAgent:
         return content
 
     async def _call_tool(self, tool_call_block: str) -> str:
-        # Python inline code path
-        if "<code>" in tool_call_block and "</code>" in tool_call_block and "python" in tool_call_block.lower():
-            code_raw = tool_call_block.split("<code>", 1)[1].split("</code>", 1)[0].strip()
-            result = TOOL_MAP["python"].call(code_raw)
-            return result if isinstance(result, str) else str(result)
-
-        # JSON tool path
-        try:
-            tool_call = json5.loads(tool_call_block)
-            tool_name = tool_call.get("name", "")
-            tool_args = tool_call.get("arguments", {})
-        except Exception:
-            return 'Error: Tool call is not a valid JSON. Tool call must contain a valid "name" and "arguments" field.'
-
-        if tool_name not in TOOL_MAP:
-            return f"Error: Tool {tool_name} not found"
-
-        tool = TOOL_MAP[tool_name]
-        # handle async tool (parse_file) with file root
-        try:
-            if asyncio.iscoroutinefunction(tool.call):
-                if tool_name == "parse_file":
-                    params = {"files": tool_args.get("files")}
-                    result = await tool.call(params, file_root_path=FILE_DIR)
-                else:
-                    result = await tool.call(tool_args)
-            else:
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(None, tool.call, tool_args)
-            return result if isinstance(result, str) else str(result)
-        except Exception as e:
-            logger.error(f"Tool execution failed: {e}")
-            return f"Error: Tool execution failed. {e}"
+        # JSON tool calls and inline <code> blocks (python) go through the shared ToolExecutor
+        return await get_tool_executor().execute(tool_call_block, TOOL_MAP, file_root_path=FILE_DIR)
 
     def _parse_answer(self, content: str) -> Dict[str, Optional[str]]:
         ans = {
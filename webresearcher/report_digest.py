@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Bounded Writer context for the sequential WebWeaver writing loop.
+
+Instead of re-sending the whole report written so far at every step, the Writer sees
+the full text of the last written section plus a condensed digest of the earlier ones
+(heading, opening sentences, citation IDs). The digest is extended incrementally after
+each <write>; when it outgrows its budget the oldest entries shrink to heading + IDs.
+The full report is only assembled at the end.
+"""
+import re
+from typing import List
+
+from webresearcher.outline import unique_citation_ids
+from webresearcher.token_counter import estimate_tokens, truncate_to_tokens
+
+_CITE_MARK_RE = re.compile(r"\s*\[cite:[^\]]*\]")
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？；;])\s*")
+
+
+def _heading(text: str) -> str:
+    """First non-empty line of a section, without markdown markers."""
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            return re.sub(r"^#+\s*", "", line).replace("**", "").strip()
+    return ""
+
+
+def digest_section(text: str, max_tokens: int = 120) -> str:
+    """
+    Condense a written section to its heading, opening sentences and citation IDs.
+
+    Args:
+        text: Section text as written by the Writer
+        max_tokens: Token budget for the opening sentences (0: heading and IDs only)
+
+    Returns:
+        Digest entry, e.g. "- 1. Introduction: X was founded in ... (cites: id_1, id_2)"
+    """
+    lines = [line.strip() for line in text.strip().splitlines()]
+    body_lines = [line for line in lines[1:] if line and not line.startswith("#")]
+    body = " ".join(_CITE_MARK_RE.sub("", line) for line in body_lines)
+    body = re.sub(r"\s+", " ", body).strip()
+    summary, used = [], 0
+    for sentence in _SENTENCE_END_RE.split(body) if max_tokens > 0 else []:
+        if not sentence:
+            continue
+        cost = estimate_tokens(sentence)
+        if summary and used + cost > max_tokens:
+            break
+        summary.append(sentence)
+        used += cost
+    summary_text = truncate_to_tokens(" ".join(summary), max_tokens) if summary else ""
+    entry = f"- {_heading(text)}"
+    if summary_text:
+        entry += f": {summary_text}"
+    ids = unique_citation_ids(text)
+    if ids:
+        entry += f" (cites: {', '.join(ids)})"
+    return entry
+
+
+class RollingReport:
+    """
+    Report under construction, exposed to the Writer as a constant-size context.
+
+    Usage:
+        report = RollingReport()
+        report.add(section_text)
+        prompt_part = report.context()
+        final_text = report.full_text()
+    """
+
+    def __init__(self, digest_tokens: int = 120, digest_budget: int = 1500):
+        """
+        Initialize rolling report.
+
+        Args:
+            digest_tokens: Token budget of one digest entry's summary
+            digest_budget: Token budget of the whole digest; beyond it the oldest
+                entries keep only heading and citation IDs
+        """
+        self.digest_tokens = digest_tokens
+        self.digest_budget = digest_budget
+        self.sections: List[str] = []
+        self._digest: List[str] = []
+        self._compact: List[str] = []
+        # Entries [0, _compacted) are shown in their compact form
+        self._compacted = 0
+        self._digest_size = 0
+
+    @property
+    def last_section(self) -> str:
+        return self.sections[-1] if self.sections else ""
+
+    def add(self, section_text: str):
+        """Append a written section; the previous last section moves into the digest."""
+        if self.sections:
+            previous = self.sections[-1]
+            entry = digest_section(previous, self.digest_tokens)
+            self._digest.append(entry)
+            self._compact.append(digest_section(previous, 0))
+            self._digest_size += estimate_tokens(entry)
+            while self._digest_size > self.digest_budget and self._compacted < len(self._digest) - 1:
+                i = self._compacted
+                self._digest_size -= estimate_tokens(self._digest[i]) - estimate_tokens(self._compact[i])
+                self._compacted += 1
+        self.sections.append(section_text)
+
+    def digest(self) -> str:
+        """Digest of every section except the last one."""
+        return "\n".join(self._compact[:self._compacted] + self._digest[self._compacted:])
+
+    def context(self) -> str:
+        """Writer context: digest of earlier sections plus the full last section."""
+        if not self.sections:
+            return "Nothing written yet."
+        parts = []
+        if self._digest:
+            parts.append(f"Digest of earlier sections ({len(self._digest)}):\n{self.digest()}")
+        parts.append(f"Last written section (full text):\n{self.last_section}")
+        return "\n\n".join(parts)
+
+    def full_text(self) -> str:
+        """The complete report."""
+        return "".join("\n\n" + section for section in self.sections)
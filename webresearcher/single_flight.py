@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Single-flight coalescing of identical concurrent tool calls.
+
+When several coroutines of one process (TTS agents, batch workers, WebWeaver planners)
+issue the same tool call at the same moment, only the first one runs it; the others
+await the same future. Nothing is kept once the call finishes (persistent results are
+the job of cache.py), so a later identical call runs again.
+
+Tools opt in with the class attribute `single_flight = True` (read-only, side-effect-free
+tools such as search / visit); stateful tools (python, memory-bank planner tools) don't.
+
+Usage:
+    result = await coalesce_tool_call(tool, tool_name, tool_args, lambda: run_tool(...))
+"""
+import asyncio
+import json
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from webresearcher.config import SINGLE_FLIGHT_ENABLED
+from webresearcher.log import logger
+
+
+def make_call_key(tool_name: str, args: Any) -> str:
+    """Normalized identity of a tool call: tool name + arguments with sorted keys and stripped strings."""
+
+    def _normalize(value):
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, dict):
+            return {k: _normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [_normalize(v) for v in value]
+        return value
+
+    try:
+        args_text = json.dumps(_normalize(args), sort_keys=True, ensure_ascii=False, default=str)
+    except (TypeError, ValueError):
+        args_text = repr(args)
+    return f"{tool_name}::{args_text}"
+
+
+class _Flight:
+    """A shared in-flight call and the number of callers awaiting it."""
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    In-flight call registry, one per event loop, with per-tool metrics.
+
+    Usage:
+        flight = SingleFlight()
+        result = await flight.do(key, factory, name="search")
+    """
+
+    def __init__(self):
+        # event loop -> {key: flight}; futures belong to one loop and can't be shared across loops
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _Flight]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, field: str):
+        with self._lock:
+            stats = self._stats.setdefault(name, {"calls": 0, "executed": 0, "coalesced": 0})
+            stats[field] += 1
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]], name: str = "") -> Any:
+        """
+        Run factory() unless an identical call is already in flight, in which case await it.
+
+        When every caller has been cancelled (or timed out), the shared call is cancelled too.
+
+        Args:
+            key: Call identity (make_call_key)
+            factory: Starts the call
+            name: Tool name for the metrics
+
+        Returns:
+            Result of the (shared) call
+        """
+        name = name or key.split("::", 1)[0]
+        self._count(name, "calls")
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        flight = inflight.get(key)
+        if flight is None:
+            self._count(name, "executed")
+            flight = inflight[key] = _Flight(asyncio.ensure_future(factory()))
+            flight.future.add_done_callback(lambda f: inflight.pop(key, None) if inflight.get(key) is flight else None)
+        else:
+            self._count(name, "coalesced")
+            logger.debug(f"Single-flight: joined in-flight call {key[:120]}")
+        flight.waiters += 1
+        try:
+            # shield: one caller being cancelled must not cancel the call the others wait for
+            return await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.future.done():
+                # nobody is left waiting: stop the call so it releases its slot and threads
+                if inflight.get(key) is flight:
+                    inflight.pop(key)
+                flight.future.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-tool calls, executed calls and coalesced (saved) duplicate calls."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """Process-wide SingleFlight, or None if SINGLE_FLIGHT_ENABLED is off."""
+    return _single_flight if SINGLE_FLIGHT_ENABLED else None
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Coalescing metrics of all tools so far."""
+    return _single_flight.stats()
+
+
+async def coalesce_tool_call(tool: Any, tool_name: str, args: Any, run: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Dispatch a tool call through single-flight if the tool opted in.
+
+    Args:
+        tool: Tool instance (checked for `single_flight = True`)
+        tool_name: Tool name
+        args: Tool arguments
+        run: Executes the call
+
+    Returns:
+        Tool result
+    """
+    flight = get_single_flight()
+    if flight is None or not getattr(tool, "single_flight", False):
+        return await run()
+    return await flight.do(make_call_key(tool_name, args), run, name=tool_name)
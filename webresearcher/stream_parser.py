@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Incremental parser for streamed IterResearch output.
+
+Tracks <plan>, <report>, <tool_call>, <answer> and <terminate> blocks as tokens arrive,
+so the agent can act on a block (e.g. start a tool) as soon as it closes, and stop
+generation once an action block is complete. A "tool_call_ready" event is emitted even
+earlier, as soon as the JSON inside an open <tool_call> is syntactically complete.
+As in the final parse (parse_output), action tags only count at the start of a line
+and empty action blocks are not actions.
+"""
+import json
+import re
+from typing import List, Optional, Tuple
+
+import json5
+
+BLOCK_TAGS = ("plan", "report", "tool_call", "answer", "terminate")
+ACTION_TAGS = ("tool_call", "answer", "terminate")
+
+_CLOSE_TAG_RE = re.compile(r"</(%s)>" % "|".join(BLOCK_TAGS))
+_MAX_CLOSE_TAG_LEN = max(len(f"</{tag}>") for tag in BLOCK_TAGS)
+TOOL_CALL_OPEN = "<tool_call>"
+
+
+def _at_line_start(text: str, index: int) -> bool:
+    """Whether only whitespace precedes index on its line, like the final parse's ^\\s*<tag> rule."""
+    line_start = text.rfind("\n", 0, index) + 1
+    return not text[line_start:index].strip()
+
+
+def _json_object_end(text: str) -> Optional[int]:
+    """End offset of the first complete JSON object at the start of text (after whitespace), or None."""
+    start = len(text) - len(text.lstrip())
+    if start >= len(text) or text[start] != "{":
+        return None
+    depth, quote, escaped = 0, None, False
+    for i in range(start, len(text)):
+        char = text[i]
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+def complete_tool_call_json(body: str) -> Optional[str]:
+    """
+    The tool call JSON at the start of a (possibly still streaming) <tool_call> body.
+
+    Args:
+        body: Text after <tool_call>
+
+    Returns:
+        The JSON text once it is complete and parses to an object with a "name", else None
+    """
+    end = _json_object_end(body)
+    if end is None:
+        return None
+    candidate = body[:end].strip()
+    try:
+        call = json5.loads(candidate)
+    except Exception:
+        return None
+    return candidate if isinstance(call, dict) and call.get("name") else None
+
+
+def tool_call_key(body: str) -> str:
+    """Normalized identity of a tool call body, so streamed and final parses compare equal."""
+    body = body.strip()
+    if "<code>" in body:
+        return body
+    try:
+        return json.dumps(json5.loads(body), sort_keys=True, ensure_ascii=False)
+    except Exception:
+        return body
+
+
+class ActionStreamParser:
+    """
+    Incremental block parser for a streamed LLM response.
+
+    With max_tool_calls > 1, consecutive <tool_call> blocks are collected and the action
+    completes when the limit is reached, an <answer>/<terminate> closes, or any other
+    text follows the last </tool_call>.
+
+    Usage:
+        parser = ActionStreamParser()
+        for delta in stream:
+            for tag, body in parser.feed(delta):
+                ...
+            if parser.action_complete:
+                break
+        content = parser.content
+    """
+
+    def __init__(self, max_tool_calls: int = 1):
+        self.text = ""
+        self.max_tool_calls = max(1, max_tool_calls)
+        # Completed blocks in stream order: [(tag, body), ...]
+        self.blocks: List[Tuple[str, str]] = []
+        self.tool_calls: List[str] = []
+        # Tag and end offset of the completed action
+        self.action: Optional[str] = None
+        self.action_end: Optional[int] = None
+        self._consumed = 0
+        # End offset of the last </tool_call> while more tool calls may follow
+        self._tool_calls_end: Optional[int] = None
+        # Offset of the <tool_call> whose "tool_call_ready" event has been emitted
+        self._ready_open = -1
+
+    @property
+    def action_complete(self) -> bool:
+        return self.action is not None
+
+    @property
+    def content(self) -> str:
+        """Response text up to the end of the completed action (trailing chatter dropped)."""
+        end = self.action_end if self.action_end is not None else self._tool_calls_end
+        text = self.text[:end] if end is not None else self.text
+        return text.strip()
+
+    def feed(self, delta: str) -> List[Tuple[str, str]]:
+        """
+        Append a streamed chunk.
+
+        Args:
+            delta: New text
+
+        Returns:
+            Blocks completed by this chunk, as (tag, body) pairs; ("tool_call_ready", json)
+            when the JSON of an open <tool_call> becomes complete before its closing tag
+        """
+        if not delta:
+            return []
+        search_from = max(self._consumed, len(self.text) - _MAX_CLOSE_TAG_LEN + 1)
+        self.text += delta
+        if self.action_complete:
+            return []
+
+        completed = []
+        for match in _CLOSE_TAG_RE.finditer(self.text, search_from):
+            if match.start() < self._consumed:
+                continue
+            tag = match.group(1)
+            open_tag = f"<{tag}>"
+            start = self.text.rfind(open_tag, self._consumed, match.start())
+            if start == -1:
+                continue
+            if tag in ACTION_TAGS and not _at_line_start(self.text, start):
+                # An inline action tag is not an action for the final parse either
+                continue
+            body = self.text[start + len(open_tag):match.start()].strip()
+            self._consumed = match.end()
+            self.blocks.append((tag, body))
+            completed.append((tag, body))
+            if tag == "tool_call" and body:
+                self.tool_calls.append(body)
+                if len(self.tool_calls) < self.max_tool_calls:
+                    self._tool_calls_end = match.end()
+                    continue
+            if tag in ACTION_TAGS and body:
+                # Empty action blocks (incl. <terminate></terminate>) are ignored, as in parse_output
+                self.action = tag
+                self.action_end = match.end()
+                return completed
+
+        if self._tool_calls_end is not None:
+            # More tool calls may follow; anything else after the last </tool_call> ends the action
+            tail = self.text[self._tool_calls_end:].lstrip()
+            if tail and not (tail.startswith(TOOL_CALL_OPEN) or TOOL_CALL_OPEN.startswith(tail)):
+                self.action = "tool_call"
+                self.action_end = self._tool_calls_end
+                return completed
+
+        open_idx = self.text.rfind(TOOL_CALL_OPEN, self._consumed)
+        if open_idx != -1 and open_idx != self._ready_open and _at_line_start(self.text, open_idx):
+            ready = complete_tool_call_json(self.text[open_idx + len(TOOL_CALL_OPEN):])
+            if ready is not None:
+                self._ready_open = open_idx
+                completed.append(("tool_call_ready", ready))
+        return completed
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Token accounting for WebResearcher.
+
+- One tiktoken encoder per model, loaded on first use and kept in memory
+- Message-list counting with per-message counts cached by content hash, so the
+  unchanged system prompt is encoded once per process
+- A cheap estimate mode for hot paths
+- Truncation / chunking helpers that encode a document at most once
+"""
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+from webresearcher.log import logger
+
+DEFAULT_ENCODING = "cl100k_base"
+MESSAGE_CACHE_SIZE = 4096
+
+_message_cache: "OrderedDict[Tuple, int]" = OrderedDict()
+_message_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = "gpt-4o"):
+    """
+    Get the cached tiktoken encoder for a model.
+
+    Args:
+        model: Model name, or an encoding name such as "cl100k_base"
+
+    Returns:
+        Tiktoken encoding, or None if tiktoken cannot load one (e.g. offline
+        without a local BPE cache); callers then fall back to estimates.
+    """
+    import tiktoken
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            try:
+                return tiktoken.get_encoding(model)
+            except (KeyError, ValueError):
+                return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(f"Failed to load tiktoken encoding for '{model}': {e}. Using token estimates.")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate without encoding.
+
+    Roughly one token per CJK character and per four other characters.
+
+    Args:
+        text: Input text
+
+    Returns:
+        Estimated number of tokens
+    """
+    text = str(text)
+    cjk = sum(1 for char in text if '\u4E00' <= char <= '\u9FFF')
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def count_tokens(text: str, model: str = "gpt-4o", estimate: bool = False) -> int:
+    """
+    Count tokens in text.
+
+    Args:
+        text: Input text
+        model: Model name for tokenizer
+        estimate: Use the cheap estimate instead of encoding
+
+    Returns:
+        Number of tokens
+    """
+    encoding = None if estimate else get_encoding(model)
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(str(text), disallowed_special=()))
+
+
+def _message_role_and_text(message: Any) -> Tuple[str, str]:
+    if isinstance(message, dict):
+        role, content = message.get("role", "unknown"), message.get("content", "")
+    else:
+        role, content = getattr(message, "role", "unknown"), getattr(message, "content", "")
+    if isinstance(content, list):
+        # Multimodal content - count text parts only
+        text_parts = []
+        for item in content:
+            text = item.get("text") if isinstance(item, dict) else getattr(item, "text", None)
+            if text:
+                text_parts.append(text)
+        content = " ".join(text_parts)
+    return str(role), str(content or "")
+
+
+def count_message_tokens(messages: List[Any], model: str = "gpt-4o", estimate: bool = False) -> int:
+    """
+    Count tokens of a message list (dicts or Message objects).
+
+    Each message is counted as "role: content" and cached by a hash of its content,
+    so unchanged messages (e.g. the system prompt) are never re-encoded.
+
+    Args:
+        messages: Messages to count
+        model: Model name for tokenizer
+        estimate: Use the cheap estimate instead of encoding
+
+    Returns:
+        Total number of tokens
+    """
+    total = 0
+    for message in messages:
+        role, text = _message_role_and_text(message)
+        key = (model, estimate, role, hash(text), len(text))
+        with _message_cache_lock:
+            cached = _message_cache.get(key)
+            if cached is not None:
+                _message_cache.move_to_end(key)
+        if cached is None:
+            cached = count_tokens(f"{role}: {text}", model, estimate=estimate)
+            with _message_cache_lock:
+                _message_cache[key] = cached
+                while len(_message_cache) > MESSAGE_CACHE_SIZE:
+                    _message_cache.popitem(last=False)
+        total += cached
+    # one separator token between messages
+    return total + max(len(messages) - 1, 0)
+
+
+def truncate_with_count(text: str, max_tokens: int = 95000, model: str = DEFAULT_ENCODING) -> Tuple[str, int]:
+    """
+    Truncate text to max_tokens, encoding it at most once.
+
+    Text with no more UTF-8 bytes than max_tokens cannot exceed the limit and is
+    returned without encoding.
+
+    Args:
+        text: Input text
+        max_tokens: Token limit
+        model: Model or encoding name
+
+    Returns:
+        (possibly truncated text, its token count); the count is an estimate when
+        the text was short enough to skip encoding or no encoder is available
+    """
+    if len(text.encode("utf-8")) <= max_tokens:
+        return text, estimate_tokens(text)
+    encoding = get_encoding(model)
+    if encoding is None:
+        approx = estimate_tokens(text)
+        if approx <= max_tokens:
+            return text, approx
+        keep = int(len(text) * max_tokens / approx)
+        return text[:keep], max_tokens
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text, len(tokens)
+    return encoding.decode(tokens[:max_tokens]), max_tokens
+
+
+def truncate_to_tokens(text: str, max_tokens: int = 95000, model: str = DEFAULT_ENCODING) -> str:
+    """Truncate text to at most max_tokens tokens."""
+    return truncate_with_count(text, max_tokens, model)[0]
+
+
+def split_into_token_chunks(text: str, chunk_tokens: int, max_chunks: Optional[int] = None,
+                            model: str = DEFAULT_ENCODING) -> Tuple[List[str], int]:
+    """
+    Split text into consecutive chunks of at most chunk_tokens tokens, encoding it once.
+
+    Args:
+        text: Input text
+        chunk_tokens: Maximum tokens per chunk
+        max_chunks: Content beyond this many chunks is dropped (None: keep all)
+        model: Model or encoding name
+
+    Returns:
+        (chunks, number of tokens kept)
+    """
+    if len(text.encode("utf-8")) <= chunk_tokens:
+        return [text], estimate_tokens(text)
+    encoding = get_encoding(model)
+    if encoding is None:
+        approx = max(estimate_tokens(text), 1)
+        chunk_chars = max(int(len(text) * chunk_tokens / approx), 1)
+        chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+        if max_chunks is not None:
+            chunks = chunks[:max_chunks]
+        return chunks, min(approx, chunk_tokens * len(chunks))
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= chunk_tokens:
+        return [text], len(tokens)
+    if max_chunks is not None:
+        tokens = tokens[:chunk_tokens * max_chunks]
+    chunks = [encoding.decode(tokens[i:i + chunk_tokens]) for i in range(0, len(tokens), chunk_tokens)]
+    return chunks, len(tokens)
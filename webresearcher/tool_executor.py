@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Unified async tool execution engine shared by all agents.
+
+Tool calls from WebResearcherAgent, ReactAgent and the WebWeaver agents are parsed,
+argument-fixed and executed here. Sync tools run in one of three bounded thread pools
+("lanes"), chosen by the tool's `executor_lane` attribute:
+
+- network: search / scholar / visit and other I/O-bound tools (default)
+- cpu:     document parsing and in-memory work (parse_file, retrieve)
+- code:    python sandbox calls
+
+so a slow PDF parse or python run can't occupy the threads search calls need. On top of
+the lanes there are per-tool concurrency caps and timeouts; a cancelled or timed-out call
+releases its slot at once and is dropped from its pool if it had not started yet.
+
+Usage:
+    executor = get_tool_executor()
+    observation = await executor.execute(tool_call_str, TOOL_MAP, file_root_path=FILE_DIR)
+"""
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import json5
+
+from webresearcher.config import (
+    TOOL_CALL_TIMEOUT,
+    TOOL_NETWORK_WORKERS,
+    TOOL_CPU_WORKERS,
+    TOOL_CODE_WORKERS,
+    TOOL_CONCURRENCY,
+    TOOL_TIMEOUTS,
+)
+from webresearcher.log import logger
+from webresearcher.single_flight import coalesce_tool_call
+
+LANES = ("network", "cpu", "code")
+DEFAULT_LANE = "network"
+# Tools whose array parameter LLMs often pass as a plain string
+_ARRAY_ARGS = {"search": "query", "google_scholar": "query", "visit": "url", "parse_file": "files"}
+
+
+def parse_limits(text: str) -> Dict[str, float]:
+    """Parse "python=2,parse_file=1" style settings into {tool_name: number}."""
+    limits = {}
+    for item in (text or "").split(","):
+        name, sep, value = item.partition("=")
+        if sep and name.strip():
+            try:
+                limits[name.strip()] = float(value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid tool setting: {item}")
+    return limits
+
+
+def normalize_tool_args(tool_name: str, tool_args: Dict) -> Dict:
+    """Auto-fix common LLM mistakes, e.g. a single query string instead of an array."""
+    key = _ARRAY_ARGS.get(tool_name)
+    if key and isinstance(tool_args.get(key), str):
+        tool_args = dict(tool_args, **{key: [tool_args[key]]})
+    return tool_args
+
+
+def parse_tool_call(tool_call_str: str) -> Tuple[str, Any]:
+    """
+    Parse a tool call body.
+
+    Args:
+        tool_call_str: JSON {"name": ..., "arguments": {...}} or a block with <code>...</code>
+
+    Returns:
+        (tool name, arguments); bare code blocks give ("python", code)
+
+    Raises:
+        ValueError: if the body is neither
+    """
+    if "<code>" in tool_call_str and "</code>" in tool_call_str:
+        return "python", tool_call_str.split("<code>", 1)[1].rsplit("</code>", 1)[0].strip()
+    try:
+        tool_call = json5.loads(tool_call_str)
+    except Exception as e:
+        raise ValueError(f"Tool call is not valid JSON: {e}")
+    if not isinstance(tool_call, dict) or not tool_call.get("name"):
+        raise ValueError('Tool call must contain a valid "name" and "arguments" field.')
+    tool_name = tool_call["name"]
+    tool_args = tool_call.get("arguments") or {}
+    if isinstance(tool_args, dict):
+        tool_args = normalize_tool_args(tool_name, tool_args)
+    return tool_name, tool_args
+
+
+class ToolExecutor:
+    """
+    Lane-based tool executor with per-tool concurrency caps, timeouts and stats.
+
+    Usage:
+        executor = ToolExecutor()
+        result = await executor.run(tool, "search", {"query": ["x"]})
+    """
+
+    def __init__(self, workers: Optional[Dict[str, int]] = None, tool_limits: Optional[Dict[str, int]] = None,
+                 tool_timeouts: Optional[Dict[str, float]] = None, default_timeout: float = TOOL_CALL_TIMEOUT):
+        """
+        Initialize tool executor.
+
+        Args:
+            workers: Thread pool size per lane
+            tool_limits: Max concurrent calls per tool name (overrides the tool's max_concurrency)
+            tool_timeouts: Timeout in seconds per tool name (overrides the tool's timeout)
+            default_timeout: Timeout for tools without their own
+        """
+        self.workers = {"network": TOOL_NETWORK_WORKERS, "cpu": TOOL_CPU_WORKERS, "code": TOOL_CODE_WORKERS}
+        self.workers.update(workers or {})
+        self.tool_limits = dict(tool_limits or {})
+        self.tool_timeouts = dict(tool_timeouts or {})
+        self.default_timeout = default_timeout
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        # Submitted calls that have not finished yet, so shutdown can cancel the queued ones
+        self._futures: Set[Future] = set()
+        self._lock = threading.Lock()
+        # event loop -> {tool name: semaphore}; asyncio primitives can't be shared across loops
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = \
+            weakref.WeakKeyDictionary()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    # ---- lanes ----
+    def _pool(self, lane: str) -> ThreadPoolExecutor:
+        with self._lock:
+            pool = self._pools.get(lane)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=max(1, int(self.workers.get(lane, 4))),
+                                          thread_name_prefix=f"tool-{lane}")
+                self._pools[lane] = pool
+            return pool
+
+    def set_lane_workers(self, lane: str, max_workers: int):
+        """Resize a lane; calls already running in the old pool finish there."""
+        with self._lock:
+            self.workers[lane] = max_workers
+            old = self._pools.pop(lane, None)
+        if old is not None:
+            old.shutdown(wait=False)
+
+    async def run_in_lane(self, lane: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run a sync function in a lane's thread pool."""
+        lane = lane if lane in LANES else DEFAULT_LANE
+        future = self._pool(lane).submit(functools.partial(fn, *args, **kwargs))
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        # Cancelling the awaiting task cancels the pool future too, if it has not started yet
+        return await asyncio.wrap_future(future)
+
+    def _forget(self, future: Future):
+        with self._lock:
+            self._futures.discard(future)
+
+    # ---- per-tool limits ----
+    def _semaphore(self, tool: Any, tool_name: str) -> Optional[asyncio.Semaphore]:
+        limit = int(self.tool_limits.get(tool_name) or getattr(tool, "max_concurrency", 0) or 0)
+        if limit <= 0:
+            return None
+        semaphores = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = semaphores[tool_name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def timeout_for(self, tool: Any, tool_name: str) -> float:
+        return self.tool_timeouts.get(tool_name) or getattr(tool, "timeout", None) or self.default_timeout
+
+    def _count(self, tool_name: str, field: str):
+        with self._lock:
+            stats = self._stats.setdefault(tool_name, {"calls": 0, "errors": 0, "timeouts": 0, "cancelled": 0})
+            stats[field] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-tool calls, errors, timeouts and cancellations."""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    # ---- execution ----
+    async def run(self, tool: Any, tool_name: str, args: Any, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Execute one tool call: single-flight for opted-in tools, per-tool cap, lane, timeout.
+
+        Args:
+            tool: Tool instance
+            tool_name: Tool name
+            args: Arguments passed to tool.call
+            timeout: Seconds (default: per-tool or default timeout)
+            **kwargs: Extra keyword arguments for tool.call
+
+        Returns:
+            Tool result
+
+        Raises:
+            asyncio.TimeoutError: if the call took longer than the timeout
+        """
+        self._count(tool_name, "calls")
+        lane = getattr(tool, "executor_lane", DEFAULT_LANE)
+
+        async def _invoke():
+            semaphore = self._semaphore(tool, tool_name)
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                if asyncio.iscoroutinefunction(tool.call):
+                    return await tool.call(args, **kwargs)
+                return await self.run_in_lane(lane, tool.call, args, **kwargs)
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+
+        timeout = timeout or self.timeout_for(tool, tool_name)
+        try:
+            return await asyncio.wait_for(coalesce_tool_call(tool, tool_name, args, _invoke), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._count(tool_name, "timeouts")
+            raise
+        except asyncio.CancelledError:
+            self._count(tool_name, "cancelled")
+            raise
+        except Exception:
+            self._count(tool_name, "errors")
+            raise
+
+    async def execute(self, tool_call_str: str, tool_map: Any, file_root_path: Optional[str] = None,
+                      timeout: Optional[float] = None) -> str:
+        """
+        Parse and execute a tool call body, returning the observation string.
+
+        Args:
+            tool_call_str: Tool call body (JSON or <code> block)
+            tool_map: Available tools {name: tool}
+            file_root_path: Root directory for parse_file
+            timeout: Seconds (default: per-tool or default timeout)
+
+        Returns:
+            Observation; errors are returned as "Error: ..." strings
+        """
+        try:
+            tool_name, tool_args = parse_tool_call(tool_call_str)
+        except ValueError as e:
+            return f"Error: {e}"
+        if tool_name not in tool_map:
+            return f"Error: Tool {tool_name} not found"
+        tool = tool_map[tool_name]
+        kwargs = {}
+        if tool_name == "parse_file" and file_root_path is not None:
+            if not isinstance(tool_args, dict):
+                return 'Error: Tool call arguments of parse_file must be an object like {"files": [...]}.'
+            tool_args = {"files": tool_args.get("files")}
+            kwargs["file_root_path"] = file_root_path
+        try:
+            result = await self.run(tool, tool_name, tool_args, timeout=timeout, **kwargs)
+        except asyncio.TimeoutError:
+            timeout = timeout or self.timeout_for(tool, tool_name)
+            logger.warning(f"Tool '{tool_name}' timed out after {timeout}s")
+            return f"Error: Tool '{tool_name}' timed out after {timeout}s."
+        except Exception as e:
+            logger.error(f"Tool call execution failed: {e}")
+            return f"Error: Tool call failed. Input: {tool_call_str}. Error: {e}"
+        return result if isinstance(result, str) else str(result)
+
+    def shutdown(self, cancel_futures: bool = True):
+        """Stop all lanes; queued calls are cancelled, running ones finish in the background."""
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+            futures = list(self._futures) if cancel_futures else []
+        for pool in pools:
+            # ThreadPoolExecutor.shutdown(cancel_futures=...) needs Python 3.9
+            pool.shutdown(wait=False)
+        for future in futures:
+            future.cancel()
+
+
+_executor: Optional[ToolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ToolExecutor:
+    """Process-wide ToolExecutor configured from TOOL_* settings."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ToolExecutor(
+                tool_limits={k: int(v) for k, v in parse_limits(TOOL_CONCURRENCY).items()},
+                tool_timeouts=parse_limits(TOOL_TIMEOUTS),
+            )
+        return _executor
@@ -10,14 +10,12 @@ output:
     - answer: str
     - useful_information: str
 """
+import asyncio
 import json
 import os
 
 from webresearcher.base import BaseTool, count_tokens, DEFAULT_MAX_INPUT_TOKENS
 
-from webresearcher.file_tools.file_parser import SingleFileParser, compress
-from webresearcher.file_tools.video_agent import VideoAgent
-
 FILE_SUMMARY_PROMPT = """
 Please process the following file content and user goal to extract relevant information:
 
@@ -63,23 +61,38 @@ async def file_parser(params, **kwargs):
                 else:
                     resolved_urls.append(url)
 
-    results = []
-    file_results = []
-    for url in resolved_urls:
+    # Lazy import: the parser pulls in pandas and document libraries
+    from webresearcher.file_tools.file_parser import SingleFileParser, compress
+    from webresearcher.tool_executor import get_tool_executor
+
+    executor = get_tool_executor()
+
+    async def _parse_one(url: str):
         try:
-            result = SingleFileParser().call(json.dumps({'url': url}), **kwargs)
-            results.append(f"# File: {os.path.basename(url)}\n{result}")
-            file_results.append(result)
+            # Parsing is CPU-bound: the cpu lane thread hands it to the parse process pool,
+            # so several files are parsed on several cores at once
+            result = await executor.run_in_lane("cpu", SingleFileParser().call, json.dumps({'url': url}), **kwargs)
+            return f"# File: {os.path.basename(url)}\n{result}", result
         except Exception as e:
-            results.append(f"# Error processing {os.path.basename(url)}: {str(e)}")
-    if count_tokens(json.dumps(results)) < DEFAULT_MAX_INPUT_TOKENS:
-        return results
-    else:
+            return f"# Error processing {os.path.basename(url)}: {str(e)}", None
+
+    parsed = await asyncio.gather(*[_parse_one(url) for url in resolved_urls])
+    results = [text for text, _ in parsed]
+    file_results = [result for _, result in parsed if result is not None]
+
+    def _fit(results, file_results):
+        if count_tokens(json.dumps(results)) < DEFAULT_MAX_INPUT_TOKENS:
+            return results
         return compress(file_results)
 
+    # Token counting / truncation of large documents is CPU work too
+    return await executor.run_in_lane("cpu", _fit, results, file_results)
+
 
 class FileParser(BaseTool):
     name = "parse_file"
+    single_flight = True
+    executor_lane = "cpu"
     description = "This is a tool that can be used to parse multiple user uploaded local files such as PDF, DOCX, PPTX, TXT, CSV, XLSX, DOC, ZIP, MP4, MP3."
     parameters = [
         {
@@ -113,6 +126,7 @@ class FileParser(BaseTool):
 
         if len(omnifile_path):
             params['files'] = omnifile_path
+            from webresearcher.file_tools.video_agent import VideoAgent
             agent = VideoAgent()
             res = await agent.call(params)
 
@@ -123,10 +137,6 @@ class FileParser(BaseTool):
 
 
 if __name__ == '__main__':
-    import os
-    import asyncio
-
-
     async def main():
         tool = FileParser()
         params = {
@@ -2,42 +2,492 @@
 """
 @author:XuMing(xuming624@qq.com)
 @description: Memory Bank and Retrieve Tool for WebWeaver
+
+Evidence is indexed as it is added: an incremental BM25 inverted index (plus an optional
+local embedding index) over its summary and leading content, so the Writer can fetch
+evidence by query as well as by citation ID.
+Near-duplicate evidence (same canonical URL, or SimHash-similar content) is collapsed to the
+citation ID stored first. With a storage directory, evidence content lives in an append-only
+segment file read back through mmap, so RAM does not grow with content size and the bank
+can be reopened later.
 """
-from typing import Dict, List
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import threading
+import zlib
+from collections import Counter, defaultdict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
 from webresearcher.base import BaseTool
 from webresearcher.log import logger
 
+# Default number of evidence chunks returned by a query
+DEFAULT_TOP_K = 5
+# Reciprocal rank fusion constant for combining BM25 and embedding rankings
+RRF_K = 60
+# Query indexes cover the summary plus this many leading characters of the content,
+# so index memory grows with the number of evidence chunks, not with their size
+INDEX_PREFIX_CHARS = 4000
+# Near-duplicate detection: word 3-gram shingles, SimHash over a bottom-k sample of them
+SHINGLE_SIZE = 3
+SIMHASH_SAMPLE = 256
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+# Query parameters that never change the page content
+_TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "msclkid", "spm", "ref", "ref_src", "from")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms: lowercased alphanumeric words, and character
+    unigrams + bigrams for CJK runs (no word segmenter needed).
+    """
+    terms = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        word = match.group()
+        if word[0].isascii():
+            terms.append(word)
+        else:
+            terms.extend(word)
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def index_text(content: str, summary: str) -> str:
+    """Text indexed for query retrieval: the summary plus a bounded prefix of the content."""
+    return f"{summary}\n{content[:INDEX_PREFIX_CHARS]}"
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for duplicate detection: scheme-less, lowercased host without
+    "www.", no fragment, tracking parameters dropped, remaining parameters sorted, no trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    64-bit SimHash of the word 3-gram shingles of a text, or None if it has no terms.
+
+    Only the SIMHASH_SAMPLE shingles with the smallest hashes are used (a consistent
+    bottom-k sample), so fingerprinting a long page stays cheap while near-duplicate
+    pages still share most of their sample.
+    """
+    terms = tokenize(text)
+    if not terms:
+        # Empty output (e.g. code that printed nothing) is not a duplicate of other empty output
+        return None
+    if len(terms) >= SHINGLE_SIZE:
+        shingles = {" ".join(terms[i:i + SHINGLE_SIZE]) for i in range(len(terms) - SHINGLE_SIZE + 1)}
+    else:
+        shingles = {" ".join(terms)}
+    sample = heapq.nsmallest(SIMHASH_SAMPLE, shingles, key=lambda sh: zlib.crc32(sh.encode("utf-8")))
+    weights = [0] * SIMHASH_BITS
+    for shingle in sample:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class EvidenceDeduplicator:
+    """
+    Finds evidence already stored under another citation ID.
+
+    Two evidence chunks are duplicates when they come from the same canonical URL, or
+    their content SimHashes differ in at most `max_distance` bits. SimHashes are split
+    into SIMHASH_BANDS bands; with max_distance < SIMHASH_BANDS, any near-duplicate
+    shares at least one whole band, so only same-band candidates are compared.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = min(max_distance, SIMHASH_BANDS - 1)
+        # Alias mapping: canonical URL -> citation ID
+        self.url_ids: Dict[str, str] = {}
+        self.fingerprints: Dict[str, int] = {}
+        self.bands: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        self.stats = {"added": 0, "duplicates": 0, "url_hits": 0, "content_hits": 0, "saved_chars": 0}
+
+    @staticmethod
+    def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+        width = SIMHASH_BITS // SIMHASH_BANDS
+        return [(i, fingerprint >> (i * width) & ((1 << width) - 1)) for i in range(SIMHASH_BANDS)]
+
+    def find(self, fingerprint: Optional[int], url: Optional[str] = None) -> Optional[str]:
+        """Citation ID of a stored duplicate, or None; content without a fingerprint is only matched by URL."""
+        if url and url in self.url_ids:
+            self.stats["url_hits"] += 1
+            return self.url_ids[url]
+        if fingerprint is None:
+            return None
+        for band in self._bands(fingerprint):
+            for cid in self.bands.get(band, ()):
+                if bin(fingerprint ^ self.fingerprints[cid]).count("1") <= self.max_distance:
+                    self.stats["content_hits"] += 1
+                    return cid
+        return None
+
+    def add(self, citation_id: str, fingerprint: Optional[int], url: Optional[str] = None):
+        if fingerprint is not None:
+            self.fingerprints[citation_id] = fingerprint
+            for band in self._bands(fingerprint):
+                self.bands[band].append(citation_id)
+        if url:
+            self.url_ids[url] = citation_id
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index.
+
+    Documents are indexed once on add; a query only touches the postings of its own
+    terms, so lookups stay fast as the index grows.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> {doc_id: term frequency}
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.doc_len: Dict[str, int] = {}
+        self.total_len = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def add(self, doc_id: str, text: str):
+        """Index a new document."""
+        terms = tokenize(text)
+        for term, tf in Counter(terms).items():
+            self.postings[term][doc_id] = tf
+        self.doc_len[doc_id] = len(terms)
+        self.total_len += len(terms)
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K,
+               exclude: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Free-text query
+            top_k: Number of results
+            exclude: Document ids to skip
+
+        Returns:
+            [(doc_id, score), ...] by descending score
+        """
+        n = len(self.doc_len)
+        if not n:
+            return []
+        exclude = set(exclude or ())
+        avg_len = self.total_len / n or 1.0
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                if doc_id in exclude:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+
+class VectorIndex:
+    """
+    Brute-force cosine similarity index over embeddings from a local embedding function.
+
+    Args:
+        embed_fn: Callable mapping a list of texts to a list of vectors
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], Sequence[Sequence[float]]]):
+        self.embed_fn = embed_fn
+        self.ids: List[str] = []
+        self.vectors: List[List[float]] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> List[float]:
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def add(self, doc_id: str, text: str):
+        self.ids.append(doc_id)
+        self.vectors.append(self._normalize(self.embed_fn([text])[0]))
+
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K,
+               exclude: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        if not self.ids:
+            return []
+        exclude = set(exclude or ())
+        q = self._normalize(self.embed_fn([query])[0])
+        try:
+            import numpy as np
+            sims = (np.asarray(self.vectors) @ np.asarray(q)).tolist()
+        except ImportError:
+            sims = [sum(a * b for a, b in zip(vec, q)) for vec in self.vectors]
+        scored = ((doc_id, sim) for doc_id, sim in zip(self.ids, sims) if doc_id not in exclude)
+        return heapq.nlargest(top_k, scored, key=lambda item: item[1])
+
+
+class SegmentStore(MutableMapping):
+    """
+    Evidence contents in an append-only segment file, read back through mmap.
+
+    Only (offset, length) per citation ID is kept in RAM. Per-evidence metadata (summary,
+    url, fingerprint) goes to an index JSONL next to the segment, so a bank can be reopened.
+
+    Files in `directory`:
+        evidence.seg: concatenated UTF-8 contents
+        index.jsonl: one {"id", "offset", "length", ...metadata} record per evidence
+    """
+
+    SEGMENT_FILE = "evidence.seg"
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, directory: str):
+        """
+        Open (or create) a segment store.
+
+        Args:
+            directory: Directory holding the segment and index files
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.segment_path = os.path.join(directory, self.SEGMENT_FILE)
+        self.index_path = os.path.join(directory, self.INDEX_FILE)
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._mmap: Optional[mmap.mmap] = None
+        self._load_index()
+        self._segment = open(self.segment_path, "ab")
+        self._index = open(self.index_path, "a", encoding="utf-8")
+        self._reader = open(self.segment_path, "rb")
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        segment_size = os.path.getsize(self.segment_path) if os.path.exists(self.segment_path) else 0
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # partial last line after a crash
+                    continue
+                if record.get("deleted"):
+                    # tombstone written by __delitem__
+                    self.offsets.pop(record["id"], None)
+                    continue
+                if record.get("offset", 0) + record.get("length", 0) > segment_size:
+                    continue
+                self.offsets[record["id"]] = (record["offset"], record["length"])
+                self._records.append(record)
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Index records loaded when the store was opened, in insertion order."""
+        return [r for r in self._records if r["id"] in self.offsets]
+
+    def append(self, citation_id: str, content: str, **meta):
+        """
+        Append evidence content (and JSON-serializable metadata) to the store.
+
+        Args:
+            citation_id: Citation ID
+            content: Evidence content
+            **meta: Extra fields kept in the index record, e.g. summary
+        """
+        data = content.encode("utf-8")
+        with self._lock:
+            offset = self._segment.tell()
+            self._segment.write(data)
+            self._segment.flush()
+            record = dict(meta, id=citation_id, offset=offset, length=len(data))
+            self._index.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._index.flush()
+            self.offsets[citation_id] = (offset, len(data))
+
+    def __setitem__(self, citation_id: str, content: str):
+        self.append(citation_id, content)
+
+    def __getitem__(self, citation_id: str) -> str:
+        offset, length = self.offsets[citation_id]
+        if length == 0:
+            return ""
+        with self._lock:
+            if self._mmap is None or offset + length > len(self._mmap):
+                # The segment grew since it was mapped; remap to cover the new tail
+                if self._mmap is not None:
+                    self._mmap.close()
+                self._mmap = mmap.mmap(self._reader.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._mmap[offset:offset + length].decode("utf-8")
+
+    def __delitem__(self, citation_id: str):
+        # Space is not reclaimed; the entry just becomes unreachable
+        with self._lock:
+            del self.offsets[citation_id]
+            self._index.write(json.dumps({"id": citation_id, "deleted": True}) + "\n")
+            self._index.flush()
+
+    def __contains__(self, citation_id: object) -> bool:
+        return citation_id in self.offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.offsets))
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def clear(self):
+        """Drop all evidence and truncate the files."""
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            self._segment.truncate(0)
+            self._segment.seek(0)
+            self._index.truncate(0)
+            self._index.seek(0)
+            self.offsets.clear()
+            self._records = []
+
+    def close(self):
+        with self._lock:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            for f in (self._segment, self._index, self._reader):
+                f.close()
+
 
 class MemoryBank:
     """
     Memory Bank for storing evidence found by Planner Agent.
     
     Based on WebWeaver paper Section 3.1.2 and Section 3.2.
-    The Planner writes evidence (add_evidence), and the Writer retrieves it (retrieve).
+    The Planner writes evidence (add_evidence), and the Writer retrieves it by citation
+    ID (retrieve) or by query (search / retrieve_by_query).
     """
 
-    def __init__(self):
-        """Initialize empty memory bank."""
+    def __init__(self, embed_fn: Optional[Callable[[List[str]], Sequence[Sequence[float]]]] = None,
+                 dedup: bool = True, storage_dir: Optional[str] = None):
+        """
+        Initialize memory bank.
+
+        Args:
+            embed_fn: Optional local embedding function (texts -> vectors); when given,
+                query retrieval fuses BM25 and embedding rankings
+            dedup: Collapse near-duplicate evidence to the first stored citation ID
+            storage_dir: Keep evidence content on disk in this directory (SegmentStore)
+                instead of in RAM; evidence already stored there is loaded
+        """
         # Structure: { "id_1": "evidence content...", "id_2": "summary..." }
-        self.evidence: Dict[str, str] = {}
+        self.storage = SegmentStore(storage_dir) if storage_dir else None
+        self.evidence: MutableMapping = self.storage if self.storage is not None else {}
+        self.summaries: Dict[str, str] = {}
         self.id_counter = 0
+        self.index = BM25Index()
+        self.vector_index = VectorIndex(embed_fn) if embed_fn else None
+        self.dedup = dedup
+        self.deduplicator = EvidenceDeduplicator()
+        # Planner tools may add evidence from several threads
+        self._lock = threading.RLock()
+        if self.storage is not None:
+            self._load_storage()
 
-    def add_evidence(self, content: str, summary: str) -> str:
+    def _load_storage(self):
+        """Rebuild summaries, indexes and dedup state from a reopened SegmentStore."""
+        for record in self.storage.records():
+            cid = record["id"]
+            content = self.storage[cid]
+            summary = record.get("summary", "")
+            self.summaries[cid] = summary
+            self.index.add(cid, index_text(content, summary))
+            if self.vector_index is not None:
+                try:
+                    self.vector_index.add(cid, index_text(content, summary))
+                except Exception as e:
+                    logger.warning(f"Failed to embed evidence {cid}: {e}")
+            if self.dedup:
+                fingerprint = record.get("fingerprint")
+                self.deduplicator.add(cid, simhash(content) if fingerprint is None else fingerprint, record.get("url"))
+                self.deduplicator.stats["added"] += 1
+            number = cid.rsplit("_", 1)[-1]
+            if number.isdigit():
+                self.id_counter = max(self.id_counter, int(number))
+        if self.summaries:
+            logger.debug(f"Loaded {len(self.summaries)} evidence chunks from {self.storage.directory}")
+
+    def add_evidence(self, content: str, summary: str, url: Optional[str] = None) -> str:
         """
         Add new evidence to the memory bank and return a unique citation ID.
+
+        Near-duplicates of stored evidence are not stored again; the observation then
+        points to the existing citation ID.
         
         Args:
             content: Full detailed evidence content
             summary: Query-relevant summary of the evidence
+            url: Source URL when the evidence comes from a single page (search / scholar hit)
             
         Returns:
             Formatted observation string with ID and summary
         """
-        self.id_counter += 1
-        citation_id = f"id_{self.id_counter}"
+        fingerprint = simhash(content) if self.dedup else None
+        url = canonicalize_url(url) if self.dedup and url else None
+        with self._lock:
+            if self.dedup:
+                duplicate_id = self.deduplicator.find(fingerprint, url)
+                if duplicate_id is not None:
+                    self.deduplicator.stats["duplicates"] += 1
+                    self.deduplicator.stats["saved_chars"] += len(content)
+                    logger.debug(f"Duplicate evidence collapsed to {duplicate_id}")
+                    return (f"<evidence_chunk>\n<id>{duplicate_id}</id>\n"
+                            f"<summary>Duplicate of evidence already stored as {duplicate_id}.</summary>\n</evidence_chunk>")
+            self.id_counter += 1
+            citation_id = f"id_{self.id_counter}"
 
-        # Store detailed content for Writer to retrieve later
-        self.evidence[citation_id] = content
+            # Store detailed content for Writer to retrieve later
+            if self.storage is not None:
+                self.storage.append(citation_id, content, summary=summary, url=url, fingerprint=fingerprint)
+            else:
+                self.evidence[citation_id] = content
+            self.summaries[citation_id] = summary
+            self.index.add(citation_id, index_text(content, summary))
+            if self.dedup:
+                self.deduplicator.add(citation_id, fingerprint, url)
+                self.deduplicator.stats["added"] += 1
+        if self.vector_index is not None:
+            try:
+                with self._lock:
+                    self.vector_index.add(citation_id, index_text(content, summary))
+            except Exception as e:
+                logger.warning(f"Failed to embed evidence {citation_id}: {e}")
 
         # Return ID and summary as observation for Planner
         # This follows the format from WebWeaver paper Appendix B.2
@@ -68,6 +518,53 @@ class MemoryBank:
 
         return "\n\n".join(retrieved_content)
 
+    def search(self, query: str, top_k: int = DEFAULT_TOP_K,
+               exclude_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the evidence most relevant to a query.
+
+        Args:
+            query: Free-text query, e.g. a section title plus its key points
+            top_k: Number of citation IDs to return
+            exclude_ids: Citation IDs to leave out (e.g. already retrieved)
+
+        Returns:
+            [(citation_id, score), ...] by descending relevance
+        """
+        with self._lock:
+            hits = self.index.search(query, top_k, exclude_ids)
+            if self.vector_index is None:
+                return hits
+            try:
+                vector_hits = self.vector_index.search(query, top_k, exclude_ids)
+            except Exception as e:
+                logger.warning(f"Embedding search failed, using BM25 only: {e}")
+                return hits
+        # Reciprocal rank fusion of the two rankings
+        fused: Dict[str, float] = defaultdict(float)
+        for ranking in (hits, vector_hits):
+            for rank, (cid, _) in enumerate(ranking):
+                fused[cid] += 1.0 / (RRF_K + rank + 1)
+        return heapq.nlargest(top_k, fused.items(), key=lambda item: item[1])
+
+    def retrieve_by_query(self, query: str, top_k: int = DEFAULT_TOP_K,
+                          exclude_ids: Optional[Iterable[str]] = None) -> str:
+        """
+        Retrieve the top-k evidence chunks for a query.
+
+        Args:
+            query: Free-text query
+            top_k: Number of evidence chunks
+            exclude_ids: Citation IDs to leave out
+
+        Returns:
+            Retrieved evidence content formatted with IDs
+        """
+        hits = self.search(query, top_k, exclude_ids)
+        if not hits:
+            return f"No evidence found for query '{query}'."
+        return self.retrieve([cid for cid, _ in hits])
+
     def get_all_ids(self) -> List[str]:
         """Get all citation IDs in the memory bank."""
         return list(self.evidence.keys())
@@ -76,10 +573,26 @@ class MemoryBank:
         """Get the number of evidence items in memory bank."""
         return len(self.evidence)
 
+    def dedup_stats(self) -> Dict[str, int]:
+        """Counts of stored evidence and collapsed duplicates (by URL / by content) and characters saved."""
+        with self._lock:
+            return dict(self.deduplicator.stats)
+
     def clear(self):
         """Clear all evidence from memory bank."""
-        self.evidence.clear()
-        self.id_counter = 0
+        with self._lock:
+            self.evidence.clear()
+            self.summaries.clear()
+            self.id_counter = 0
+            self.index = BM25Index()
+            self.deduplicator = EvidenceDeduplicator()
+            if self.vector_index is not None:
+                self.vector_index = VectorIndex(self.vector_index.embed_fn)
+
+    def close(self):
+        """Close the disk storage, if any (evidence stays on disk for reopening)."""
+        if self.storage is not None:
+            self.storage.close()
 
 
 class RetrieveTool(BaseTool):
@@ -98,7 +611,11 @@ class RetrieveTool(BaseTool):
         """
         self.memory_bank = memory_bank
         self.name = "retrieve"
-        self.description = "Retrieves specific evidence chunks from the Memory Bank using their citation IDs. Use this to get the content needed to write a specific section."
+        self.executor_lane = "cpu"
+        self.description = (
+            "Retrieves evidence chunks from the Memory Bank by their citation IDs and/or by a search query. "
+            "Use this to get the content needed to write a specific section."
+        )
         self.parameters = {
             "type": "object",
             "properties": {
@@ -106,9 +623,18 @@ class RetrieveTool(BaseTool):
                     "type": "array",
                     "items": {"type": "string"},
                     "description": "A list of citation IDs (e.g., ['id_1', 'id_5']) to retrieve from the Memory Bank."
+                },
+                "query": {
+                    "type": "string",
+                    "description": "Optional search query (e.g., the section title and key points); "
+                                   "returns the most relevant evidence not already listed in citation_ids."
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": f"Number of evidence chunks to return for the query (default {DEFAULT_TOP_K})."
                 }
             },
-            "required": ["citation_ids"]
+            "required": []
         }
 
     def call(self, params: Dict, **kwargs) -> str:
@@ -116,13 +642,29 @@ class RetrieveTool(BaseTool):
         Execute retrieve operation.
         
         Args:
-            params: Dictionary with 'citation_ids' key
+            params: Dictionary with 'citation_ids' and/or 'query' (+ optional 'top_k') keys
             **kwargs: Additional arguments (unused)
             
         Returns:
             Retrieved evidence content
         """
-        citation_ids = params.get('citation_ids', [])
-        logger.debug(f"[RetrieveTool] Retrieving IDs: {citation_ids}")
-        return self.memory_bank.retrieve(citation_ids)
+        citation_ids = params.get('citation_ids') or []
+        if isinstance(citation_ids, str):
+            citation_ids = [citation_ids]
+        query = (params.get('query') or "").strip()
+        if not citation_ids and not query:
+            return "Error: provide 'citation_ids' and/or 'query'."
+
+        results = []
+        if citation_ids:
+            logger.debug(f"[RetrieveTool] Retrieving IDs: {citation_ids}")
+            results.append(self.memory_bank.retrieve(citation_ids))
+        if query:
+            try:
+                top_k = max(1, int(params.get('top_k') or DEFAULT_TOP_K))
+            except (TypeError, ValueError):
+                top_k = DEFAULT_TOP_K
+            logger.debug(f"[RetrieveTool] Query: {query}, top_k: {top_k}")
+            results.append(self.memory_bank.retrieve_by_query(query, top_k, exclude_ids=citation_ids))
+        return "\n\n".join(results)
 
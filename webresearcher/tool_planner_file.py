@@ -32,6 +32,7 @@ class PlannerFileTool(BaseTool):
         self.memory_bank = memory_bank
         self.base_file_parser = FileParser()
         self.name = "parse_file"
+        self.executor_lane = "cpu"
         self.description = "Parses files (PDF, DOCX, etc.) and saves content to the memory bank with citation IDs."
         self.parameters = {
             "type": "object",
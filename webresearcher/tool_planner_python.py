@@ -31,6 +31,7 @@ class PlannerPythonTool(BaseTool):
         self.memory_bank = memory_bank
         self.base_python = PythonInterpreter()
         self.name = "python"
+        self.executor_lane = "code"
         self.description = "Executes Python code and saves results to the memory bank with citation IDs."
         self.parameters = {
             "type": "object",
@@ -113,7 +113,7 @@ class PlannerScholarTool(BaseTool):
                                 summary = f"[{title}] {content[:200]}..." if len(content) > 200 else f"[{title}] {content}"
                                 
                                 # Add to memory bank and get citation ID
-                                obs = self.memory_bank.add_evidence(content=full_content, summary=summary)
+                                obs = self.memory_bank.add_evidence(content=full_content, summary=summary, url=url)
                                 observations.append(obs)
                     except Exception as e:
                         logger.warning(f"[PlannerScholarTool] Failed to parse paper line: {line}, error: {e}")
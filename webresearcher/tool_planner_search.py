@@ -116,7 +116,7 @@ class PlannerSearchTool(BaseTool):
                                 summary = f"[{title}] {snippet[:200]}..." if len(snippet) > 200 else f"[{title}] {snippet}"
                                 
                                 # Add to memory bank and get citation ID
-                                obs = self.memory_bank.add_evidence(content=full_content, summary=summary)
+                                obs = self.memory_bank.add_evidence(content=full_content, summary=summary, url=url)
                                 observations.append(obs)
                     except Exception as e:
                         logger.warning(f"[PlannerSearchTool] Failed to parse result line: {line}, error: {e}")
@@ -7,7 +7,6 @@ import json5
 import os
 import random
 import time
-from sandbox_fusion import run_code, RunCodeRequest
 from requests.exceptions import Timeout
 
 from webresearcher.base import BaseToolWithFileAccess, extract_code
@@ -26,6 +25,7 @@ def has_chinese_chars(texts: List[str]) -> bool:
 
 class PythonInterpreter(BaseToolWithFileAccess):
     name = "python"
+    executor_lane = "code"
     description = 'Execute Python code in a sandboxed environment. Use this to run Python code and get the execution results.\n**Make sure to use print() for any output you want to see in the results.**\nFor code parameters, use placeholders first, and then put the code within <code></code> XML tags, such as:\n<tool_call>\n{"purpose": <detailed-purpose-of-this-tool-call>, "name": <tool-name>, "arguments": {"code": ""}}\n<code>\nHere is the code.\n</code>\n</tool_call>\n'
 
     parameters = {
@@ -109,6 +109,8 @@ class PythonInterpreter(BaseToolWithFileAccess):
                 logger.debug('No sandbox fusion endpoints available, falling back to local execution')
                 return self.run_python_code_locally(code)
 
+            from sandbox_fusion import run_code, RunCodeRequest
+
             last_error = None
             for attempt in range(2):
                 endpoint = None  # Initialize endpoint
@@ -171,6 +173,8 @@ class PythonInterpreter(BaseToolWithFileAccess):
         if not code.strip():
             return False, '[Python Interpreter Error]: Empty code.'
 
+        from sandbox_fusion import run_code, RunCodeRequest
+
         try:
             start_time = time.time()
             code_result = run_code(RunCodeRequest(code=code, language='python', run_timeout=timeout),
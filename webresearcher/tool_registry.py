@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+@author:XuMing(xuming624@qq.com)
+@description: Lazy tool registry.
+
+Tools (and their heavy dependencies such as pandas, openai or sandbox_fusion) are
+imported and constructed on first use instead of at package import time.
+"""
+import importlib
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Union
+
+from webresearcher.base import BaseTool
+
+ToolSpec = Union[str, Callable[[], BaseTool]]
+
+# Default tools of WebResearcherAgent / ReactAgent, in prompt order
+DEFAULT_TOOL_SPECS: Dict[str, str] = {
+    "parse_file": "webresearcher.tool_file:FileParser",
+    "google_scholar": "webresearcher.tool_scholar:Scholar",
+    "visit": "webresearcher.tool_visit:Visit",
+    "search": "webresearcher.tool_search:Search",
+    "python": "webresearcher.tool_python:PythonInterpreter",
+}
+
+
+def import_object(path: str) -> Any:
+    """Import an object from a "package.module:attr" path."""
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def lazy_tool(path: str, *args, **kwargs) -> Callable[[], BaseTool]:
+    """
+    Build a factory that imports and constructs a tool on first use.
+
+    Args:
+        path: "package.module:ClassName" of the tool class
+        *args: Constructor positional arguments
+        **kwargs: Constructor keyword arguments
+
+    Returns:
+        Zero-argument factory
+    """
+    def _factory() -> BaseTool:
+        return import_object(path)(*args, **kwargs)
+
+    return _factory
+
+
+class LazyToolMap(MutableMapping):
+    """
+    A tool name -> tool instance mapping whose tools are built on first access.
+
+    Listing names (keys, `in`, len) never imports anything. Assigning a tool instance
+    registers it directly, e.g. `TOOL_MAP["wikipedia"] = WikipediaTool()`.
+    """
+
+    def __init__(self, specs: Dict[str, ToolSpec]):
+        """
+        Initialize tool map.
+
+        Args:
+            specs: Tool name -> "package.module:ClassName" path or zero-argument factory
+        """
+        self._entries: Dict[str, Any] = dict(specs)
+        self._loaded: Dict[str, bool] = {name: False for name in specs}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> BaseTool:
+        with self._lock:
+            entry = self._entries[name]
+            if not self._loaded[name]:
+                entry = import_object(entry)() if isinstance(entry, str) else entry()
+                self._entries[name] = entry
+                self._loaded[name] = True
+            return entry
+
+    def __setitem__(self, name: str, tool: BaseTool) -> None:
+        with self._lock:
+            self._entries[name] = tool
+            self._loaded[name] = True
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            del self._entries[name]
+            del self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether the tool has been constructed yet."""
+        return self._loaded.get(name, False)
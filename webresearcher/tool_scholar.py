@@ -7,12 +7,15 @@ from contextlib import contextmanager
 
 from webresearcher.log import logger
 from webresearcher.base import BaseTool
+from webresearcher.cache import get_search_cache, make_cache_key
+from webresearcher.rate_limiter import get_rate_limiter
 
 SERPER_API_KEY = os.environ.get('SERPER_API_KEY')
 
 
 class Scholar(BaseTool):
     name = "google_scholar"
+    single_flight = True
     description = "Leverage Google Scholar to retrieve relevant information from academic publications. Accepts multiple queries."
     parameters = {
         "type": "object",
@@ -47,8 +50,10 @@ class Scholar(BaseTool):
 
         for attempt in range(max_retries):
             try:
-                conn.request("POST", "/scholar", payload, headers)
-                response = conn.getresponse()
+                with get_rate_limiter("serper").slot() as slot:
+                    conn.request("POST", "/scholar", payload, headers)
+                    response = conn.getresponse()
+                    slot.report(response.status, response.getheader("Retry-After"))
 
                 if response.status == 200:
                     data = response.read()
@@ -99,7 +104,22 @@ class Scholar(BaseTool):
         return "\n".join(result_parts)
 
     def google_scholar_with_serp(self, query: str) -> str:
-        """使用Serper API搜索Google Scholar"""
+        """使用Serper API搜索Google Scholar，优先读取持久化结果缓存"""
+        cache = get_search_cache("scholar")
+        cache_key = make_cache_key(query or "")
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"[Scholar] cache hit for query: {query}")
+                return cached
+
+        content = self._google_scholar_with_serp(query)
+        # 只缓存成功的结果，失败/空结果下次重新请求
+        if cache is not None and content.startswith("Google Scholar search for"):
+            cache.set(cache_key, content)
+        return content
+
+    def _google_scholar_with_serp(self, query: str) -> str:
         if not SERPER_API_KEY:
             return "Error: SERPER_API_KEY environment variable is not set."
 
@@ -1,17 +1,53 @@
 from typing import Dict, List, Optional, Union
 import os
-import http.client
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+import requests
+from requests.adapters import HTTPAdapter
 from webresearcher.log import logger
 from webresearcher.base import BaseTool
+from webresearcher.cache import get_search_cache, make_cache_key
+from webresearcher.rate_limiter import get_rate_limiter, is_overload
 
 
 SERPER_API_KEY = os.environ.get('SERPER_API_KEY')
+SERPER_URL = "https://google.serper.dev"
+SEARCH_MAX_WORKERS = int(os.getenv("SEARCH_MAX_WORKERS", 8))
+SEARCH_REQUEST_TIMEOUT = int(os.getenv("SEARCH_REQUEST_TIMEOUT", 30))
+SEARCH_BATCH_TIMEOUT = int(os.getenv("SEARCH_BATCH_TIMEOUT", 60))
 logger.debug(f"SERPER_API_KEY: {SERPER_API_KEY}")
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_serper_session() -> requests.Session:
+    """Shared keep-alive session for google.serper.dev, safe to use from worker threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(SEARCH_MAX_WORKERS, 10))
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def contains_chinese_basic(text: str) -> bool:
+    return any('\u4E00' <= char <= '\u9FFF' for char in text)
+
+
+def get_search_locale(query: str) -> Dict[str, str]:
+    """Serper location/gl/hl for a query, chosen by its script."""
+    if contains_chinese_basic(query):
+        return {"location": "China", "gl": "cn", "hl": "zh-cn"}
+    return {"location": "United States", "gl": "us", "hl": "en"}
+
 
 class Search(BaseTool):
     name = "search"
+    single_flight = True
     description = "Performs batched web searches: supply an array 'query'; the tool retrieves the top 10 results for each query in one call."
     parameters = {
         "type": "object",
@@ -31,47 +67,50 @@ class Search(BaseTool):
         pass  # No parent __init__ needed
 
     def google_search_with_serp(self, query: str):
-        def contains_chinese_basic(text: str) -> bool:
-            return any('\u4E00' <= char <= '\u9FFF' for char in text)
-
-        conn = http.client.HTTPSConnection("google.serper.dev")
-        if contains_chinese_basic(query):
-            payload = json.dumps({
-                "q": query,
-                "location": "China",
-                "gl": "cn",
-                "hl": "zh-cn"
-            })
-
-        else:
-            payload = json.dumps({
-                "q": query,
-                "location": "United States",
-                "gl": "us",
-                "hl": "en"
-            })
+        """Search via serper, served from the persistent result cache when possible."""
+        locale = get_search_locale(query)
+        cache = get_search_cache("search")
+        cache_key = make_cache_key(query, locale["gl"], locale["hl"])
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"[Search] cache hit for query: {query}")
+                return cached
+
+        content = self._google_search_with_serp(query, locale)
+        # Only successful result pages are cached; errors and empty results are retried next time
+        if cache is not None and content.startswith("A Google search for"):
+            cache.set(cache_key, content)
+        return content
+
+    def _google_search_with_serp(self, query: str, locale: Dict[str, str]):
+        payload = json.dumps({"q": query, **locale})
         if not SERPER_API_KEY:
             return "SERPER_API_KEY is not set. Please set the SERPER_API_KEY environment variable."
         headers = {
             'X-API-KEY': SERPER_API_KEY,
             'Content-Type': 'application/json'
         }
+        session = get_serper_session()
         res = None
         for i in range(5):
             try:
-                conn.request("POST", "/search", payload, headers)
-                res = conn.getresponse()
+                with get_rate_limiter("serper").slot() as slot:
+                    res = session.post(f"{SERPER_URL}/search", data=payload, headers=headers,
+                                       timeout=SEARCH_REQUEST_TIMEOUT)
+                    slot.report(res.status_code, res.headers.get("Retry-After"))
+                if is_overload(res.status_code) and i < 4:
+                    logger.warning(f"[Search] HTTP {res.status_code} for query '{query}', attempt {i + 1}")
+                    continue
                 break
             except Exception as e:
-                print(e)
+                logger.warning(f"[Search] request failed for query '{query}', attempt {i + 1}: {e}")
                 if i == 4:
                     return f"Google search Timeout, return None, Please try again later."
                 continue
 
-        data = res.read()
-        results = json.loads(data.decode("utf-8"))
-
         try:
+            results = res.json()
             if "organic" not in results:
                 raise Exception(f"No results found for query: '{query}'. Use a less specific query.")
 
@@ -106,6 +145,44 @@ class Search(BaseTool):
         result = self.google_search_with_serp(query)
         return result
 
+    def batch_search(self, queries: List[str], max_workers: int = SEARCH_MAX_WORKERS,
+                     timeout: float = SEARCH_BATCH_TIMEOUT) -> List[str]:
+        """
+        Run several queries concurrently over the shared serper session.
+
+        Args:
+            queries: Query strings
+            max_workers: Maximum number of in-flight requests
+            timeout: Deadline in seconds for the whole batch
+
+        Returns:
+            One result string per query, in input order. Queries that miss the
+            deadline get a timeout message instead of blocking the batch.
+        """
+        if len(queries) <= 1:
+            return [self.search_with_serp(q) for q in queries]
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries))))
+        try:
+            futures = [executor.submit(self.search_with_serp, q) for q in queries]
+            wait(futures, timeout=timeout)
+            responses = []
+            for q, future in zip(queries, futures):
+                if not future.done():
+                    future.cancel()
+                    logger.warning(f"[Search] query '{q}' exceeded batch deadline of {timeout}s")
+                    responses.append(f"Google search for '{q}' timed out. Please try again later.")
+                    continue
+                try:
+                    responses.append(future.result())
+                except Exception as e:
+                    logger.error(f"[Search] query '{q}' failed: {e}")
+                    responses.append(f"No results found for '{q}'. Try with a more general query.")
+            return responses
+        finally:
+            # Don't wait for stragglers past the deadline; their requests time out on their own
+            executor.shutdown(wait=False)
+
     def call(self, params: Union[str, dict], **kwargs) -> str:
         try:
             query = params["query"]
@@ -115,11 +192,9 @@ class Search(BaseTool):
             # 单个查询
             response = self.search_with_serp(query)
         else:
-            # 多个查询
+            # 多个查询，并发执行，保持顺序
             assert isinstance(query, List)
-            responses = []
-            for q in query:
-                responses.append(self.search_with_serp(q))
+            responses = self.batch_search(query)
             response = "\n=======\n".join(responses)
         logger.debug(f"[Search] query: {query},\nresponse: {response[:500]}...")
         return response
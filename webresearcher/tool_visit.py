@@ -1,30 +1,52 @@
 import json
 import os
-from typing import List, Union
+from typing import Dict, List, Optional, Tuple, Union
 import requests
 from webresearcher.base import BaseTool
-from openai import OpenAI
+from webresearcher.cache import get_page_cache, get_summary_memo
+from webresearcher.config import env_flag
+from webresearcher.llm_client import get_sync_client
+from webresearcher.rate_limiter import get_rate_limiter
 import time
-import tiktoken
-from webresearcher.prompt import EXTRACTOR_PROMPT
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from webresearcher.prompt import EXTRACTOR_PROMPT, EXTRACTOR_MERGE_PROMPT
+from webresearcher.token_counter import (
+    count_message_tokens, truncate_with_count, split_into_token_chunks
+)
 from webresearcher.log import logger
 
 
 VISIT_SERVER_TIMEOUT = int(os.getenv("VISIT_SERVER_TIMEOUT", 200))
 WEBCONTENT_MAXLENGTH = int(os.getenv("WEBCONTENT_MAXLENGTH", 150000))
+VISIT_MAX_WORKERS = int(os.getenv("VISIT_MAX_WORKERS", 5))
+VISIT_URL_TIMEOUT = int(os.getenv("VISIT_URL_TIMEOUT", 300))
+VISIT_BATCH_TIMEOUT = int(os.getenv("VISIT_BATCH_TIMEOUT", 900))
+# Pages up to this size are extracted in one summary call, as before map-reduce existed
+VISIT_SINGLE_SHOT_TOKENS = int(os.getenv("VISIT_SINGLE_SHOT_TOKENS", 95000))
+# Longer pages are extracted chunk by chunk in parallel (map) and merged (reduce)
+VISIT_MAP_REDUCE = env_flag("VISIT_MAP_REDUCE", True)
+VISIT_CHUNK_TOKENS = int(os.getenv("VISIT_CHUNK_TOKENS", 24000))
+VISIT_MAX_CHUNKS = int(os.getenv("VISIT_MAX_CHUNKS", 8))
+# Process-wide cap on concurrent chunk extractions, shared by all URLs and Visit calls
+VISIT_CHUNK_WORKERS = int(os.getenv("VISIT_CHUNK_WORKERS", 4))
 
 JINA_API_KEY = os.environ.get('JINA_API_KEY')
+NOT_MODIFIED = "[visit] Not modified."
 
+_chunk_pool: Optional[ThreadPoolExecutor] = None
+_chunk_pool_lock = threading.Lock()
+
+
+def get_chunk_pool() -> ThreadPoolExecutor:
+    """Shared pool for map-step chunk extractions, so nested URL x chunk fan-out stays bounded."""
+    global _chunk_pool
+    with _chunk_pool_lock:
+        if _chunk_pool is None:
+            _chunk_pool = ThreadPoolExecutor(max_workers=max(1, VISIT_CHUNK_WORKERS),
+                                             thread_name_prefix="visit-chunk")
+        return _chunk_pool
 
-def truncate_to_tokens(text: str, max_tokens: int = 95000) -> str:
-    encoding = tiktoken.get_encoding("cl100k_base")
-    
-    tokens = encoding.encode(text)
-    if len(tokens) <= max_tokens:
-        return text
-    
-    truncated_tokens = tokens[:max_tokens]
-    return encoding.decode(truncated_tokens)
 
 OSS_JSON_FORMAT = """# Response Formats
 ## visit_content
@@ -39,6 +61,7 @@ information to the goal."}}}}"""
 class Visit(BaseTool):
     # The `description` tells the agent the functionality of this tool.
     name = 'visit'
+    single_flight = True
     description = 'Visit webpage(s) and return the summary of the content.'
     # The `parameters` tell the agent what input parameters the tool has.
     parameters = {
@@ -70,40 +93,166 @@ class Visit(BaseTool):
         if isinstance(url, str):
             response = self.readpage_jina(url, goal)
         else:
-            response = []
             assert isinstance(url, List)
-            start_time = time.time()
-            for u in url: 
-                if time.time() - start_time > 900:
-                    cur_response = "The useful information in {url} for user goal {goal} as follows: \n\n".format(url=url, goal=goal)
-                    cur_response += "Evidence in page: \n" + "The provided webpage content could not be accessed. Please check the URL or file format." + "\n\n"
-                    cur_response += "Summary: \n" + "The webpage content could not be processed, and therefore, no information is available." + "\n\n"
-                else:
-                    try:
-                        cur_response = self.readpage_jina(u, goal)
-                    except Exception as e:
-                        cur_response = f"Error fetching {u}: {str(e)}"
-                response.append(cur_response)
-            response = "\n=======\n".join(response)
+            response = "\n=======\n".join(self.visit_urls(url, goal))
         response = response.strip()
         logger.debug(f'[Visit] url: {url},\nSummary Length: {len(response)};\nresponse: {response[:500]}...')
         return response
         
+    @staticmethod
+    def _failed_response(url: str, goal: str) -> str:
+        useful_information = "The useful information in {url} for user goal {goal} as follows: \n\n".format(url=url, goal=goal)
+        useful_information += "Evidence in page: \n" + "The provided webpage content could not be accessed. Please check the URL or file format." + "\n\n"
+        useful_information += "Summary: \n" + "The webpage content could not be processed, and therefore, no information is available." + "\n\n"
+        return useful_information
+
+    def visit_urls(self, urls: List[str], goal: str, max_workers: int = VISIT_MAX_WORKERS,
+                   url_timeout: float = VISIT_URL_TIMEOUT, timeout: float = VISIT_BATCH_TIMEOUT) -> List[str]:
+        """
+        Fetch and summarize several URLs concurrently.
+
+        Args:
+            urls: URLs to visit
+            goal: Goal of the visit
+            max_workers: Maximum number of pages processed at once
+            url_timeout: Deadline in seconds for a single URL, counted from when it starts
+            timeout: Deadline in seconds for the whole batch
+
+        Returns:
+            One response per URL, in input order. URLs that miss their deadline get
+            the standard "could not be accessed" response; finished pages are kept.
+        """
+        if not urls:
+            return []
+        start_time = time.time()
+        started_at = {}
+        lock = threading.Lock()
+
+        def _visit(idx: int, u: str) -> str:
+            with lock:
+                started_at[idx] = time.time()
+            return self.readpage_jina(u, goal)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+        try:
+            futures = {executor.submit(_visit, i, u): i for i, u in enumerate(urls)}
+            results = [None] * len(urls)
+            pending = set(futures)
+            while pending:
+                now = time.time()
+                if now - start_time > timeout:
+                    break
+                with lock:
+                    expired = {f for f in pending if futures[f] in started_at
+                               and now - started_at[futures[f]] > url_timeout}
+                for f in expired:
+                    logger.warning(f"[Visit] {urls[futures[f]]} exceeded per-URL timeout of {url_timeout}s")
+                    f.cancel()
+                pending -= expired
+                if not pending:
+                    break
+                poll = min(1.0, url_timeout, max(0.01, timeout - (now - start_time)))
+                done, pending = wait(pending, timeout=poll, return_when=FIRST_COMPLETED)
+                for f in done:
+                    idx = futures[f]
+                    try:
+                        results[idx] = f.result()
+                    except Exception as e:
+                        results[idx] = f"Error fetching {urls[idx]}: {str(e)}"
+            for f in pending:
+                f.cancel()
+            if pending:
+                logger.warning(f"[Visit] batch deadline of {timeout}s reached, {len(pending)} URL(s) unfinished")
+            return [r if r is not None else self._failed_response(u, goal) for u, r in zip(urls, results)]
+        finally:
+            # Don't block on stragglers; return partial results now
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def _parse_extraction(raw: str) -> Optional[Dict]:
+        """Parse a summary model response into an evidence/summary dict, or None."""
+        if not raw:
+            return None
+        raw = raw.replace("```json", "").replace("```", "").strip()
+        try:
+            parsed = json.loads(raw)
+        except Exception:
+            return None
+        if not isinstance(parsed, dict) or "evidence" not in parsed or "summary" not in parsed:
+            return None
+        return {"evidence": parsed["evidence"], "summary": parsed["summary"]}
+
+    def map_reduce_extract(self, url: str, goal: str, chunks: List[str], max_retries: int = 1) -> Optional[Dict]:
+        """
+        Goal-directed extraction over a long page without truncate-and-retry.
+
+        Map: every chunk is extracted concurrently with EXTRACTOR_PROMPT.
+        Reduce: partial extractions are merged in one EXTRACTOR_MERGE_PROMPT call; if that
+        fails, the partial evidence and summaries are concatenated in page order.
+
+        Args:
+            url: Page URL (for logging)
+            goal: The goal of the visit
+            chunks: Consecutive page chunks
+            max_retries: Retries per summary model call
+
+        Returns:
+            Dict with 'evidence' and 'summary', or None if no chunk could be extracted
+        """
+        def _extract(chunk: str) -> Optional[Dict]:
+            messages = [{"role": "user", "content": EXTRACTOR_PROMPT.format(webpage_content=chunk, goal=goal)}]
+            return self._parse_extraction(self.call_server(messages, max_retries=max_retries))
+
+        partials = [p for p in get_chunk_pool().map(_extract, chunks) if p is not None]
+        logger.debug(f"[visit] map-reduce url[{url}]: {len(partials)}/{len(chunks)} chunks extracted")
+        if not partials:
+            return None
+        if len(partials) == 1:
+            return partials[0]
+
+        partial_text = "\n\n".join(
+            f"### Chunk {i + 1}\n{json.dumps(p, ensure_ascii=False)}" for i, p in enumerate(partials)
+        )
+        messages = [{"role": "user", "content": EXTRACTOR_MERGE_PROMPT.format(
+            partial_extractions=partial_text, goal=goal)}]
+        merged = self._parse_extraction(self.call_server(messages, max_retries=max_retries))
+        if merged is not None:
+            return merged
+        logger.debug(f"[visit] merge step failed for url[{url}], concatenating partial extractions")
+        return {
+            "evidence": "\n\n".join(str(p["evidence"]) for p in partials),
+            "summary": " ".join(str(p["summary"]) for p in partials),
+        }
+
+    @staticmethod
+    def _summary_response(url: str, goal: str, raw: Dict) -> str:
+        useful_information = "The useful information in {url} for user goal {goal} as follows: \n\n".format(url=url, goal=goal)
+        useful_information += "Evidence in page: \n" + str(raw["evidence"]) + "\n\n"
+        useful_information += "Summary: \n" + str(raw["summary"]) + "\n\n"
+        return useful_information
+
+    @property
+    def summary_model(self) -> str:
+        return os.getenv("SUMMARY_MODEL_NAME", "gpt-4o-mini")
+
     def call_server(self, msgs, max_retries=2):
         api_key = os.getenv("OPENAI_API_KEY")
         url_llm = os.getenv("OPENAI_BASE_URL")
-        model_name = os.getenv("SUMMARY_MODEL_NAME", "gpt-4o-mini")
-        client = OpenAI(
+        model_name = self.summary_model
+        client = get_sync_client(
             api_key=api_key,
             base_url=url_llm,
         )
+        limiter = get_rate_limiter("llm", url_llm or "")
         for attempt in range(max_retries):
             try:
-                chat_response = client.chat.completions.create(
-                    model=model_name,
-                    messages=msgs,
-                    temperature=0.7
-                )
+                with limiter.slot(tokens=count_message_tokens(msgs, model_name, estimate=True)) as slot:
+                    chat_response = client.chat.completions.create(
+                        model=model_name,
+                        messages=msgs,
+                        temperature=0.7
+                    )
+                    slot.record_usage(chat_response)
                 content = chat_response.choices[0].message.content
                 if content:
                     try:
@@ -122,17 +271,21 @@ class Visit(BaseTool):
                 continue
 
 
-    def jina_readpage(self, url: str) -> str:
+    def jina_readpage(self, url: str, validators: Optional[Dict[str, str]] = None) -> str:
         """
         Read webpage content using Jina service.
         
         Args:
             url: The URL to read
-            goal: The goal/purpose of reading the page
+            validators: Optional ETag / Last-Modified of a cached copy for a conditional request
             
         Returns:
-            str: The webpage content or error message
+            str: The webpage content, NOT_MODIFIED if the cached copy is still valid, or error message
         """
+        content, _ = self._jina_fetch(url, validators)
+        return content
+
+    def _jina_fetch(self, url: str, validators: Optional[Dict[str, str]] = None) -> Tuple[str, Dict[str, str]]:
         max_retries = 3
         timeout = 50
         
@@ -140,33 +293,69 @@ class Visit(BaseTool):
             headers = {
                 "Authorization": f"Bearer {JINA_API_KEY}",
             }
+            if validators:
+                if validators.get("etag"):
+                    headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    headers["If-Modified-Since"] = validators["last_modified"]
             try:
-                response = requests.get(
-                    f"https://r.jina.ai/{url}",
-                    headers=headers,
-                    timeout=timeout
-                )
+                with get_rate_limiter("jina").slot() as slot:
+                    response = requests.get(
+                        f"https://r.jina.ai/{url}",
+                        headers=headers,
+                        timeout=timeout
+                    )
+                    slot.report(response.status_code, response.headers.get("Retry-After"))
+                if response.status_code == 304 and validators:
+                    return NOT_MODIFIED, validators
                 if response.status_code == 200:
                     webpage_content = response.text
-                    return webpage_content
+                    new_validators = {}
+                    if response.headers.get("ETag"):
+                        new_validators["etag"] = response.headers["ETag"]
+                    if response.headers.get("Last-Modified"):
+                        new_validators["last_modified"] = response.headers["Last-Modified"]
+                    return webpage_content, new_validators
                 else:
                     logger.debug(f"Jina API error response: {response.text}")
                     raise ValueError("jina readpage error")
             except Exception as e:
                 time.sleep(0.5)
                 if attempt == max_retries - 1:
-                    return "[visit] Failed to read page."
+                    return "[visit] Failed to read page.", {}
                 
-        return "[visit] Failed to read page."
+        return "[visit] Failed to read page.", {}
 
     def html_readpage_jina(self, url: str) -> str:
+        """
+        Read page content, served from the page cache when fresh.
+
+        Expired cache entries are revalidated with ETag / Last-Modified when the
+        service provides them, and used as a fallback if refetching fails.
+        """
+        cache = get_page_cache()
+        cached = cache.get(url) if cache is not None else None
+        if cached is not None and not cached.expired:
+            logger.debug(f"[visit] page cache hit: {url}")
+            return cached.value
+
+        validators = cached.meta if cached is not None else None
         max_attempts = 8
         for attempt in range(max_attempts):
-            content = self.jina_readpage(url)
+            content, new_validators = self._jina_fetch(url, validators)
             service = "jina"     
             logger.debug(f"Using service: {service}")
+            if content == NOT_MODIFIED:
+                logger.debug(f"[visit] page not modified, reusing cached copy: {url}")
+                cache.touch(url)
+                return cached.value
             if content and not content.startswith("[visit] Failed to read page.") and content != "[visit] Empty content." and not content.startswith("[document_parser]"):
+                if cache is not None:
+                    cache.put(url, content, new_validators)
                 return content
+        if cached is not None:
+            logger.warning(f"[visit] refetch failed, serving expired cached copy: {url}")
+            return cached.value
         return "[visit] Failed to read page."
 
     def readpage_jina(self, url: str, goal: str) -> str:
@@ -187,7 +376,35 @@ class Visit(BaseTool):
         content = self.html_readpage_jina(url)
 
         if content and not content.startswith("[visit] Failed to read page.") and content != "[visit] Empty content." and not content.startswith("[document_parser]"):
-            content = truncate_to_tokens(content, max_tokens=95000)
+            full_content = content
+            # Identical (page, goal, model) extractions are served from the memo
+            memo = get_summary_memo()
+            memo_key = None
+            if memo is not None:
+                memo_key = memo.make_key(content, goal, self.summary_model)
+                memoized = memo.get(memo_key)
+                if memoized is not None:
+                    logger.debug(f"[visit] summary memo hit: {url}")
+                    return self._summary_response(url, goal, memoized)
+
+            content, content_tokens = truncate_with_count(content, max_tokens=VISIT_SINGLE_SHOT_TOKENS)
+            if VISIT_MAP_REDUCE and len(content) < len(full_content):
+                # Over the single-shot limit: map-reduce the full page instead of truncating it
+                chunks, page_tokens = split_into_token_chunks(full_content, VISIT_CHUNK_TOKENS)
+                dropped = max(0, len(chunks) - VISIT_MAX_CHUNKS)
+                chunks = chunks[:VISIT_MAX_CHUNKS]
+                if dropped:
+                    logger.warning(f"[visit] url[{url}] has ~{page_tokens} tokens, only the first "
+                                   f"{len(chunks)} of {len(chunks) + dropped} chunks are extracted")
+                raw = self.map_reduce_extract(url, goal, chunks, max_retries=max_retries)
+                if raw is not None:
+                    if dropped:
+                        raw["summary"] = (f"{raw['summary']}\n[Note: the page was too long; only the first "
+                                          f"{len(chunks)} of {len(chunks) + dropped} parts were read.]")
+                    if memo_key is not None:
+                        memo.put(memo_key, raw, prompt_tokens=min(page_tokens, VISIT_CHUNK_TOKENS * len(chunks)))
+                    return self._summary_response(url, goal, raw)
+                logger.debug(f"[visit] map-reduce extraction failed for url[{url}], falling back to truncation")
             messages = [{"role":"user","content": EXTRACTOR_PROMPT.format(webpage_content=content, goal=goal)}]
             parse_retry_times = 0
             raw = summary_page_func(messages, max_retries=max_retries)
@@ -229,9 +446,11 @@ class Visit(BaseTool):
                 useful_information += "Evidence in page: \n" + "The provided webpage content could not be accessed. Please check the URL or file format." + "\n\n"
                 useful_information += "Summary: \n" + "The webpage content could not be processed, and therefore, no information is available." + "\n\n"
             else:
-                useful_information = "The useful information in {url} for user goal {goal} as follows: \n\n".format(url=url, goal=goal)
-                useful_information += "Evidence in page: \n" + str(raw["evidence"]) + "\n\n"
-                useful_information += "Summary: \n" + str(raw["summary"]) + "\n\n"
+                useful_information = self._summary_response(url, goal, raw)
+                # The memo key covers the whole page: don't store a summary of a truncated prefix
+                if memo_key is not None and content == full_content:
+                    memo.put(memo_key, {"evidence": raw["evidence"], "summary": raw["summary"]},
+                             prompt_tokens=content_tokens)
 
             if len(useful_information) < 10 and summary_retries < 0:
                 logger.debug("[visit] Could not generate valid summary after maximum retries")
@@ -9,7 +9,11 @@ It's an OPTIONAL inference enhancement that trades cost (3-5x tokens) for higher
 COST WARNING:
 - Running N parallel agents costs approximately N × single-agent cost
 - Synthesis step adds ~0.5x additional cost
-- Total cost: ~(N + 0.5)x of single-agent baseline
+- Total cost: ~(N + 0.5)x of single-agent baseline (upper bound)
+
+The parallel agents share read-only tool results (identical searches/visits run once,
+even when issued concurrently), and once a quorum of agents agrees on the normalized
+answer the stragglers are cancelled and synthesis is skipped.
 
 WHEN TO USE:
 Use for high-value scenarios:
@@ -28,11 +32,88 @@ For 95% of use cases, prefer the single WebResearcherAgent (agent.py).
 """
 
 import asyncio
-from typing import Dict, List, Optional
+import re
+import sqlite3
+import unicodedata
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
 
+from webresearcher.checkpoint import make_run_id
+from webresearcher.config import TTS_SHARED_TOOL_CACHE, TTS_CONSENSUS
 from webresearcher.log import logger
 from webresearcher.web_researcher_agent import WebResearcherAgent
 
+# Terminations whose prediction is an actual answer (and may count towards consensus);
+# the last two are ReactAgent's
+ANSWER_TERMINATIONS = ("answer found", "terminate with answer", "answer (forced)",
+                       "terminated with answer", "terminated with answer (forced)")
+
+
+def normalize_answer(text: str) -> str:
+    """
+    Normalize an answer for consensus voting: unwrap \\boxed{}, NFKC, lowercase, drop
+    punctuation and English articles, collapse whitespace.
+    """
+    text = re.sub(r"\\boxed\{(.*)\}", r"\1", str(text or ""), flags=re.DOTALL)
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"[\W_]+", " ", text)
+    text = re.sub(r"\b(a|an|the)\b", " ", text)
+    return " ".join(text.split())
+
+
+class SharedToolCache:
+    """
+    Tool results shared by concurrently running agents, keyed by normalized tool call.
+
+    A call that is already running is awaited instead of started again, so N agents
+    issuing the same search at the same time pay for it once. Failed calls (exceptions or
+    "Error..." observations) are not kept, so a later agent can retry them.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, asyncio.Future] = {}
+        self.stats = {"calls": 0, "executed": 0, "hits": 0, "inflight_hits": 0}
+
+    async def get_or_run(self, key: str, factory: Callable[[], Awaitable[str]]) -> str:
+        """
+        Return the result for key, running factory() only if no agent has run it yet.
+
+        Args:
+            key: Normalized tool call (stream_parser.tool_call_key)
+            factory: Starts the tool call
+
+        Returns:
+            Tool observation
+        """
+        self.stats["calls"] += 1
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["executed"] += 1
+            entry = asyncio.ensure_future(factory())
+            self._entries[key] = entry
+            entry.add_done_callback(lambda future: self._on_done(key, future))
+        elif entry.done():
+            self.stats["hits"] += 1
+        else:
+            self.stats["inflight_hits"] += 1
+        # shield: an agent cancelling its call (e.g. a dropped speculative call) must not
+        # cancel the call other agents are waiting for
+        return await asyncio.shield(entry)
+
+    def _on_done(self, key: str, future: asyncio.Future):
+        failed = future.cancelled() or future.exception() is not None or \
+            str(future.result()).startswith("Error")
+        if failed and self._entries.get(key) is future:
+            del self._entries[key]
+
+    def close(self):
+        """Cancel tool calls that are still running (their agents are gone)."""
+        for entry in self._entries.values():
+            entry.cancel()
+
+    def __len__(self):
+        return len(self._entries)
+
 
 class TestTimeScalingAgent:
     """
@@ -58,6 +139,11 @@ class TestTimeScalingAgent:
     def __init__(self, llm_config: Dict, function_list: List[str]):
         self.llm_config = llm_config
         self.function_list = function_list
+        self.shared_tool_cache = self.llm_config.get("tts_shared_tool_cache", TTS_SHARED_TOOL_CACHE)
+        self.consensus = self.llm_config.get("tts_consensus", TTS_CONSENSUS)
+        # Stats of the last run_parallel_research call
+        self.tool_cache_stats: Dict[str, int] = {}
+        self.consensus_answer: Optional[str] = None
 
     def estimate_cost(self, num_parallel_agents: int = 3) -> str:
         """
@@ -74,24 +160,42 @@ class TestTimeScalingAgent:
             f"TTS Cost Estimation:\n"
             f"   • Parallel research: {num_parallel_agents} agents × base cost\n"
             f"   • Synthesis: ~0.5× base cost\n"
-            f"   • Total: ~{total_cost:.1f}× of single-agent baseline\n"
+            f"   • Total: up to ~{total_cost:.1f}× of single-agent baseline "
+            f"(less with shared tool results and consensus cut-off)\n"
             f"   • Use only for high-value scenarios!"
         )
 
+    @staticmethod
+    def _drop_checkpoint(agent: WebResearcherAgent, question: str):
+        """Delete the checkpoint a cancelled agent left in status "running"."""
+        if agent.checkpoint_store is None:
+            return
+        run_id = make_run_id(question, agent.model, agent.llm_generate_cfg)
+        try:
+            agent.checkpoint_store.delete(run_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to delete checkpoint of cancelled run {run_id}: {e}")
+
     async def run_parallel_research(
         self, 
         question: str, 
-        num_parallel_agents: int = 3
+        num_parallel_agents: int = 3,
+        quorum: Optional[int] = None,
     ) -> List[Dict]:
         """
         Phase 1: Parallel Research with diverse exploration.
         
         Runs multiple IterResearch agents in parallel, each with different
         temperature settings to encourage diverse reasoning paths.
+
+        With consensus enabled, agents still running are cancelled as soon as `quorum`
+        finished agents gave the same normalized answer (self.consensus_answer is set).
+        Their checkpoints are deleted, so a later run does not resume them.
         
         Args:
             question: Research question
             num_parallel_agents: Number of parallel agents (default: 3)
+            quorum: Agreeing agents needed to stop early (default: a majority)
             
         Returns:
             List of research results from each agent
@@ -99,7 +203,10 @@ class TestTimeScalingAgent:
         logger.debug(f"Starting Parallel Research Phase ({num_parallel_agents} agents)")
         logger.warning(self.estimate_cost(num_parallel_agents))
 
-        tasks = []
+        tool_cache = SharedToolCache() if self.shared_tool_cache else None
+        quorum = quorum or num_parallel_agents // 2 + 1
+        self.consensus_answer = None
+        tasks, agents = [], []
         for i in range(num_parallel_agents):
             # Create a copy of config for each agent
             agent_llm_config = self.llm_config.copy()
@@ -113,20 +220,47 @@ class TestTimeScalingAgent:
             agent = WebResearcherAgent(
                 llm_config=agent_llm_config,
                 function_list=self.function_list,
+                tool_cache=tool_cache,
             )
             
             # Add to parallel tasks
-            tasks.append(agent.run(question))
+            agents.append(agent)
+            tasks.append(asyncio.ensure_future(agent.run(question)))
             logger.debug(
                 f"Agent {i+1}: temperature={agent_llm_config['generate_cfg']['temperature']:.2f}"
             )
 
-        # Execute all agents in parallel
-        parallel_results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Execute all agents in parallel; stop the stragglers once a quorum agrees
+        votes = Counter()
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                res = None if task.cancelled() or task.exception() else task.result()
+                if isinstance(res, dict) and res.get("termination") in ANSWER_TERMINATIONS:
+                    answer = normalize_answer(res.get("prediction", ""))
+                    if answer:
+                        votes[answer] += 1
+            if self.consensus and votes and votes.most_common(1)[0][1] >= quorum:
+                self.consensus_answer = votes.most_common(1)[0][0]
+                logger.debug(f"Consensus reached by {quorum} agents, cancelling {len(pending)} running agent(s)")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                break
+        if tool_cache is not None:
+            tool_cache.close()
+            self.tool_cache_stats = dict(tool_cache.stats)
+            logger.debug(f"Shared tool cache: {self.tool_cache_stats}")
 
         # Process results
         valid_results = []
-        for i, res in enumerate(parallel_results):
+        for i, task in enumerate(tasks):
+            if task.cancelled():
+                logger.debug(f"Agent {i+1} cancelled after consensus")
+                self._drop_checkpoint(agents[i], question)
+                continue
+            res = task.exception() or task.result()
             if isinstance(res, Exception):
                 logger.error(f"Agent {i+1} failed with exception: {res}")
             elif isinstance(res, dict):
@@ -256,14 +390,28 @@ class TestTimeScalingAgent:
         # Phase 1: Parallel Research
         parallel_results = await self.run_parallel_research(question, num_parallel_agents)
 
-        # Phase 2: Integrative Synthesis
-        synthesis_result = await self.run_synthesis(question, parallel_results)
+        # Phase 2: Integrative Synthesis (skipped when a quorum already agreed)
+        if self.consensus_answer is not None:
+            agreed = [res for res in parallel_results if res.get("termination") in ANSWER_TERMINATIONS
+                      and normalize_answer(res.get("prediction", "")) == self.consensus_answer]
+            synthesis_result = {
+                "final_answer": agreed[0]["prediction"].strip(),
+                "synthesis_reports": [
+                    {"agent": i + 1, "answer": res.get("prediction"), "report": res.get("report"),
+                     "termination": res.get("termination")}
+                    for i, res in enumerate(parallel_results)
+                ],
+            }
+        else:
+            synthesis_result = await self.run_synthesis(question, parallel_results)
 
         return {
             "question": question,
             "ground_truth": ground_truth,
             "final_synthesized_answer": synthesis_result["final_answer"],
             "parallel_runs": parallel_results,
-            "synthesis_inputs": synthesis_result["synthesis_reports"]
+            "synthesis_inputs": synthesis_result["synthesis_reports"],
+            "consensus": self.consensus_answer is not None,
+            "tool_cache": self.tool_cache_stats,
         }
 
@@ -8,19 +8,28 @@ import re
 import datetime
 import asyncio
 import random
+import sqlite3
 import time
 
-from typing import Dict, List, Optional
-from openai import OpenAI, APIError, APIConnectionError, APITimeoutError
+from typing import Callable, Dict, List, Optional, Tuple
 
-from webresearcher.base import Message, build_text_completion_prompt, count_tokens as count_tokens_base
+from webresearcher.checkpoint import (
+    CheckpointStore,
+    RESUMABLE_STATUSES,
+    STATUS_FINISHED,
+    STATUS_INTERRUPTED,
+    STATUS_RUNNING,
+    get_checkpoint_store,
+    make_run_id,
+)
+from webresearcher.token_counter import count_message_tokens, estimate_tokens
+from webresearcher.llm_client import get_async_client
+from webresearcher.rate_limiter import RateSlot, get_rate_limiter
 from webresearcher.log import logger
 from webresearcher.prompt import get_iterresearch_system_prompt
-from webresearcher.tool_file import FileParser
-from webresearcher.tool_scholar import Scholar
-from webresearcher.tool_python import PythonInterpreter
-from webresearcher.tool_search import Search
-from webresearcher.tool_visit import Visit
+from webresearcher.tool_executor import get_tool_executor
+from webresearcher.stream_parser import ActionStreamParser, tool_call_key
+from webresearcher.tool_registry import DEFAULT_TOOL_SPECS, LazyToolMap
 from webresearcher.config import (
     OPENAI_API_KEY, 
     OPENAI_BASE_URL, 
@@ -28,18 +37,20 @@ from webresearcher.config import (
     OBS_END, 
     MAX_LLM_CALL_PER_RUN, 
     AGENT_TIMEOUT, 
-    FILE_DIR
+    FILE_DIR,
+    LLM_STREAM,
+    SPECULATIVE_TOOL_CALLS,
+    MAX_TOOL_CALLS_PER_ROUND,
+    CHECKPOINT_ENABLED,
 )
 
 
-TOOL_CLASS = [
-    FileParser(),
-    Scholar(),
-    Visit(),
-    Search(),
-    PythonInterpreter(),
-]
-TOOL_MAP = {tool.name: tool for tool in TOOL_CLASS}
+# Tools are imported and constructed on first use
+TOOL_MAP = LazyToolMap(DEFAULT_TOOL_SPECS)
+# Read-only tools that may be started speculatively while the LLM is still streaming
+SPECULATIVE_TOOLS = {"search", "google_scholar", "visit", "parse_file"}
+# What call_server returns once all attempts failed
+LLM_SERVER_ERROR = "LLM server error."
 
 
 def today_date():
@@ -81,6 +92,22 @@ class ResearchRound:
             {"role": "user", "content": user_content}
         ]
 
+    def to_dict(self) -> Dict[str, str]:
+        """状态快照，用于 checkpoint 持久化"""
+        return {
+            "question": self.question,
+            "current_report": self.current_report,
+            "last_observation": self.last_observation,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "ResearchRound":
+        """从 checkpoint 快照恢复状态"""
+        research_round = cls(data["question"])
+        research_round.current_report = data.get("current_report", research_round.current_report)
+        research_round.last_observation = data.get("last_observation", research_round.last_observation)
+        return research_round
+
 
 class WebResearcherAgent:
     """
@@ -102,6 +129,8 @@ class WebResearcherAgent:
             instruction: str = "",
             api_key: Optional[str] = None,
             base_url: Optional[str] = None,
+            checkpoint_store: Optional[CheckpointStore] = None,
+            tool_cache=None,
     ):
         llm_config = dict(llm_config or {})
         if api_key:
@@ -117,8 +146,21 @@ class WebResearcherAgent:
         self.max_input_tokens = self.llm_config.get("max_input_tokens", 32000)
         self.llm_timeout = self.llm_config.get("llm_timeout", 300.0)
         self.agent_timeout = self.llm_config.get("agent_timeout", 600.0)
+        # Stream responses and stop generation once an action block is complete
+        self.stream = self.llm_config.get("stream", LLM_STREAM)
+        # Start read-only tools as soon as the streamed tool_call JSON is complete
+        self.speculative_tools = self.llm_config.get("speculative_tools", SPECULATIVE_TOOL_CALLS)
+        # Several independent tool calls per round run in parallel, each with its own timeout
+        self.max_tool_calls = max(1, int(self.llm_config.get("max_tool_calls_per_round", MAX_TOOL_CALLS_PER_ROUND)))
+        self.tool_timeouts = dict(self.llm_config.get("tool_timeouts", {}))
         self.function_list = function_list or list(TOOL_MAP.keys())
         self.instruction = instruction
+        # Persist the research state after every round so interrupted runs can resume
+        if checkpoint_store is None and self.llm_config.get("checkpoint", CHECKPOINT_ENABLED):
+            checkpoint_store = get_checkpoint_store()
+        self.checkpoint_store = checkpoint_store
+        # Read-only tool results shared with other agents (see tts_agent.SharedToolCache)
+        self.tool_cache = tool_cache
 
     def parse_output(self, text: str) -> Dict[str, str]:
         """
@@ -129,6 +171,7 @@ class WebResearcherAgent:
             "plan": "",
             "report": "",
             "tool_call": "",
+            "tool_calls": [],
             "answer": "",
             "terminate": False,
             "terminate_reason": "",
@@ -149,8 +192,12 @@ class WebResearcherAgent:
         # 2. 提取 <report>
         output["report"] = _extract_last_block(r"^\s*<report>(.*?)</report>")
 
-        # 3. 提取 <tool_call>、<answer>、<terminate>
-        output["tool_call"] = _extract_last_block(r"^\s*<tool_call>(.*?)</tool_call>")
+        # 3. 提取 <tool_call>（全部，按出现顺序；tool_call 保留最后一个）、<answer>、<terminate>
+        output["tool_calls"] = [
+            m.strip() for m in re.findall(r"^\s*<tool_call>(.*?)</tool_call>", text, flags=re.DOTALL | re.MULTILINE)
+            if m and m.strip()
+        ]
+        output["tool_call"] = output["tool_calls"][-1] if output["tool_calls"] else ""
         output["answer"] = _extract_last_block(r"^\s*<answer>(.*?)</answer>")
         term_body = _extract_last_block(r"^\s*<terminate>(.*?)</terminate>")
         if term_body != "":
@@ -162,17 +209,81 @@ class WebResearcherAgent:
 
         return output
 
+    async def _stream_completion(self, client, request_params: Dict,
+                                 on_block: Optional[Callable[[str, str], None]] = None,
+                                 slot: Optional[RateSlot] = None) -> Tuple[str, Optional[str]]:
+        """
+        Stream a completion, parsing <plan>/<report>/<tool_call>/... blocks as tokens arrive.
+
+        Generation is cancelled as soon as an action block (<tool_call>, <answer> or
+        <terminate>) is complete, and text after it is dropped.
+
+        Args:
+            client: AsyncOpenAI client
+            request_params: Chat completion parameters
+            on_block: Optional callback(tag, body), called when a block closes
+            slot: Rate limiter slot charged with the usage reported in the final chunk,
+                or with input + estimated completion tokens if the stream was cut short
+
+        Returns:
+            (content, reasoning_content)
+        """
+        parser = ActionStreamParser(max_tool_calls=self.max_tool_calls)
+        reasoning_parts = []
+        stream = await client.chat.completions.create(
+            **request_params, stream=True, stream_options={"include_usage": True})
+        try:
+            async for chunk in stream:
+                if slot is not None and getattr(chunk, "usage", None) is not None:
+                    slot.record_usage(chunk)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                reasoning = getattr(delta, "reasoning_content", None)
+                if reasoning:
+                    reasoning_parts.append(reasoning)
+                for tag, body in parser.feed(delta.content or ""):
+                    logger.debug(f"Streamed <{tag}> block complete ({len(body)} chars)")
+                    if on_block is not None:
+                        on_block(tag, body)
+                if parser.action_complete:
+                    logger.debug(f"<{parser.action}> complete, cancelling the rest of the generation")
+                    break
+        finally:
+            try:
+                await stream.close()
+            except Exception as e:
+                logger.debug(f"Failed to close LLM stream: {e}")
+        reasoning_content = "".join(reasoning_parts) or None
+        if slot is not None:
+            slot.record_tokens(slot.tokens + estimate_tokens(parser.content + (reasoning_content or "")))
+        return parser.content, reasoning_content
+
     async def call_server(self, msgs: List[Dict], stop_sequences: List[str] = None,
-                          max_tries: int = 1) -> str:
-        """异步方法，并使用 run_in_executor 处理同步的 OpenAI 库"""
-        client = OpenAI(
+                          max_tries: int = 1, on_block: Optional[Callable[[str, str], None]] = None) -> str:
+        """
+        异步方法，使用进程内共享的 AsyncOpenAI 客户端（连接池 + keep-alive）
+
+        Args:
+            msgs: Messages
+            stop_sequences: Stop sequences (default: <tool_response>)
+            max_tries: Maximum attempts
+            on_block: In streaming mode, callback(tag, body) called as soon as each block closes
+
+        Returns:
+            LLM response content
+        """
+        from openai import APIError, APIConnectionError, APITimeoutError
+
+        client = get_async_client(
             api_key=self.openai_api_key,
             base_url=self.openai_base_url,
             timeout=self.llm_timeout,
         )
+        # Shared per-endpoint rate limit + adaptive concurrency across all agents
+        limiter = get_rate_limiter("llm", self.openai_base_url or "")
 
         base_sleep_time = 1
-        loop = asyncio.get_event_loop()
 
         stop_sequences = stop_sequences or ["<tool_response>"]
 
@@ -193,17 +304,20 @@ class WebResearcherAgent:
                             "type": model_thinking_type,
                         }
                     }
-                # [关键] 使用 run_in_executor 在线程池中运行同步的 blocking I/O
-                chat_response = await loop.run_in_executor(
-                    None,  # 使用默认的 ThreadPoolExecutor
-                    lambda: client.chat.completions.create(**request_params)
-                )
-
-                content = chat_response.choices[0].message.content
-                reasoning_content = None
-                if hasattr(chat_response.choices[0].message, 'reasoning_content') and chat_response.choices[
-                    0].message.reasoning_content:
-                    reasoning_content = chat_response.choices[0].message.reasoning_content
+                # [关键] 原生异步请求，不占用线程池
+                async with limiter.aslot(tokens=count_message_tokens(msgs, self.model, estimate=True)) as slot:
+                    if self.stream:
+                        # 流式：边生成边解析，动作块完成即停止生成
+                        content, reasoning_content = await self._stream_completion(
+                            client, request_params, on_block, slot=slot)
+                    else:
+                        chat_response = await client.chat.completions.create(**request_params)
+                        slot.record_usage(chat_response)
+                        content = chat_response.choices[0].message.content
+                        reasoning_content = None
+                        if hasattr(chat_response.choices[0].message, 'reasoning_content') and chat_response.choices[
+                            0].message.reasoning_content:
+                            reasoning_content = chat_response.choices[0].message.reasoning_content
                 logger.debug(f"input messages: {msgs}, \nreasoning_content: {reasoning_content}, \nLLM Response: {content}")
                 if content and content.strip():
                     return content.strip()
@@ -223,72 +337,69 @@ class WebResearcherAgent:
                 await asyncio.sleep(sleep_time)  # [关键] 使用 await asyncio.sleep
             else:
                 logger.error("All retry attempts exhausted. The LLM call failed.")
-        return "LLM server error."
+        return LLM_SERVER_ERROR
 
-    def count_tokens(self, messages, model="gpt-4o"):
-        """Count tokens in messages"""
+    def count_tokens(self, messages, model="gpt-4o", estimate: bool = False):
+        """Count tokens in messages (per-message counts are cached, the system prompt is encoded once)"""
         try:
-            # Convert dict messages to Message objects if needed
-            full_message = []
-            for x in messages:
-                if isinstance(x, dict):
-                    full_message.append(Message(**x))
-                elif isinstance(x, Message):
-                    full_message.append(x)
-                else:
-                    full_message.append(x)
-
-            full_prompt = build_text_completion_prompt(full_message, allow_special=True)
-            return count_tokens_base(full_prompt, model)
+            return count_message_tokens(messages, model, estimate=estimate)
         except Exception as e:
             logger.warning(f"Failed to count tokens: {e}. Using simple split.")
             return sum(len(str(x).split()) for x in messages)
 
     async def custom_call_tool(self, tool_call_str: str) -> str:
         """async方法，并正确处理同步/异步工具"""
-        loop = asyncio.get_event_loop()
-
+        if self.tool_cache is not None and self._tool_call_name(tool_call_str) in SPECULATIVE_TOOLS:
+            return await self.tool_cache.get_or_run(
+                tool_call_key(tool_call_str), lambda: self._execute_tool_call(tool_call_str))
+        return await self._execute_tool_call(tool_call_str)
+
+    async def _execute_tool_call(self, tool_call_str: str) -> str:
+        # 解析、参数修正、分 lane 执行、单飞合并、超时都由共享的 ToolExecutor 处理
+        # 支持 JSON 调用和 <code>...</code> 代码块（python）
+        timeout = self.tool_timeouts.get(self._tool_call_name(tool_call_str))
+        return await get_tool_executor().execute(tool_call_str, TOOL_MAP, file_root_path=FILE_DIR, timeout=timeout)
+
+    @staticmethod
+    def _tool_call_name(tool_call_str: str) -> str:
+        """Tool name of a tool call body ("python" for bare <code> blocks)."""
         try:
-            # 1. 优先检查是否包含 <code> 标签（处理 Python 代码）
-            # 支持多种格式：
-            # - python\n<code>...</code>
-            # - <code>...</code>
-            # - {"name": "python", ...}\n<code>...</code>
-            if "<code>" in tool_call_str and "</code>" in tool_call_str:
-                code_raw = tool_call_str.split("<code>", 1)[1].rsplit("</code>", 1)[0].strip()
-                result = await loop.run_in_executor(None, TOOL_MAP['python'].call, code_raw)
-                return result
-
-            # 2. 处理 JSON 工具调用
-            tool_call = json5.loads(tool_call_str)
-            tool_name = tool_call.get('name', '')
-            tool_args = tool_call.get('arguments', {})
-
-            if tool_name not in TOOL_MAP:
-                return f"Error: Tool {tool_name} not found"
-
-            tool = TOOL_MAP[tool_name]
-
-            # 3. [关键] 区分同步和异步工具
-            if asyncio.iscoroutinefunction(tool.call):
-                # 如果工具本身是 async (例如 FileParser)
-                if tool_name == "parse_file":
-                    params = {"files": tool_args.get("files")}
-                    result = await tool.call(params, file_root_path=FILE_DIR)
-                else:
-                    result = await tool.call(tool_args)  # 假设其他 async 工具
-            else:
-                # 如果工具是 sync (例如 Search, Visit, Scholar)
-                # 在 executor 中运行
-                result = await loop.run_in_executor(None, tool.call, tool_args)
+            return json5.loads(tool_call_str).get("name", "") or "unknown"
+        except Exception:
+            return "python" if "<code>" in tool_call_str else "unknown"
 
-            return str(result) if not isinstance(result, str) else result
+    async def call_tools(self, tool_calls: List[str], started_tools: Optional[Dict[str, asyncio.Task]] = None) -> str:
+        """
+        Execute the tool calls of one round concurrently and merge their observations.
 
-        except Exception as e:
-            logger.error(f"Tool call parsing or execution failed: {e}")
-            return f"Error: Tool call failed. Input: {tool_call_str}. Error: {e}"
+        Args:
+            tool_calls: Tool call bodies, in the order the LLM issued them
+            started_tools: Calls already started from the stream, {tool_call_key: task}; reused and consumed
 
-    async def run(self, question):
+        Returns:
+            The observation; with several calls, one section per tool call
+        """
+        started_tools = started_tools if started_tools is not None else {}
+        unique_calls = list({tool_call_key(body): body for body in tool_calls}.items())
+
+        async def _run_one(key: str, body: str):
+            # Per-tool timeouts are applied by the tool executor, which reports them as observations
+            name = self._tool_call_name(body)
+            task = started_tools.pop(key, None) or asyncio.ensure_future(self.custom_call_tool(body))
+            try:
+                return name, await task
+            except Exception as e:
+                logger.error(f"Error calling tool '{name}': {e}")
+                return name, f"Error executing tool: {e}"
+
+        results = await asyncio.gather(*[_run_one(key, body) for key, body in unique_calls])
+        if len(results) == 1:
+            return str(results[0][1])
+        return "\n\n".join(
+            f"## Tool call {i}: {name}\n{observation}" for i, (name, observation) in enumerate(results, 1)
+        )
+
+    async def run(self, question, run_id: Optional[str] = None, resume: bool = True):
         """
         严格按照 IterResearch 范式执行研究（单 LLM 调用）。
         
@@ -302,12 +413,21 @@ class WebResearcherAgent:
             O_i = Tool(Action_i)
             s_{t+1} = (Q, R_i, O_i)
             LOOP
+
+        With a checkpoint store, the state is saved after every round and a run that was
+        interrupted (crash, timeout, LLM error) resumes from its last completed round.
+
+        Args:
+            question: Research question
+            run_id: Checkpoint id (default: derived from question, model and generate_cfg)
+            resume: Continue from an unfinished checkpoint of this run_id; if False, start over
         """
         start_time = time.time()
 
         # 1. 初始化研究轮次
         research_round = ResearchRound(question=question)
-        system_prompt = get_iterresearch_system_prompt(today_date(), self.function_list, self.instruction)
+        system_prompt = get_iterresearch_system_prompt(today_date(), self.function_list, self.instruction,
+                                                       max_tool_calls=self.max_tool_calls)
 
         # 完整轨迹日志（用于调试）
         full_trajectory_log = []
@@ -317,6 +437,63 @@ class WebResearcherAgent:
         num_llm_calls_available = MAX_LLM_CALL_PER_RUN
         round_num = 0
 
+        # 从 checkpoint 恢复 (Q, R, O)、轮次、剩余 LLM 调用预算和轨迹
+        store = self.checkpoint_store
+        run_id = run_id or make_run_id(question, self.model, self.llm_generate_cfg)
+        checkpoint = store.load(run_id) if store is not None else None
+        if checkpoint is not None:
+            state = checkpoint["state"]
+            if resume and checkpoint["status"] in RESUMABLE_STATUSES \
+                    and state["research_round"]["question"] == question:
+                research_round = ResearchRound.from_dict(state["research_round"])
+                round_num = state["round_num"]
+                num_llm_calls_available = state["num_llm_calls_available"]
+                full_trajectory_log = checkpoint["trajectory"]
+                # 已用时间计入 agent_timeout，反复中断的运行不会每次获得完整的时间预算
+                start_time -= state.get("elapsed_seconds", 0.0)
+                logger.info(f"Resuming run {run_id} after round {round_num}, "
+                            f"{num_llm_calls_available} LLM calls left, "
+                            f"{time.time() - start_time:.0f}s of {self.agent_timeout:.0f}s used.")
+            else:
+                store.delete(run_id)
+
+        def _round_state() -> Dict:
+            return {
+                "research_round": research_round.to_dict(),
+                "round_num": round_num,
+                "num_llm_calls_available": num_llm_calls_available,
+            }
+
+        saved_messages = len(full_trajectory_log)
+        # 最近一个完整轮次结束时的状态
+        round_state = _round_state()
+        # LLM 服务不可用（重试耗尽）的运行记为中断，可恢复
+        llm_unavailable = False
+
+        async def _call_llm(msgs: List[Dict], **kwargs) -> str:
+            nonlocal llm_unavailable
+            response = await self.call_server(msgs, **kwargs)
+            if response == LLM_SERVER_ERROR:
+                llm_unavailable = True
+            return response
+
+        def _checkpoint(status: str = STATUS_RUNNING, **extra):
+            nonlocal saved_messages, round_state
+            if store is None:
+                return
+            if status == STATUS_INTERRUPTED:
+                # 中断的轮次不计入：恢复后从上一个完整轮次重新开始
+                state, new_messages = round_state, []
+            else:
+                state = round_state = _round_state()
+                new_messages = full_trajectory_log[saved_messages:]
+            try:
+                store.save(run_id, dict(state, elapsed_seconds=time.time() - start_time, **extra),
+                           new_messages, status)
+                saved_messages += len(new_messages)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to save checkpoint for run {run_id}: {e}")
+
         while num_llm_calls_available > 0:
             if time.time() - start_time > self.agent_timeout:
                 logger.warning("Agent timeout reached.")
@@ -335,6 +512,10 @@ class WebResearcherAgent:
 
             # 3. 单次 LLM 调用 (生成 P_i, R_i, A_i)
             content = ''
+            # 流式模式下提前启动的工具调用: {tool_call_key(body): task}
+            # - 只读工具: tool_call 的 JSON 一完整就投机执行（与剩余生成并行）
+            # - 其他工具: </tool_call> 出现时执行
+            started_tools: Dict[str, asyncio.Task] = {}
             try:
                 logger.debug(f"Round {round_num}: Calling LLM. Remaining calls: {num_llm_calls_available}")
 
@@ -351,7 +532,20 @@ class WebResearcherAgent:
                 else:
                     request_msgs = current_context
 
-                content = await self.call_server(request_msgs)
+                def _on_block(tag: str, body: str):
+                    if is_last_call or not body or tag not in ("tool_call", "tool_call_ready"):
+                        return
+                    if tag == "tool_call_ready" and not (
+                            self.speculative_tools and json5.loads(body).get("name") in SPECULATIVE_TOOLS):
+                        return
+                    key = tool_call_key(body)
+                    if key not in started_tools:
+                        logger.debug(f"Round {round_num}: starting tool from stream ({tag}).")
+                        started_tools[key] = asyncio.ensure_future(self.custom_call_tool(body))
+
+                content = await _call_llm(request_msgs, on_block=_on_block)
+                if llm_unavailable:
+                    raise RuntimeError("LLM server unavailable, all retry attempts failed")
 
                 full_trajectory_log.append({"role": "assistant", "content": content})
                 logger.debug(f'Round {round_num} LLM response received.')
@@ -359,6 +553,8 @@ class WebResearcherAgent:
                 logger.error(f"Unknown Error: {e}")
                 prediction = f"Error: Unknown {e}"
                 termination = 'unknown error'
+                for task in started_tools.values():
+                    task.cancel()
                 break
 
             # 4. 解析 LLM 的结构化输出 (P_i, R_i, A_i / Answer_i)
@@ -366,6 +562,8 @@ class WebResearcherAgent:
             plan_content = parsed["plan"]
             report_content = parsed["report"]
             action_content = parsed["tool_call"]
+            # 本轮的全部工具调用（可多个，并行执行）
+            tool_calls = parsed["tool_calls"][-self.max_tool_calls:]
             answer_content = parsed["answer"]
             terminate_flag = parsed.get("terminate", False)
             terminate_reason = parsed.get("terminate_reason", "").strip()
@@ -377,6 +575,13 @@ class WebResearcherAgent:
             if terminate_flag:
                 logger.debug(f"Round {round_num} - Terminate signaled. Reason: {terminate_reason}")
 
+            # 丢弃与最终解析结果不一致的提前启动的工具调用（取消会经 single-flight 传到工具本身）
+            action_keys = {tool_call_key(body) for body in tool_calls}
+            for key in list(started_tools):
+                if key not in action_keys or answer_content or terminate_flag:
+                    logger.debug(f"Round {round_num}: final parse disagrees with a started tool call, cancelling it.")
+                    started_tools.pop(key).cancel()
+
             # 5. 状态更新 (s_t -> s_{t+1})
 
             # 5.1 更新报告 (R_i)
@@ -413,10 +618,10 @@ class WebResearcherAgent:
                 break
 
             # 5.3 执行 Action (A_i)
-            if action_content:
+            if tool_calls:
                 try:
-                    logger.debug(f"Round {round_num}: Executing tool...")
-                    tool_response_str = await self.custom_call_tool(action_content)
+                    logger.debug(f"Round {round_num}: Executing {len(tool_calls)} tool call(s)...")
+                    tool_response_str = await self.call_tools(tool_calls, started_tools)
 
                     # 将工具响应 O_i 存储，用于下一轮 s_{t+1}
                     research_round.last_observation = tool_response_str
@@ -447,7 +652,7 @@ class WebResearcherAgent:
                 ]
 
                 try:
-                    forced_content = await self.call_server(force_answer_msgs)
+                    forced_content = await _call_llm(force_answer_msgs)
                     forced_parsed = self.parse_output(forced_content)
 
                     if forced_parsed["answer"]:
@@ -478,13 +683,16 @@ class WebResearcherAgent:
                                                 "provide the final answer in the three-part format: "
                                                 "<plan>...</plan> <report>...</report> <answer>...</answer>"}
                 ]
-                content = await self.call_server(force_answer_msgs)
+                content = await _call_llm(force_answer_msgs)
                 parsed = self.parse_output(content)
                 prediction = parsed["answer"] if parsed["answer"] else "No answer found (token limit)."
                 termination = 'token limit reached'
                 full_trajectory_log.append({"role": "assistant", "content": content})
                 break
 
+            # 5.5 保存本轮状态 s_{t+1}
+            _checkpoint()
+
         # 循环结束后的收尾
         if not prediction:
             fallback_report = research_round.current_report.strip()
@@ -507,6 +715,12 @@ class WebResearcherAgent:
             "termination": termination,
             "trajectory": full_trajectory_log,
         }
+        if store is not None:
+            # 超时或 LLM 调用失败的运行可以恢复；其他终止状态视为完成
+            interrupted = llm_unavailable or termination in ("timeout", "unknown error")
+            status = STATUS_INTERRUPTED if interrupted else STATUS_FINISHED
+            _checkpoint(status, prediction=prediction, termination=termination)
+            result["run_id"] = run_id
         return result
 
 
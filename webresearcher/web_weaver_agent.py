@@ -9,21 +9,28 @@ import re
 import datetime
 import asyncio
 import random
+import shutil
+import tempfile
 import time
 import json
 
-from typing import Dict, List, Optional, Set
-from openai import OpenAI, APIError, APIConnectionError, APITimeoutError
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from webresearcher.base import Message, BaseTool
+from webresearcher.llm_client import get_async_client
+from webresearcher.token_counter import count_message_tokens, truncate_to_tokens
+from webresearcher.rate_limiter import get_rate_limiter
+from webresearcher.tool_executor import get_tool_executor, parse_tool_call
 from webresearcher.log import logger
-from webresearcher.prompt import get_webweaver_planner_prompt, get_webweaver_writer_prompt
+from webresearcher.report_digest import RollingReport
+from webresearcher.outline import OutlineSection, parse_outline_sections, section_keys, section_signature
+from webresearcher.prompt import (
+    get_webweaver_planner_prompt,
+    get_webweaver_writer_prompt,
+    get_webweaver_section_writer_prompt,
+)
 from webresearcher.tool_memory import MemoryBank, RetrieveTool
-from webresearcher.tool_planner_search import PlannerSearchTool
-from webresearcher.tool_planner_scholar import PlannerScholarTool
-from webresearcher.tool_planner_visit import PlannerVisitTool
-from webresearcher.tool_planner_python import PlannerPythonTool
-from webresearcher.tool_planner_file import PlannerFileTool
+from webresearcher.tool_registry import LazyToolMap, lazy_tool
 from webresearcher.config import (
     OPENAI_API_KEY, 
     OPENAI_BASE_URL, 
@@ -31,7 +38,13 @@ from webresearcher.config import (
     OBS_END, 
     MAX_LLM_CALL_PER_RUN, 
     AGENT_TIMEOUT, 
-    FILE_DIR
+    FILE_DIR,
+    MEMORY_BANK_DIR,
+    WRITER_PARALLEL_SECTIONS,
+    WRITER_ROLLING_DIGEST,
+    WRITER_SECTION_CONCURRENCY,
+    WEBWEAVER_PIPELINE,
+    PIPELINE_STABLE_STEPS,
 )
 
 
@@ -62,11 +75,6 @@ class BaseWebWeaverAgent:
         self.function_list = list(tool_map.keys())
         self.openai_api_key = self.llm_config.get("openai_api_key", OPENAI_API_KEY)
         self.openai_base_url = self.llm_config.get("openai_base_url", OPENAI_BASE_URL)
-        self.client = OpenAI(
-            api_key=self.openai_api_key,
-            base_url=self.openai_base_url,
-            timeout=self.llm_timeout,
-        )
         # Cache for idempotent tool calls to avoid redundant executions (e.g., repeated retrieve on same IDs)
         # Tools listed here will be cached by (tool_name, normalized_args)
         self.cacheable_tools = set(llm_config.get("cacheable_tools", ["retrieve"]))
@@ -85,8 +93,16 @@ class BaseWebWeaverAgent:
         Returns:
             LLM response content
         """
+        from openai import APIError, APIConnectionError, APITimeoutError
+
+        client = get_async_client(
+            api_key=self.openai_api_key,
+            base_url=self.openai_base_url,
+            timeout=self.llm_timeout,
+        )
+        # Shared per-endpoint rate limit + adaptive concurrency across all agents
+        limiter = get_rate_limiter("llm", self.openai_base_url or "")
         base_sleep_time = 1
-        loop = asyncio.get_event_loop()
         stop_sequences = stop_sequences or [OBS_START]
 
         for attempt in range(max_tries):
@@ -106,11 +122,10 @@ class BaseWebWeaverAgent:
                         }
                     }
                 
-                # Run in executor to handle sync OpenAI client
-                chat_response = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.chat.completions.create(**request_params)
-                )
+                # Native async call over the shared pooled client
+                async with limiter.aslot(tokens=count_message_tokens(msgs, self.model, estimate=True)) as slot:
+                    chat_response = await client.chat.completions.create(**request_params)
+                    slot.record_usage(chat_response)
                 
                 content = chat_response.choices[0].message.content
                 reasoning_content = None
@@ -149,27 +164,16 @@ class BaseWebWeaverAgent:
         Returns:
             Tool execution result
         """
-        loop = asyncio.get_event_loop()
-        
         try:
-            tool_call = json5.loads(tool_call_str)
-            tool_name = tool_call.get('name')
-            tool_args = tool_call.get('arguments', {})
+            # Parses JSON (or a <code> block) and auto-fixes common LLM mistakes, e.g. a
+            # string instead of an array for query/url/files
+            tool_name, tool_args = parse_tool_call(tool_call_str)
+            if not isinstance(tool_args, dict):
+                tool_args = {"code": tool_args}
 
             if tool_name not in self.tool_map:
                 return f"Error: Tool '{tool_name}' not found in agent's tool map."
 
-            # Auto-fix common LLM mistakes: convert string to array for query/url/files parameters
-            if tool_name in ['search', 'google_scholar'] and 'query' in tool_args:
-                if isinstance(tool_args['query'], str):
-                    tool_args['query'] = [tool_args['query']]
-            elif tool_name == 'visit' and 'url' in tool_args:
-                if isinstance(tool_args['url'], str):
-                    tool_args['url'] = [tool_args['url']]
-            elif tool_name == 'parse_file' and 'files' in tool_args:
-                if isinstance(tool_args['files'], str):
-                    tool_args['files'] = [tool_args['files']]
-
             # Cache check for idempotent tools (e.g., 'retrieve')
             cache_key = None
             if tool_name in self.cacheable_tools:
@@ -183,13 +187,8 @@ class BaseWebWeaverAgent:
                     # Fallback: if normalization fails, proceed without cache
                     cache_key = None
 
-            tool = self.tool_map[tool_name]
-
-            # Handle async vs sync tools
-            if asyncio.iscoroutinefunction(tool.call):
-                result = await tool.call(tool_args)
-            else:
-                result = await loop.run_in_executor(None, tool.call, tool_args)
+            # Lane, per-tool cap, timeout and single-flight are handled by the shared ToolExecutor
+            result = await get_tool_executor().run(self.tool_map[tool_name], tool_name, tool_args)
 
             result_str = str(result) if not isinstance(result, str) else result
 
@@ -199,6 +198,9 @@ class BaseWebWeaverAgent:
 
             return result_str
 
+        except asyncio.TimeoutError:
+            logger.warning(f"Tool call timed out: {tool_call_str}")
+            return f"Error: Tool call timed out. Input: {tool_call_str}."
         except Exception as e:
             logger.error(f"Tool call failed: {e}")
             return f"Error: Tool call failed. Input: {tool_call_str}. Error: {e}"
@@ -222,15 +224,17 @@ class WebWeaverPlanner(BaseWebWeaverAgent):
             llm_config: LLM configuration
             memory_bank: Shared MemoryBank instance
         """
-        # Planner's tool set - all 5 common tools like WebResearcher
-        full_tool_map = {
-            "search": PlannerSearchTool(memory_bank),
-            "google_scholar": PlannerScholarTool(memory_bank),
-            "visit": PlannerVisitTool(memory_bank),
-            "python": PlannerPythonTool(memory_bank),
-            "parse_file": PlannerFileTool(memory_bank),
+        # Planner's tool set - all 5 common tools like WebResearcher, built on first use
+        full_tool_specs = {
+            "search": lazy_tool("webresearcher.tool_planner_search:PlannerSearchTool", memory_bank),
+            "google_scholar": lazy_tool("webresearcher.tool_planner_scholar:PlannerScholarTool", memory_bank),
+            "visit": lazy_tool("webresearcher.tool_planner_visit:PlannerVisitTool", memory_bank),
+            "python": lazy_tool("webresearcher.tool_planner_python:PlannerPythonTool", memory_bank),
+            "parse_file": lazy_tool("webresearcher.tool_planner_file:PlannerFileTool", memory_bank),
         }
-        tool_map = {k: v for k, v in full_tool_map.items() if not function_list or k in function_list} or full_tool_map
+        tool_specs = {k: v for k, v in full_tool_specs.items() if not function_list or k in function_list} \
+            or full_tool_specs
+        tool_map = LazyToolMap(tool_specs)
 
         super().__init__(llm_config, tool_map)
         self.memory_bank = memory_bank
@@ -275,12 +279,13 @@ class WebWeaverPlanner(BaseWebWeaverAgent):
             "action_content": action_content
         }
 
-    async def run(self, question: str) -> str:
+    async def run(self, question: str, on_step: Optional[Callable[[int, str], None]] = None) -> str:
         """
         Execute Planner's research loop.
         
         Args:
             question: Research question
+            on_step: Optional callback(step, current_outline), called after every step
             
         Returns:
             Final outline string
@@ -338,6 +343,9 @@ class WebWeaverPlanner(BaseWebWeaverAgent):
                 last_observation = parsed['action_content']
                 logger.warning(f"Planner Step {i + 1}: Action parse error.")
 
+            if on_step is not None:
+                on_step(i + 1, current_outline)
+
         logger.warning("Planner reached max iterations.")
         return current_outline
 
@@ -367,7 +375,18 @@ class WebWeaverWriter(BaseWebWeaverAgent):
 
         super().__init__(llm_config, tool_map)
         self.memory_bank = memory_bank
-        self.system_prompt = get_webweaver_writer_prompt(today_date(), instruction)
+        # Sequential mode: earlier sections are shown as a digest, only the last one in full
+        self.rolling_digest = bool(self.llm_config.get("rolling_digest", WRITER_ROLLING_DIGEST))
+        self.system_prompt = get_webweaver_writer_prompt(today_date(), instruction, self.rolling_digest)
+        self.section_system_prompt = get_webweaver_section_writer_prompt(today_date(), instruction)
+        # Parallel mode: one LLM call per top-level outline section, sections written concurrently
+        self.parallel_sections = self.llm_config.get("parallel_sections", WRITER_PARALLEL_SECTIONS)
+        self.section_concurrency = max(1, int(self.llm_config.get("section_concurrency", WRITER_SECTION_CONCURRENCY)))
+        # Evidence budget per section, and extra query hits beyond the outline's citations
+        self.section_evidence_tokens = int(self.llm_config.get("section_evidence_tokens", 20000))
+        self.section_query_top_k = int(self.llm_config.get("section_query_top_k", 3))
+        self.digest_tokens = int(self.llm_config.get("writer_digest_tokens", 120))
+        self.digest_budget = int(self.llm_config.get("writer_digest_budget", 1500))
 
     def parse_output(self, text: str) -> Dict[str, str]:
         """
@@ -408,9 +427,123 @@ class WebWeaverWriter(BaseWebWeaverAgent):
             "action_content": action_content
         }
 
+    def section_evidence(self, section: OutlineSection) -> str:
+        """
+        Evidence for one outline section: its cited IDs plus the top query hits for its
+        outline text, truncated to the section evidence budget.
+        """
+        parts = []
+        if section.citation_ids:
+            parts.append(self.memory_bank.retrieve(section.citation_ids))
+        if self.section_query_top_k > 0:
+            hits = self.memory_bank.search(section.text, self.section_query_top_k, exclude_ids=section.citation_ids)
+            if hits:
+                parts.append(self.memory_bank.retrieve([cid for cid, _ in hits]))
+        evidence = "\n\n".join(parts) or "No evidence available for this section."
+        return truncate_to_tokens(evidence, self.section_evidence_tokens)
+
+    async def write_section(self, question: str, final_outline: str, sections: List[OutlineSection],
+                            index: int) -> str:
+        """
+        Write one outline section in a single LLM call.
+
+        Args:
+            question: Research question
+            final_outline: Final outline from Planner
+            sections: All top-level sections of the outline
+            index: Index of the section to write
+
+        Returns:
+            Section text, or "" if the LLM call failed
+        """
+        section = sections[index]
+        neighbours = []
+        if index > 0:
+            neighbours.append(f"Previous section: {sections[index - 1].title}")
+        if index + 1 < len(sections):
+            neighbours.append(f"Next section: {sections[index + 1].title}")
+        context_str = (
+            f"[Question]\n{question}\n\n"
+            f"[Final Outline]\n{final_outline}\n\n"
+            f"[Neighbouring Sections]\n{chr(10).join(neighbours) or 'None'}\n\n"
+            f"[Section To Write]\n{section.text}\n\n"
+            f"[Retrieved Evidence]\n{self.section_evidence(section)}\n\n"
+            f"**CRITICAL LANGUAGE REQUIREMENT: The section you write using <write> MUST be "
+            f"in the SAME LANGUAGE as the [Question] and [Final Outline] above.**"
+        )
+        messages = [
+            {"role": "system", "content": self.section_system_prompt},
+            {"role": "user", "content": context_str}
+        ]
+        response_content = await self.call_server(messages, max_tries=2)
+        parsed = self.parse_output(response_content)
+        if parsed['action_type'] == "write":
+            return parsed['action_content']
+        if response_content.startswith("Error: LLM server failed"):
+            return ""
+        # No <write> tag: keep the prose without the plan
+        return re.sub(r"<plan>.*?</plan>", "", response_content, flags=re.DOTALL).strip()
+
+    async def write_sections(self, question: str, final_outline: str, sections: List[OutlineSection],
+                             indices: Optional[List[int]] = None) -> List[str]:
+        """
+        Write outline sections concurrently, at most section_concurrency at a time.
+
+        Args:
+            question: Research question
+            final_outline: Final outline from Planner
+            sections: Top-level sections of the outline
+            indices: Sections to write (default: all)
+
+        Returns:
+            Section texts in the order of `indices` ("" for failed sections)
+        """
+        semaphore = asyncio.Semaphore(self.section_concurrency)
+
+        async def _write(index: int) -> str:
+            async with semaphore:
+                try:
+                    return await self.write_section(question, final_outline, sections, index)
+                except Exception as e:
+                    logger.error(f"Writing section '{sections[index].title}' failed: {e}")
+                    return ""
+
+        indices = list(range(len(sections))) if indices is None else indices
+        return list(await asyncio.gather(*[_write(i) for i in indices]))
+
+    async def write_sections_parallel(self, question: str, final_outline: str,
+                                      sections: List[OutlineSection]) -> str:
+        """
+        Write all outline sections concurrently and stitch them together in outline order.
+
+        Args:
+            question: Research question
+            final_outline: Final outline from Planner
+            sections: Top-level sections of the outline
+
+        Returns:
+            Report string, or "" if no section could be written
+        """
+        texts = await self.write_sections(question, final_outline, sections)
+        failed = [section.title for section, text in zip(sections, texts) if not text]
+        if len(failed) == len(sections):
+            return ""
+        if failed:
+            logger.warning(f"Writer: {len(failed)} section(s) could not be written: {failed}")
+        return self.stitch_sections(texts)
+
+    @staticmethod
+    def stitch_sections(texts: List[str]) -> str:
+        """Assemble section texts into the report, in outline order."""
+        return "\n\n".join(text.strip() for text in texts if text and text.strip())
+
     async def run(self, question: str, final_outline: str) -> str:
         """
         Execute Writer's writing loop.
+
+        In parallel mode, an outline with at least two top-level sections is written one
+        section per LLM call, all sections concurrently; otherwise (or if that fails) the
+        report is written by the sequential retrieve/write loop.
         
         Args:
             question: Research question
@@ -421,7 +554,17 @@ class WebWeaverWriter(BaseWebWeaverAgent):
         """
         logger.debug("--- [WebWeaver] Writer Agent activated ---")
 
-        report_written_so_far = ""
+        if self.parallel_sections:
+            _, sections = parse_outline_sections(final_outline)
+            if len(sections) >= 2:
+                logger.debug(f"Writer: writing {len(sections)} sections in parallel "
+                             f"(concurrency={self.section_concurrency})")
+                report = await self.write_sections_parallel(question, final_outline, sections)
+                if report:
+                    return report
+                logger.warning("Parallel section writing failed, falling back to sequential writing.")
+
+        report = RollingReport(self.digest_tokens, self.digest_budget)
         last_observation = "No observation yet. Start by retrieving evidence for the first section."
         # Track retrieve calls to avoid redundant tool executions for identical arguments
         seen_retrieve_keys: Set[str] = set()
@@ -435,7 +578,7 @@ class WebWeaverWriter(BaseWebWeaverAgent):
             context_str = (
                 f"[Question]\n{question}\n\n"
                 f"[Final Outline]\n{final_outline}\n\n"
-                f"[Report Written So Far]\n{report_written_so_far}\n\n"
+                f"[Report Written So Far]\n{report.context() if self.rolling_digest else report.full_text()}\n\n"
                 f"[Last Observation]\n{last_observation}\n\n"
                 f"**CRITICAL LANGUAGE REQUIREMENT: The report you write using <write> MUST be "
                 f"in the SAME LANGUAGE as the [Question] and [Final Outline] above. "
@@ -464,12 +607,15 @@ class WebWeaverWriter(BaseWebWeaverAgent):
             # Execute action
             if parsed['action_type'] == "terminate":
                 logger.debug("Writer finished. Terminating.")
-                return report_written_so_far
+                return report.full_text()
 
             elif parsed['action_type'] == "write":
                 section_prose = parsed['action_content']
-                report_written_so_far += "\n\n" + section_prose
-                last_observation = f"Section written successfully:\n{section_prose}\n"
+                report.add(section_prose)
+                if self.rolling_digest:
+                    last_observation = "Section written successfully (see the last written section above)."
+                else:
+                    last_observation = f"Section written successfully:\n{section_prose}\n"
                 logger.debug(f"Writer Step {i + 1}: Section written.")
                 steps_since_last_write = 0
 
@@ -536,7 +682,168 @@ class WebWeaverWriter(BaseWebWeaverAgent):
                 )
 
         logger.warning("Writer reached max iterations.")
-        return report_written_so_far
+        return report.full_text()
+
+
+class SectionPipeline:
+    """
+    Drafts outline sections while the Planner is still running.
+
+    After every Planner step the current outline is observed. A section whose text and
+    citations have been unchanged for `stable_steps` steps is frozen and put on an async
+    queue; Writer workers draft queued sections concurrently with planning. If the
+    Planner later edits a frozen section, its draft is invalidated (cancelled if still
+    being written) and the section is queued again once it is stable.
+
+    Usage:
+        pipeline = SectionPipeline(writer, question)
+        pipeline.start()
+        outline = await planner.run(question, on_step=pipeline.observe)
+        report = await pipeline.finish(outline)  # "" if the outline has < 2 sections
+    """
+
+    def __init__(self, writer: "WebWeaverWriter", question: str, stable_steps: int = 3, concurrency: int = 2):
+        """
+        Initialize section pipeline.
+
+        Args:
+            writer: Writer whose write_section drafts the sections
+            question: Research question
+            stable_steps: Planner steps a section must stay unchanged before it is drafted
+            concurrency: Number of draft workers
+        """
+        self.writer = writer
+        self.question = question
+        self.stable_steps = max(1, stable_steps)
+        self.concurrency = max(1, concurrency)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        # key -> (signature, title, text) of finished drafts
+        self.drafts: Dict[str, Tuple[str, str, str]] = {}
+        # key -> signature of sections queued or being drafted
+        self.pending: Dict[str, str] = {}
+        # key -> (signature, step at which this signature first appeared)
+        self._seen: Dict[str, Tuple[str, int]] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._workers: List[asyncio.Task] = []
+        self.stats = {"drafted": 0, "invalidated": 0, "reused": 0, "written_after_planning": 0}
+
+    def start(self):
+        """Start the draft workers (call from within the event loop)."""
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.concurrency)]
+
+    def _invalidate(self, key: str):
+        if self.drafts.pop(key, None) is not None:
+            self.stats["invalidated"] += 1
+        if self.pending.pop(key, None) is not None:
+            task = self._running.get(key)
+            if task is not None:
+                task.cancel()
+                self.stats["invalidated"] += 1
+
+    def observe(self, step: int, outline: str):
+        """
+        Track section stability after a Planner step and queue newly frozen sections.
+
+        Args:
+            step: Planner step number
+            outline: Current outline
+        """
+        _, sections = parse_outline_sections(outline)
+        if len(sections) < 2:
+            return
+        for index, (key, section) in enumerate(zip(section_keys(sections), sections)):
+            signature = section_signature(section)
+            seen = self._seen.get(key)
+            if seen is None or seen[0] != signature:
+                if seen is not None:
+                    logger.debug(f"Pipeline: section '{section.title}' changed at step {step}")
+                    self._invalidate(key)
+                self._seen[key] = (signature, step)
+                continue
+            if step - seen[1] >= self.stable_steps and key not in self.pending and key not in self.drafts:
+                logger.debug(f"Pipeline: section '{section.title}' frozen at step {step}, drafting")
+                self.pending[key] = signature
+                self.queue.put_nowait((key, signature, outline, sections, index))
+
+    async def _worker(self):
+        while True:
+            key, signature, outline, sections, index = await self.queue.get()
+            if self.pending.get(key) != signature:
+                continue  # invalidated while queued
+            task = asyncio.ensure_future(self.writer.write_section(self.question, outline, sections, index))
+            self._running[key] = task
+            try:
+                await asyncio.wait({task})
+            finally:
+                if not task.done():
+                    task.cancel()
+                self._running.pop(key, None)
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"Pipeline: drafting '{sections[index].title}' failed: {task.exception()}")
+                if self.pending.get(key) == signature:
+                    # not drafted: the section is queued again or written after planning
+                    del self.pending[key]
+                continue
+            if task.cancelled() or self.pending.get(key) != signature:
+                continue
+            del self.pending[key]
+            if task.result():
+                self.drafts[key] = (signature, sections[index].title, task.result())
+                self.stats["drafted"] += 1
+
+    async def close(self):
+        """Stop the workers and cancel drafts in progress."""
+        for task in list(self._running.values()) + self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def finish(self, final_outline: str) -> str:
+        """
+        Assemble the report for the final outline: reuse drafts of unchanged sections and
+        write the rest concurrently.
+
+        Args:
+            final_outline: Final outline from Planner
+
+        Returns:
+            Report string, or "" if the outline has fewer than two sections or nothing could be written
+        """
+        _, sections = parse_outline_sections(final_outline)
+        if len(sections) < 2:
+            await self.close()
+            return ""
+        keys = section_keys(sections)
+        signatures = {key: section_signature(s) for key, s in zip(keys, sections)}
+        # Let drafts of sections that survived into the final outline finish
+        in_progress = [task for key, task in self._running.items() if self.pending.get(key) == signatures.get(key)]
+        if in_progress:
+            await asyncio.wait(in_progress)
+            await asyncio.sleep(0)  # let workers record the finished drafts
+        await self.close()
+
+        texts: List[str] = [""] * len(sections)
+        missing = []
+        for index, (key, section) in enumerate(zip(keys, sections)):
+            draft = self.drafts.get(key)
+            if draft is not None and draft[0] == signatures[key]:
+                _, drafted_title, text = draft
+                if drafted_title != section.title:
+                    # the section was renumbered after it was drafted
+                    text = text.replace(drafted_title, section.title, 1)
+                texts[index] = text
+                self.stats["reused"] += 1
+            else:
+                missing.append(index)
+        if missing:
+            self.stats["written_after_planning"] += len(missing)
+            written = await self.writer.write_sections(self.question, final_outline, sections, missing)
+            for index, text in zip(missing, written):
+                texts[index] = text
+        logger.debug(f"Pipeline stats: {self.stats}")
+        if not any(texts):
+            return ""
+        return self.writer.stitch_sections(texts)
 
 
 class WebWeaverAgent:
@@ -577,19 +884,38 @@ class WebWeaverAgent:
             self.llm_config["openai_base_url"] = base_url
         
         # Initialize shared memory bank
-        self.memory_bank = MemoryBank()
+        # - llm_config["memory_bank_dir"]: keep evidence on disk in this directory (reopened if it exists)
+        # - MEMORY_BANK_DIR: keep evidence on disk in a fresh subdirectory per agent
+        storage_dir = self.llm_config.get("memory_bank_dir")
+        # Per-agent directory created here, deleted again by close()
+        self._temp_storage_dir: Optional[str] = None
+        if not storage_dir and MEMORY_BANK_DIR:
+            os.makedirs(MEMORY_BANK_DIR, exist_ok=True)
+            storage_dir = self._temp_storage_dir = tempfile.mkdtemp(prefix="memory_bank_", dir=MEMORY_BANK_DIR)
+        self.memory_bank = MemoryBank(storage_dir=storage_dir)
 
         # Initialize sub-agents
         self.planner = WebWeaverPlanner(self.llm_config, self.memory_bank, function_list=function_list, instruction=instruction)
         self.writer = WebWeaverWriter(self.llm_config, self.memory_bank, instruction=instruction)
+        self.pipeline_enabled = bool(self.llm_config.get("pipeline", WEBWEAVER_PIPELINE))
+        self.pipeline_stable_steps = int(self.llm_config.get("pipeline_stable_steps", PIPELINE_STABLE_STEPS))
 
         logger.debug("WebWeaver Dual-Agent Framework initialized.")
         logger.debug(f"Planner Tools: {self.planner.function_list}")
         logger.debug(f"Writer Tools: {self.writer.function_list}")
 
+    def close(self):
+        """Close the memory bank and delete its directory unless memory_bank_dir was given."""
+        self.memory_bank.close()
+        if self._temp_storage_dir is not None:
+            shutil.rmtree(self._temp_storage_dir, ignore_errors=True)
+            self._temp_storage_dir = None
+
     async def run(self, question: str) -> Dict[str, str]:
         """
         Execute WebWeaver's complete dual-agent workflow.
+
+        The memory bank is closed when the run finishes, so use one agent per question.
         
         Args:
             question: Research question
@@ -597,20 +923,35 @@ class WebWeaverAgent:
         Returns:
             Dict with final_report, final_outline, and metadata
         """
+        try:
+            return await self._run(question)
+        finally:
+            self.close()
+
+    async def _run(self, question: str) -> Dict[str, str]:
         start_time = time.time()
 
         # Phase 1: Run Planner
-        # Planner fills memory_bank and returns final outline
+        # Planner fills memory_bank and returns final outline. With the pipeline on, sections
+        # that stop changing are drafted by the Writer while the Planner keeps working.
+        pipeline = None
+        if self.pipeline_enabled and self.writer.parallel_sections:
+            pipeline = SectionPipeline(self.writer, question, stable_steps=self.pipeline_stable_steps,
+                                       concurrency=self.writer.section_concurrency)
+            pipeline.start()
         try:
             final_outline = await asyncio.wait_for(
-                self.planner.run(question),
+                self.planner.run(question, on_step=pipeline.observe if pipeline else None),
                 timeout=AGENT_TIMEOUT
             )
             logger.debug("--- Planner Phase Complete ---")
             logger.debug(f"Final Outline:\n{final_outline}")
-            logger.debug(f"Memory Bank contains {self.memory_bank.size()} items.")
+            logger.debug(f"Memory Bank contains {self.memory_bank.size()} items, "
+                         f"dedup: {self.memory_bank.dedup_stats()}")
         except Exception as e:
             logger.error(f"Planner Agent failed: {e}")
+            if pipeline:
+                await pipeline.close()
             return {
                 "question": question,
                 "final_report": "",
@@ -620,13 +961,19 @@ class WebWeaverAgent:
         # Phase 2: Run Writer
         # Writer uses Planner's output (final_outline, memory_bank)
         try:
-            final_report = await asyncio.wait_for(
-                self.writer.run(question, final_outline),
-                timeout=AGENT_TIMEOUT
-            )
+            final_report = ""
+            if pipeline:
+                final_report = await asyncio.wait_for(pipeline.finish(final_outline), timeout=AGENT_TIMEOUT)
+            if not final_report:
+                final_report = await asyncio.wait_for(
+                    self.writer.run(question, final_outline),
+                    timeout=AGENT_TIMEOUT
+                )
             logger.debug("--- Writer Phase Complete ---")
         except Exception as e:
             logger.error(f"Writer Agent failed: {e}")
+            if pipeline:
+                await pipeline.close()
             return {
                 "question": question,
                 "final_report": "",
@@ -640,6 +987,8 @@ class WebWeaverAgent:
             "final_outline": final_outline,
             "final_report": final_report,
             "memory_bank_size": self.memory_bank.size(),
+            "memory_bank_dedup": self.memory_bank.dedup_stats(),
+            "pipeline": pipeline.stats if pipeline else None,
             "total_time_seconds": end_time - start_time
         }
 